@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark market_research's signal matcher against the old substring scans.
+
+Builds a seeded corpus of synthetic SERP snippets (filler words, signal words
+and look-alikes such as "rapid", "jpeg" or "freedom"), then times the previous
+implementation (a substring test per keyword per item for pricing, one
+corpus.count() per term for gaps) and SignalMatcher on the same items, with
+the built-in dictionaries (scanned term by term) and again with --extra-terms
+synthetic terms added to each kind (tokenized). Timings are the best of
+--repeat runs. It also reports how many items the two disagree on.
+
+    python3 automation/bench_market_signals.py --snippets 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import time
+from collections import Counter
+from typing import Dict, List
+
+from market_research import DEFAULT_SIGNALS, SearchItem, SignalMatcher, infer_pricing_models
+
+SIGNAL_WORDS = (
+    "free trial freemium subscription monthly seat seats usage api enterprise contact sales custom pricing "
+    "complex complexity setup onboarding learning curve roi analytics report reports dashboard dashboards "
+    "cost costs pricing expensive budget japanese localization jp"
+).split()
+LOOKALIKES = "rapid therapist capital jpeg freedom trialware seating costume reportedly apiary".split()
+
+
+def filler_words(rng: random.Random, n: int) -> List[str]:
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(n)]
+
+
+def synthetic_items(n: int, seed: int) -> List[SearchItem]:
+    """Snippets with roughly 1 signal word and 1 look-alike per 20 words."""
+    rng = random.Random(seed)
+    filler = filler_words(rng, 3000)
+    vocab = filler + rng.choices(SIGNAL_WORDS, k=len(filler) // 18) + rng.choices(LOOKALIKES, k=len(filler) // 18)
+    items = []
+    for i in range(n):
+        title = " ".join(rng.choice(vocab) for _ in range(rng.randint(4, 8))).title()
+        description = " ".join(rng.choice(vocab) for _ in range(rng.randint(12, 30)))
+        items.append(SearchItem(title=f"{title} {i}", url=f"https://vendor{i % 997}.example/p/{i}", description=description))
+    return items
+
+
+def extended_signals(extra: int, seed: int) -> Dict[str, Dict[str, List[str]]]:
+    rng = random.Random(seed + 1)
+    signals = {kind: {label: list(terms) for label, terms in labels.items()} for kind, labels in DEFAULT_SIGNALS.items()}
+    for kind, labels in signals.items():
+        for i, word in enumerate(filler_words(rng, extra)):
+            labels[f"Synthetic {kind} {i % 10}"] = labels.get(f"Synthetic {kind} {i % 10}", []) + [word]
+    return signals
+
+
+def legacy_pricing(items: List[SearchItem], signals) -> List[str]:
+    keywords = [(t.rstrip("*"), label) for label, terms in signals["pricing"].items() for t in terms]
+    out = []
+    for it in items:
+        text = f"{it.title} {it.description}".lower()
+        out.append(", ".join(sorted({desc for k, desc in keywords if k in text})))
+    return out
+
+
+def legacy_gap_scores(items: List[SearchItem], signals) -> Counter:
+    corpus = " ".join([f"{x.title} {x.description}" for x in items]).lower()
+    return Counter({gap: sum(corpus.count(t.rstrip("*")) for t in terms) for gap, terms in signals["gaps"].items()})
+
+
+def timed(fn, *args, repeat: int = 1):
+    """fn(*args) and its best wall time over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return value, round(best, 3)
+
+
+def run(items: List[SearchItem], signals, repeat: int) -> dict:
+    old_pricing, old_pricing_s = timed(legacy_pricing, items, signals, repeat=repeat)
+    old_gaps, old_gaps_s = timed(legacy_gap_scores, items, signals, repeat=repeat)
+    matcher, compile_s = timed(SignalMatcher, signals)
+    new_pricing_rows, new_pricing_s = timed(infer_pricing_models, items, len(items), matcher, repeat=repeat)
+    new_gaps, new_gaps_s = timed(matcher.count, items, "gaps", repeat=repeat)
+
+    new_by_url = {url: ", ".join(models) for _, models, url in new_pricing_rows}
+    differing = sum(1 for it, model in zip(items, old_pricing) if model != new_by_url.get(it.url, ""))
+    return {
+        "terms": sum(len(terms) for labels in signals.values() for terms in labels.values()),
+        "mode": "scan" if matcher._scan_mode else "token",
+        "legacy": {"pricing_s": old_pricing_s, "gaps_s": old_gaps_s, "gap_scores": dict(old_gaps.most_common(5))},
+        "matcher": {
+            "compile_s": compile_s,
+            "pricing_s": new_pricing_s,
+            "gaps_s": new_gaps_s,
+            "gap_scores": dict(new_gaps.most_common(5)),
+        },
+        "pricing_items_differing": differing,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pricing/gap signal matching on synthetic SERP snippets")
+    parser.add_argument("--snippets", type=int, default=100_000)
+    parser.add_argument("--extra-terms", type=int, default=500, help="Synthetic terms added per kind for the scaling run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many runs of each timing")
+    args = parser.parse_args()
+
+    items = synthetic_items(args.snippets, args.seed)
+    print(
+        json.dumps(
+            {
+                "snippets": len(items),
+                "default_signals": run(items, DEFAULT_SIGNALS, args.repeat),
+                "extended_signals": run(items, extended_signals(args.extra_terms, args.seed), args.repeat),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Check market_research's Brave client against a local fake endpoint.
+
+Starts a threaded HTTP/1.1 server on 127.0.0.1 that serves synthetic SERPs
+after --delay seconds and records every connection and request. Each query's
+first request is answered with 429 (Retry-After in seconds, or as an HTTP-date
+for queries containing "date"), and queries containing "stall" hang past the
+client timeout once. Then it runs --topics topics' queries through one shared
+pool, RateLimiter and BraveSession, as a batch run does, and checks:
+
+- pacing: request starts are at least 1/--qps seconds apart (within tolerance)
+- keep-alive: connections opened <= workers + reconnects after stalls
+- retries: every query succeeds after its 429 and, for "stall", its timeout
+
+A second fake without faults, answering after --latency-delay seconds, then
+serves --latency-topics single-topic reports (9 queries each), fetched
+sequentially (concurrency 1, no QPS limit) and concurrently (--concurrency,
+--qps) as collect_sources does:
+
+- latency: the concurrent run is faster and every report's Markdown is identical
+
+    python3 automation/check_brave_client.py --topics 4 --qps 20
+
+Prints a JSON report; exits 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from market_research import (
+    BraveSession,
+    RateLimiter,
+    analyze,
+    build_markdown,
+    collect_sources,
+    merge_sources,
+    submit_searches,
+)
+
+STALL_SECONDS = 1.5
+
+
+class FakeBrave(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay: float, faults: bool = True):
+        super().__init__(("127.0.0.1", 0), FakeBraveHandler)
+        self.delay = delay
+        self.faults = faults  # 429 on each query's first request, stalls for "stall" queries
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.request_times: List[float] = []  # accepted (non-429) request arrivals
+        self.hits: Dict[str, int] = {}
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/res/v1/web/search"
+
+    def handle_error(self, request, client_address) -> None:
+        # A stalled handler writing to a connection the client already dropped.
+        pass
+
+
+class FakeBraveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeBrave
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        qs = parse_qs(urlsplit(self.path).query)
+        q, count = qs["q"][0], int(qs.get("count", ["10"])[0])
+        with self.server.lock:
+            n = self.server.hits[q] = self.server.hits.get(q, 0) + 1
+        if self.server.faults and n == 1:
+            retry_after = "Wed, 21 Oct 2015 07:28:00 GMT" if "date" in q else "0.2"
+            self.send(429, b"{}", {"Retry-After": retry_after})
+            return
+        if self.server.faults and "stall" in q and n == 2:
+            time.sleep(STALL_SECONDS)
+            return
+        with self.server.lock:
+            self.server.request_times.append(time.monotonic())
+        time.sleep(self.server.delay)
+        results = []
+        for i in range(count):
+            h = int(hashlib.md5(f"{q}{i}".encode()).hexdigest(), 16)
+            results.append(
+                {
+                    "title": f"Vendor {h % 15} - {q}",
+                    "url": f"https://vendor{h % 15}.example/p/{h % 7}",
+                    "description": f"free trial and per seat pricing for {q}",
+                }
+            )
+        self.send(200, json.dumps({"web": {"results": results}}).encode(), {"Content-Type": "application/json"})
+
+    def send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_server(delay: float, faults: bool = True) -> FakeBrave:
+    server = FakeBrave(delay, faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def latency(args) -> dict:
+    """Time each topic's report sequentially and concurrently against a fault-free fake."""
+    server = start_server(args.latency_delay, faults=False)
+    topics = [f"latency topic {i}" for i in range(args.latency_topics)]
+    timings = {}
+    reports = {}
+    try:
+        for mode, concurrency, qps in (("sequential", 1, 0), ("concurrent", args.concurrency, args.qps)):
+            session = BraveSession(server.endpoint, timeout=args.timeout)
+            seconds = []
+            try:
+                for topic in topics:
+                    t0 = time.perf_counter()
+                    sources = collect_sources("fake-key", topic, "JP", "en", 10, concurrency, RateLimiter(qps), None, session)
+                    seconds.append(time.perf_counter() - t0)
+                    reports.setdefault(topic, []).append(build_markdown(analyze(topic, sources)))
+            finally:
+                session.close()
+            timings[mode] = {"concurrency": concurrency, "qps": qps, "seconds_per_report": round(sum(seconds) / len(seconds), 3)}
+    finally:
+        server.shutdown()
+        server.server_close()
+    identical = all(a == b for a, b in reports.values())
+    seq, conc = timings["sequential"]["seconds_per_report"], timings["concurrent"]["seconds_per_report"]
+    return {
+        "ok": identical and conc < seq,
+        "delay_s": args.latency_delay,
+        **timings,
+        "speedup": round(seq / conc, 2) if conc else None,
+        "reports_identical": identical,
+    }
+
+
+def run(args) -> dict:
+    server = start_server(args.delay)
+    topics = [f"topic {i}" for i in range(args.topics)] + ["stall topic", "date topic"]
+    limiter = RateLimiter(args.qps)
+    session = BraveSession(server.endpoint, timeout=args.timeout)
+    errors = []
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            submitted = [submit_searches(pool, "fake-key", t, "JP", "en", 10, limiter, None, session, {}) for t in topics]
+            for topic, (jobs, futures) in zip(topics, submitted):
+                try:
+                    merge_sources(jobs, [f.result() for f in futures])
+                except Exception as e:
+                    errors.append(f"{topic}: {e}")
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+    elapsed = time.perf_counter() - t0
+
+    queries = len(server.hits)
+    stalled = sum(1 for q in server.hits if "stall" in q)
+    gaps = [b - a for a, b in zip(server.request_times, server.request_times[1:])]
+    # Starts are spaced by the limiter; allow for thread wake-up jitter.
+    min_gap = min(gaps) if gaps else 0.0
+    pacing_ok = not args.qps or min_gap >= 0.5 / args.qps
+    return {
+        "queries": queries,
+        "requests": sum(server.hits.values()),
+        "elapsed_s": round(elapsed, 3),
+        "checks": {
+            "pacing": {
+                "ok": pacing_ok,
+                "qps": args.qps,
+                "min_gap_s": round(min_gap, 4),
+                "achieved_qps": round(len(gaps) / (server.request_times[-1] - server.request_times[0]), 2) if gaps else None,
+            },
+            "keep_alive": {
+                "ok": server.connections <= args.concurrency + stalled,
+                "connections": server.connections,
+                "max_allowed": args.concurrency + stalled,
+            },
+            "retries": {
+                "ok": not errors and all(n >= 2 for n in server.hits.values()),
+                "errors": errors,
+            },
+            "latency": latency(args),
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check Brave client pacing, keep-alive reuse and retries against a local fake")
+    parser.add_argument("--topics", type=int, default=4, help="Synthetic topics (9 queries each), plus a stall and an HTTP-date topic")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--qps", type=float, default=20)
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds the fake takes per SERP")
+    parser.add_argument("--latency-topics", type=int, default=2, help="Reports timed sequentially and concurrently")
+    parser.add_argument("--latency-delay", type=float, default=0.3, help="Seconds the fault-free fake takes per SERP")
+    parser.add_argument("--timeout", type=float, default=0.5, help="Client timeout; stalls last %.1fs" % STALL_SECONDS)
+    args = parser.parse_args()
+    if args.latency_topics < 1:
+        parser.error("--latency-topics must be >= 1")
+    report = run(args)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if all(c["ok"] for c in report["checks"].values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
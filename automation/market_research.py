@@ -5,11 +5,17 @@ Features:
 - Competitor discovery
 - Pricing model extraction
 - Market gap hypotheses
-- Markdown report output
+- Markdown and/or JSON report output (--format)
+- Batch mode over a topics file (--topics-file) with one index
+- Pricing/gap signal dictionaries extensible via --signals-file
 - Optional Asana task creation
 
 Env vars:
 - BRAVE_API_KEY (required)
+- BRAVE_QPS (optional, default 1 = the Free plan's limit; raise it to your paid plan's limit)
+- BRAVE_ENDPOINT (optional, e.g. a local fake for testing)
+- BRAVE_CACHE_PATH, BRAVE_CACHE_TTL_HOURS, BRAVE_CACHE_MAX_MB (optional, SERP cache)
+- MARKET_SIGNALS_FILE (optional, default for --signals-file)
 - ASANA_ACCESS_TOKEN (optional, for --create-asana)
 - ASANA_PROJECT_GID (optional, for --create-asana)
 """
@@ -18,17 +24,61 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import gzip
+import http.client
 import json
 import os
 import re
+import socket
+import sqlite3
 import sys
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
 from collections import Counter
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
-BRAVE_ENDPOINT = "https://api.search.brave.com/res/v1/web/search"
+BRAVE_ENDPOINT = os.getenv("BRAVE_ENDPOINT", "").strip() or "https://api.search.brave.com/res/v1/web/search"
+DEFAULT_CONCURRENCY = 4
+# The Free plan's limit; paid plans raise it with BRAVE_QPS / --qps.
+DEFAULT_QPS = 1.0
+RATE_LIMIT_RETRIES = 3
+
+CACHE_MODES = ("use", "refresh", "offline")
+OUTPUT_FORMATS = ("markdown", "json", "both")
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "brave_serp.sqlite")
+DEFAULT_CACHE_TTL_HOURS = 168.0
+DEFAULT_CACHE_MAX_MB = 50.0
+
+# Signal kind -> label -> terms. Terms match whole words, case-insensitively;
+# a trailing "*" also matches longer words ("report*" -> reports, reporting),
+# and the words of a phrase may be separated by spaces or punctuation.
+WORD_RE = re.compile(r"\w+")
+
+DEFAULT_SIGNALS: Dict[str, Dict[str, List[str]]] = {
+    "pricing": {
+        "Free plan or free usage tier": ["free"],
+        "Free trial": ["trial", "trials"],
+        "Freemium": ["freemium"],
+        "Subscription": ["subscription", "subscriptions"],
+        "Monthly subscription": ["monthly"],
+        "Per-seat pricing": ["seat", "seats"],
+        "Usage-based pricing": ["usage"],
+        "API metered pricing": ["api", "apis"],
+        "Enterprise/custom pricing": ["enterprise"],
+    },
+    "gaps": {
+        "Transparent pricing is unclear": ["contact sales", "enterprise", "custom pricing"],
+        "SMB/solo-friendly onboarding remains weak": ["complex*", "setup", "learning curve", "onboarding"],
+        "ROI visibility/dashboarding is under-served": ["roi", "analytics", "report*", "dashboard*"],
+        "Cost predictability is a pain point": ["cost", "costs", "costly", "pricing", "expensive", "budget*", "usage"],
+        "Localization and non-English support opportunity": ["japanese", "multi-language", "localization", "jp"],
+    },
+}
 
 
 @dataclass
@@ -37,8 +87,367 @@ class SearchItem:
     url: str
     description: str
 
+    @property
+    def text(self) -> str:
+        return f"{self.title} {self.description}"
+
+
+class SignalMatcher:
+    """Whole-word matcher for every signal term at once.
+
+    Small dictionaries (up to SCAN_TERM_LIMIT distinct terms, the built-in
+    ones included) are scanned term by term: a substring test on the term's
+    first word, then a regex that checks word boundaries only where it occurs.
+    First words containing a shorter one ("trials", "freemium") are only
+    tested once that one is found. That keeps the common case close to the
+    cost of plain substring tests.
+
+    Larger dictionaries tokenize each text once instead and resolve words with
+    a set intersection against a word -> (kind, label) table (prefix terms are
+    expanded as new words are seen, memoized for up to MEMO_WORDS words), so
+    the cost does not grow with the number of terms. Phrases are only searched
+    for when their first word occurs. A term listed under several labels or
+    kinds counts for each.
+    """
+
+    SCAN_TERM_LIMIT = 60
+    MEMO_WORDS = 50_000
+
+    def __init__(self, signals: Dict[str, Dict[str, List[str]]]):
+        self.signals = signals
+        # (kind, words, prefix) -> labels
+        terms: Dict[Tuple[str, Tuple[str, ...], bool], List[str]] = {}
+        for kind, labels in signals.items():
+            for label, terms_ in labels.items():
+                for term in terms_:
+                    words = tuple(WORD_RE.findall(term.lower()))
+                    if words:
+                        terms.setdefault((kind, words, term.strip().endswith("*")), []).append(label)
+        self._scan_mode = len({key[1:] for key in terms}) <= self.SCAN_TERM_LIMIT
+
+        # Scan mode: kind -> first word -> [(findall, labels)], one substring test per first word.
+        scan: Dict[str, Dict[str, list]] = {kind: {} for kind in signals}
+        # Token mode: word -> [(kind, label)] for exact and prefix words; phrase patterns by first word.
+        self._exact: Dict[str, List[Tuple[str, str]]] = {}
+        self._prefixes: Dict[str, List[Tuple[str, str]]] = {}
+        self._phrases: Dict[str, List[Tuple[re.Pattern, str, List[str]]]] = {}
+        for (kind, words, prefix), labels in terms.items():
+            if self._scan_mode or len(words) > 1:
+                pattern = self._term_pattern(words, prefix)
+            if self._scan_mode:
+                scan[kind].setdefault(words[0], []).append((pattern.findall, labels))
+            elif len(words) > 1:
+                self._phrases.setdefault(words[0], []).append((pattern, kind, labels))
+            else:
+                owners = [(kind, label) for label in labels]
+                (self._prefixes if prefix else self._exact).setdefault(words[0], []).extend(owners)
+        self._scan = {kind: self._nest(firsts) for kind, firsts in scan.items()}
+        self._prefix_tuple = tuple(self._prefixes)
+        self._phrase_firsts = frozenset(self._phrases)
+        # Words seen so far, and which of them match some term; replaced (not
+        # cleared, so concurrent callers keep a consistent pair) once MEMO_WORDS is reached.
+        self._memo: Tuple[set, Dict[str, List[Tuple[str, str]]]] = (set(), {})
+
+    @staticmethod
+    def _nest(firsts: Dict[str, list]) -> Tuple[Tuple[str, list, Tuple[Tuple[str, list], ...]], ...]:
+        # (first, entries, nested): nested first words contain `first`, so
+        # they can only occur where it does.
+        roots: Dict[str, Tuple[list, list]] = {}
+        for first in sorted(firsts, key=len):
+            parent = next((root for root in roots if root in first), None)
+            if parent is None:
+                roots[first] = (firsts[first], [])
+            else:
+                roots[parent][1].append((first, firsts[first]))
+        return tuple((first, entries, tuple(nested)) for first, (entries, nested) in roots.items())
+
+    @staticmethod
+    def _term_pattern(words: Tuple[str, ...], prefix: bool) -> re.Pattern:
+        # A literal start lets re skip ahead to candidate positions; the left
+        # word boundary is a lookbehind placed after the first word, where it
+        # is cheap: it fails only if the character before the term is a word
+        # character. Words may be split by anything but a newline, which
+        # separates texts in count().
+        first = words[0]
+        pattern = re.escape(first) + r"(?<!\w.{%d})" % len(first)
+        pattern += "".join(r"[^\w\n]+" + re.escape(w) for w in words[1:])
+        return re.compile(pattern + (r"\w*" if prefix else r"(?!\w)"))
+
+    def _hits(self, words: set) -> Dict[str, List[Tuple[str, str]]]:
+        seen, hit_words = self._memo
+        if len(seen) >= self.MEMO_WORDS:
+            seen, hit_words = self._memo = (set(), {})
+        for w in words.difference(seen):
+            owners = list(self._exact.get(w, ()))
+            if self._prefix_tuple and w.startswith(self._prefix_tuple):
+                for p, prefix_owners in self._prefixes.items():
+                    if w.startswith(p):
+                        owners.extend(prefix_owners)
+            if owners:
+                hit_words[w] = owners
+            seen.add(w)
+        return {w: hit_words[w] for w in words.intersection(hit_words)}
+
+    def _tally(self, low: str, words: set, word_counts, found: Dict[str, Dict[str, int]]) -> None:
+        for w, owners in self._hits(words).items():
+            n = word_counts(w)
+            for kind, label in owners:
+                counts = found.get(kind)
+                if counts is not None:
+                    counts[label] = counts.get(label, 0) + n
+        for first in self._phrase_firsts.intersection(words):
+            for pattern, kind, labels in self._phrases[first]:
+                counts = found.get(kind)
+                if counts is None:
+                    continue
+                n = len(pattern.findall(low))
+                if n:
+                    for label in labels:
+                        counts[label] = counts.get(label, 0) + n
+
+    def _scan_text(self, low: str, kinds) -> Dict[str, Dict[str, int]]:
+        found = {}
+        for kind in kinds:
+            counts = found[kind] = {}
+            for first, entries, nested in self._scan[kind]:
+                if first not in low:
+                    continue
+                for findall, labels in entries:
+                    n = len(findall(low))
+                    if n:
+                        for label in labels:
+                            counts[label] = counts.get(label, 0) + n
+                for first, entries in nested:
+                    if first not in low:
+                        continue
+                    for findall, labels in entries:
+                        n = len(findall(low))
+                        if n:
+                            for label in labels:
+                                counts[label] = counts.get(label, 0) + n
+        return found
+
+    def match(self, text: str, kinds: Optional[Tuple[str, ...]] = None) -> Dict[str, Dict[str, int]]:
+        """{kind: {label: hits}} for one text, for `kinds` (default: all); labels without hits are left out."""
+        kinds = kinds or tuple(self.signals)
+        low = text.lower()
+        if self._scan_mode:
+            return self._scan_text(low, kinds)
+        found = {kind: {} for kind in kinds}
+        tokens = WORD_RE.findall(low)
+        self._tally(low, set(tokens), tokens.count, found)
+        return found
+
+    def count(self, items: List[SearchItem], kind: str) -> Counter:
+        """Total hits per label of one kind across items, in one pass over their text."""
+        low = "\n".join(it.text for it in items).lower()
+        if self._scan_mode:
+            return Counter(self._scan_text(low, (kind,))[kind])
+        found = {kind: {}}
+        word_counts = Counter(WORD_RE.findall(low))
+        self._tally(low, set(word_counts), word_counts.__getitem__, found)
+        return Counter(found[kind])
+
+
+def load_signals(path: Optional[str] = None) -> SignalMatcher:
+    """DEFAULT_SIGNALS extended with a JSON file of the same shape.
+
+    Terms for an existing label are added to it; new labels and kinds are
+    added as they are.
+    """
+    signals = {kind: {label: list(terms) for label, terms in labels.items()} for kind, labels in DEFAULT_SIGNALS.items()}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+        for kind, labels in extra.items():
+            for label, terms in labels.items():
+                if isinstance(terms, str) or not all(isinstance(t, str) for t in terms):
+                    raise ValueError(f"{path}: {kind}/{label} must be a list of strings")
+                merged = signals.setdefault(kind, {}).setdefault(label, [])
+                merged.extend(t for t in terms if t not in merged)
+    return SignalMatcher(signals)
+
+
+DEFAULT_MATCHER = SignalMatcher(DEFAULT_SIGNALS)
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/qps seconds apart across threads (qps <= 0: no limit)."""
+
+    def __init__(self, qps: float):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            start = max(time.monotonic(), self._next)
+            self._next = start + self.interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CacheMiss(RuntimeError):
+    pass
+
+
+class SerpCache:
+    """Brave responses on disk, keyed on (query, country, lang, count).
 
-def brave_search(api_key: str, query: str, count: int = 10, country: str = "JP", lang: str = "en") -> List[SearchItem]:
+    mode "use" serves entries younger than ttl_hours and fetches the rest;
+    "refresh" always fetches and overwrites; "offline" serves any stored entry
+    regardless of age and raises CacheMiss instead of calling the API. Once the
+    stored payloads exceed max_mb, the least recently used entries are evicted
+    down to 90% of it. Safe to share between threads.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS serp_cache (
+        query TEXT NOT NULL,
+        country TEXT NOT NULL,
+        lang TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        bytes INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (query, country, lang, count)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_serp_cache_last_used ON serp_cache(last_used);
+    """
+
+    def __init__(self, path: str, mode: str = "use", ttl_hours: float = DEFAULT_CACHE_TTL_HOURS, max_mb: float = DEFAULT_CACHE_MAX_MB):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"cache mode must be one of {', '.join(CACHE_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stats = Counter(hits=0, misses=0, stale=0, stores=0, evicted=0)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def get(self, key: Tuple[str, str, str, int]) -> Optional[dict]:
+        """Cached payload for key, or None when it has to be fetched."""
+        if self.mode == "refresh":
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM serp_cache WHERE query = ? AND country = ? AND lang = ? AND count = ?",
+                key,
+            ).fetchone()
+            fresh = row is not None and (self.mode == "offline" or time.time() - row[1] <= self.ttl)
+            if fresh:
+                self._conn.execute(
+                    "UPDATE serp_cache SET last_used = ? WHERE query = ? AND country = ? AND lang = ? AND count = ?",
+                    (time.time(), *key),
+                )
+            self.stats["hits" if fresh else "misses"] += 1
+            if row is not None and not fresh:
+                self.stats["stale"] += 1
+        if fresh:
+            return json.loads(gzip.decompress(row[0]))
+        if self.mode == "offline":
+            raise CacheMiss(f"offline: no cached results for {key[0]!r} ({key[1]}/{key[2]}, count={key[3]})")
+        return None
+
+    def put(self, key: Tuple[str, str, str, int], payload: dict) -> None:
+        blob = gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO serp_cache (query, country, lang, count, payload, bytes, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, blob, len(blob), now, now),
+            )
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM serp_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key_and_size in self._conn.execute("SELECT query, country, lang, count, bytes FROM serp_cache ORDER BY last_used"):
+            victims.append(key_and_size[:4])
+            target -= key_and_size[4]
+            if target <= 0:
+                break
+        self._conn.executemany("DELETE FROM serp_cache WHERE query = ? AND country = ? AND lang = ? AND count = ?", victims)
+        self.stats["evicted"] += len(victims)
+
+    def summary(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM serp_cache").fetchone()
+        return {"mode": self.mode, "path": self.path, **self.stats, "entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class BraveSession:
+    """Keep-alive connections to BRAVE_ENDPOINT, one per worker thread.
+
+    urlopen() opens a fresh connection (and TLS handshake) per query; reusing
+    them matters once a batch run issues thousands of queries.
+    """
+
+    def __init__(self, endpoint: str = BRAVE_ENDPOINT, timeout: float = 30):
+        parts = urllib.parse.urlsplit(endpoint)
+        self._conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.netloc
+        self._path = parts.path or "/"
+        self._timeout = timeout
+        self._local = threading.local()
+        self._conns: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _conn(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._conn_class(self._host, timeout=self._timeout)
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def get(self, query_string: str, headers: Dict[str, str]) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        for attempt in range(2):
+            conn = self._conn()
+            try:
+                conn.request("GET", f"{self._path}?{query_string}", headers=headers)
+                resp = conn.getresponse()
+                return resp.status, resp.headers, resp.read()
+            except (http.client.HTTPException, ConnectionError, socket.timeout, TimeoutError):
+                # The server dropped an idle keep-alive connection (or stalled); reconnect once.
+                conn.close()
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+
+
+def fetch_serp(
+    api_key: str,
+    query: str,
+    count: int,
+    country: str,
+    lang: str,
+    limiter: Optional[RateLimiter] = None,
+    session: Optional[BraveSession] = None,
+) -> dict:
     params = urllib.parse.urlencode(
         {
             "q": query,
@@ -49,17 +458,54 @@ def brave_search(api_key: str, query: str, count: int = 10, country: str = "JP",
             "safesearch": "moderate",
         }
     )
-    req = urllib.request.Request(
-        f"{BRAVE_ENDPOINT}?{params}",
-        headers={
-            "Accept": "application/json",
-            "Accept-Encoding": "gzip",
-            "X-Subscription-Token": api_key,
-            "User-Agent": "openclaw-market-research/1.0",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        payload = json.loads(resp.read().decode("utf-8"))
+    headers = {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip",
+        "X-Subscription-Token": api_key,
+        "User-Agent": "openclaw-market-research/1.0",
+    }
+    if session is None:
+        session = BraveSession()
+        try:
+            return fetch_serp(api_key, query, count, country, lang, limiter, session)
+        finally:
+            session.close()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if limiter:
+            limiter.wait()
+        status, resp_headers, body = session.get(params, headers)
+        if status == 429 and attempt < RATE_LIMIT_RETRIES:
+            # Over the plan's QPS; wait as told (or a second) and try again.
+            try:
+                delay = float(resp_headers.get("Retry-After") or 1)
+            except ValueError:
+                # Retry-After may also be an HTTP-date; use the default then.
+                delay = 1
+            time.sleep(delay)
+            continue
+        if resp_headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if status != 200:
+            raise RuntimeError(f"Brave API HTTP {status} for {query!r}: {body[:200].decode('utf-8', 'replace')}")
+        return json.loads(body.decode("utf-8"))
+
+
+def brave_search(
+    api_key: str,
+    query: str,
+    count: int = 10,
+    country: str = "JP",
+    lang: str = "en",
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SerpCache] = None,
+    session: Optional[BraveSession] = None,
+) -> List[SearchItem]:
+    key = (query, country, lang, count)
+    payload = cache.get(key) if cache else None
+    if payload is None:
+        payload = fetch_serp(api_key, query, count, country, lang, limiter, session)
+        if cache:
+            cache.put(key, payload)
 
     items = []
     for r in (payload.get("web") or {}).get("results", []) or []:
@@ -88,7 +534,8 @@ def normalize_name(title: str, domain: str) -> str:
     return domain.replace("www.", "")
 
 
-def collect_sources(api_key: str, topic: str, country: str, lang: str, count: int) -> Dict[str, List[SearchItem]]:
+def topic_queries(topic: str) -> List[Tuple[str, str]]:
+    """(section, query) pairs searched for one topic, in report order."""
     queries = {
         "competitors": [
             f"{topic} competitors",
@@ -106,20 +553,74 @@ def collect_sources(api_key: str, topic: str, country: str, lang: str, count: in
             f"{topic} reddit review",
         ],
     }
+    return [(section, q) for section, qlist in queries.items() for q in qlist]
+
 
+def merge_sources(jobs: List[Tuple[str, str]], results: List[List[SearchItem]]) -> Dict[str, List[SearchItem]]:
+    """Group results by section, keeping the first occurrence of each URL in job order."""
     out: Dict[str, List[SearchItem]] = {"competitors": [], "pricing": [], "gaps": []}
-    for section, qlist in queries.items():
-        seen = set()
-        for q in qlist:
-            for item in brave_search(api_key, q, count=count, country=country, lang=lang):
-                key = item.url
-                if key in seen:
-                    continue
-                seen.add(key)
-                out[section].append(item)
+    seen = {section: set() for section in out}
+    for (section, _), items in zip(jobs, results):
+        for item in items:
+            key = item.url
+            if key in seen[section]:
+                continue
+            seen[section].add(key)
+            out[section].append(item)
     return out
 
 
+def submit_searches(
+    pool: ThreadPoolExecutor,
+    api_key: str,
+    topic: str,
+    country: str,
+    lang: str,
+    count: int,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SerpCache] = None,
+    session: Optional[BraveSession] = None,
+    inflight: Optional[Dict[str, Future]] = None,
+) -> Tuple[List[Tuple[str, str]], List[Future]]:
+    """Queue a topic's queries on a (possibly shared) pool; pass both to merge_sources once done.
+
+    With `inflight`, a query already queued for another topic reuses that
+    search instead of being sent again.
+    """
+    jobs = topic_queries(topic)
+    inflight = {} if inflight is None else inflight
+    futures = []
+    for _, q in jobs:
+        if q not in inflight:
+            inflight[q] = pool.submit(brave_search, api_key, q, count, country, lang, limiter, cache, session)
+        futures.append(inflight[q])
+    return jobs, futures
+
+
+def collect_sources(
+    api_key: str,
+    topic: str,
+    country: str,
+    lang: str,
+    count: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SerpCache] = None,
+    session: Optional[BraveSession] = None,
+) -> Dict[str, List[SearchItem]]:
+    own_session = session is None
+    session = session or BraveSession()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            jobs, futures = submit_searches(pool, api_key, topic, country, lang, count, limiter, cache, session)
+            # Results are read back in job order, so the dedup keeps the first
+            # occurrence exactly as a sequential run would.
+            return merge_sources(jobs, [f.result() for f in futures])
+    finally:
+        if own_session:
+            session.close()
+
+
 def extract_competitors(items: List[SearchItem], limit: int = 12) -> List[Tuple[str, str, str]]:
     by_domain = {}
     for it in items:
@@ -138,43 +639,38 @@ def extract_competitors(items: List[SearchItem], limit: int = 12) -> List[Tuple[
     return competitors[:limit]
 
 
-def infer_pricing_models(items: List[SearchItem], limit: int = 10) -> List[Tuple[str, str, str]]:
-    models = []
-    keywords = [
-        ("free", "Free plan or free usage tier"),
-        ("trial", "Free trial"),
-        ("freemium", "Freemium"),
-        ("subscription", "Subscription"),
-        ("monthly", "Monthly subscription"),
-        ("seat", "Per-seat pricing"),
-        ("usage", "Usage-based pricing"),
-        ("api", "API metered pricing"),
-        ("enterprise", "Enterprise/custom pricing"),
-    ]
+def infer_pricing_models(
+    items: List[SearchItem],
+    limit: int = 10,
+    matcher: Optional[SignalMatcher] = None,
+    hits: Optional[List[Dict[str, Dict[str, int]]]] = None,
+) -> List[Tuple[str, List[str], str]]:
+    """(title, pricing labels, url) for items with pricing signals.
 
-    for it in items:
-        text = f"{it.title} {it.description}".lower()
-        matched = [desc for k, desc in keywords if k in text]
-        if matched:
-            models.append((it.title, ", ".join(sorted(set(matched))), it.url))
+    `hits` are the matcher results for items when the caller already has them.
+    """
+    if hits is None:
+        matcher = matcher or DEFAULT_MATCHER
+        hits = [matcher.match(it.text, ("pricing",)) for it in items]
+    models = []
+    for it, found in zip(items, hits):
+        if found["pricing"]:
+            models.append((it.title, sorted(found["pricing"]), it.url))
     return models[:limit]
 
 
-def infer_market_gaps(gap_items: List[SearchItem], pricing_items: List[SearchItem], competitor_count: int) -> List[str]:
-    corpus = " ".join([f"{x.title} {x.description}" for x in gap_items + pricing_items]).lower()
-
-    signals = {
-        "Transparent pricing is unclear": ["contact sales", "enterprise", "custom pricing"],
-        "SMB/solo-friendly onboarding remains weak": ["complex", "setup", "learning curve", "onboarding"],
-        "ROI visibility/dashboarding is under-served": ["roi", "analytics", "report", "dashboard"],
-        "Cost predictability is a pain point": ["cost", "pricing", "expensive", "budget", "usage"],
-        "Localization and non-English support opportunity": ["japanese", "multi-language", "localization", "jp"],
-    }
-
-    ranked = []
-    for gap, terms in signals.items():
-        score = sum(corpus.count(t) for t in terms)
-        ranked.append((score, gap))
+def infer_market_gaps(
+    gap_items: List[SearchItem],
+    pricing_items: List[SearchItem],
+    competitor_count: int,
+    matcher: Optional[SignalMatcher] = None,
+    scores: Optional[Counter] = None,
+) -> List[str]:
+    """Top gap hypotheses; `scores` are precomputed gap signal counts for both item lists."""
+    matcher = matcher or DEFAULT_MATCHER
+    if scores is None:
+        scores = matcher.count(gap_items + pricing_items, "gaps")
+    ranked = [(scores[gap], gap) for gap in matcher.signals["gaps"]]
 
     ranked.sort(reverse=True)
     selected = [g for s, g in ranked if s > 0][:4]
@@ -191,50 +687,117 @@ def infer_market_gaps(gap_items: List[SearchItem], pricing_items: List[SearchIte
     return selected
 
 
-def build_markdown(topic: str, sources: Dict[str, List[SearchItem]]) -> Tuple[str, List[str]]:
-    competitors = extract_competitors(sources["competitors"])
-    pricing = infer_pricing_models(sources["pricing"])
-    gaps = infer_market_gaps(sources["gaps"], sources["pricing"], len(competitors))
+METHOD = "Brave Search API (SERP-based desk research)"
+
+
+@dataclass
+class Analysis:
+    """Everything derived from one topic's search results, computed once by analyze()."""
 
-    date_str = dt.date.today().isoformat()
-    key_findings = [
+    topic: str
+    date: str
+    sources: Dict[str, List[SearchItem]]
+    competitors: List[Tuple[str, str, str]]
+    pricing: List[Tuple[str, List[str], str]]
+    gaps: List[str]
+    findings: List[str]
+    signal_counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def top_gap(self) -> str:
+        return self.gaps[0] if self.gaps else "N/A"
+
+    def summary(self) -> dict:
+        return {
+            "topic": self.topic,
+            "competitors": len(self.competitors),
+            "pricing_signals": len(self.pricing),
+            "signal_counts": self.signal_counts,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "topic": self.topic,
+            "date": self.date,
+            "method": METHOD,
+            "findings": self.findings,
+            "competitors": [{"name": n, "domain": d, "url": u} for n, d, u in self.competitors],
+            "pricing": [{"title": t, "signals": models, "url": u} for t, models, u in self.pricing],
+            "gaps": self.gaps,
+            "signal_counts": self.signal_counts,
+            "sources": {
+                section: [{"title": it.title, "url": it.url, "description": it.description} for it in items]
+                for section, items in self.sources.items()
+            },
+        }
+
+
+def analyze(topic: str, sources: Dict[str, List[SearchItem]], matcher: Optional[SignalMatcher] = None) -> Analysis:
+    matcher = matcher or DEFAULT_MATCHER
+    # Pricing items feed both the pricing rows and the gap scores; match them once.
+    pricing_hits = [matcher.match(it.text) for it in sources["pricing"]]
+    pricing_counts = Counter()
+    gap_counts = matcher.count(sources["gaps"], "gaps")
+    for found in pricing_hits:
+        pricing_counts.update(found["pricing"])
+        gap_counts.update(found["gaps"])
+
+    competitors = extract_competitors(sources["competitors"])
+    pricing = infer_pricing_models(sources["pricing"], hits=pricing_hits)
+    gaps = infer_market_gaps(sources["gaps"], sources["pricing"], len(competitors), matcher, scores=gap_counts)
+    findings = [
         f"Identified {len(competitors)} likely competitors in/around '{topic}'",
         f"Observed {len(pricing)} pricing references across free/trial/subscription/enterprise patterns",
         f"Top gap hypotheses: {gaps[0] if gaps else 'N/A'}",
     ]
+    return Analysis(
+        topic=topic,
+        date=dt.date.today().isoformat(),
+        sources=sources,
+        competitors=competitors,
+        pricing=pricing,
+        gaps=gaps,
+        findings=findings,
+        signal_counts={
+            "pricing": dict(pricing_counts.most_common()),
+            "gaps": dict(gap_counts.most_common()),
+        },
+    )
+
 
+def build_markdown(analysis: Analysis) -> str:
     lines = [
-        f"# Market Research Report: {topic}",
+        f"# Market Research Report: {analysis.topic}",
         "",
-        f"Date: {date_str}",
-        "Method: Brave Search API (SERP-based desk research)",
+        f"Date: {analysis.date}",
+        f"Method: {METHOD}",
         "",
         "## Executive Summary",
     ]
-    lines.extend([f"- {x}" for x in key_findings])
+    lines.extend([f"- {x}" for x in analysis.findings])
 
     lines.extend(["", "## Competitor Landscape", ""])
-    for name, domain, url in competitors:
+    for name, domain, url in analysis.competitors:
         lines.append(f"- **{name}** ({domain}) — {url}")
 
     lines.extend(["", "## Pricing Model Signals", ""])
-    for title, model, url in pricing:
+    for title, models, url in analysis.pricing:
         lines.append(f"- **{title}**")
-        lines.append(f"  - Model signals: {model}")
+        lines.append(f"  - Model signals: {', '.join(models)}")
         lines.append(f"  - Source: {url}")
 
     lines.extend(["", "## Market Gaps / Opportunities", ""])
-    for g in gaps:
+    for g in analysis.gaps:
         lines.append(f"- {g}")
 
     lines.extend(["", "## Source Notes", ""])
     for section in ["competitors", "pricing", "gaps"]:
         lines.append(f"### {section.title()}")
-        for it in sources[section][:12]:
+        for it in analysis.sources[section][:12]:
             lines.append(f"- {it.title} — {it.url}")
         lines.append("")
 
-    return "\n".join(lines).strip() + "\n", key_findings
+    return "\n".join(lines).strip() + "\n"
 
 
 def create_asana_task(summary_title: str, findings: List[str], report_path: str, topic: str) -> str:
@@ -268,40 +831,254 @@ def create_asana_task(summary_title: str, findings: List[str], report_path: str,
     return payload.get("data", {}).get("gid", "")
 
 
+def write_outputs(analysis: Analysis, out_path: str, fmt: str = "markdown") -> dict:
+    """Write the report as markdown, JSON or both; returns {"out": ..., "json_out": ...} for what was written.
+
+    The JSON file sits next to the markdown one, with a .json suffix.
+    """
+    base = os.path.splitext(out_path)[0] if out_path.endswith((".md", ".json")) else out_path
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    paths = {}
+    if fmt in ("markdown", "both"):
+        paths["out"] = base + ".md" if out_path.endswith(".json") else out_path
+        with open(paths["out"], "w", encoding="utf-8") as f:
+            f.write(build_markdown(analysis))
+    if fmt in ("json", "both"):
+        paths["json_out"] = base + ".json"
+        with open(paths["json_out"], "w", encoding="utf-8") as f:
+            json.dump(analysis.to_dict(), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    return paths
+
+
+def load_topics(path: str) -> List[str]:
+    """One topic per line; blank lines, '#' comments and repeats are skipped.
+
+    Repeats are matched ignoring case and runs of whitespace ("AI  Agents" is
+    "ai agents"), keeping the first spelling, so each topic is searched once.
+    """
+    topics: List[str] = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            topic = " ".join(line.split())
+            key = topic.casefold()
+            if topic and not topic.startswith("#") and key not in seen:
+                seen.add(key)
+                topics.append(topic)
+    return topics
+
+
+def topic_slug(topic: str, taken: set) -> str:
+    base = re.sub(r"[^\w]+", "-", topic.lower()).strip("-_")[:80] or "topic"
+    slug, n = base, 2
+    while slug in taken:
+        slug, n = f"{base}-{n}", n + 1
+    taken.add(slug)
+    return slug
+
+
+def _cell(text: str) -> str:
+    return str(text).replace("|", "\\|").replace("\n", " ")
+
+
+def build_index(results: List[dict], errors: List[dict], out_dir: str) -> str:
+    lines = [
+        "# Market Research Index",
+        "",
+        f"Date: {dt.date.today().isoformat()}",
+        f"Topics: {len(results) + len(errors)} (ok {len(results)}, failed {len(errors)})",
+        "",
+        "| Topic | Competitors | Pricing signals | Top gap | Report |",
+        "| --- | ---: | ---: | --- | --- |",
+    ]
+    for r in results:
+        report = os.path.relpath(r.get("out") or r["json_out"], out_dir)
+        lines.append(
+            f"| {_cell(r['topic'])} | {r['competitors']} | {r['pricing_signals']} | {_cell(r['top_gap'])} | [{report}]({report}) |"
+        )
+    if errors:
+        lines.extend(["", "## Errors", "", "| Topic | Stage | Error |", "| --- | --- | --- |"])
+        for e in errors:
+            lines.append(f"| {_cell(e['topic'])} | {e['stage']} | {_cell(e['error'])} |")
+    return "\n".join(lines) + "\n"
+
+
+def run_batch(
+    topics: List[str],
+    out_dir: str,
+    api_key: str,
+    country: str,
+    lang: str,
+    count: int,
+    concurrency: int,
+    limiter: RateLimiter,
+    cache: SerpCache,
+    session: BraveSession,
+    create_asana: bool = False,
+    matcher: Optional[SignalMatcher] = None,
+    fmt: str = "markdown",
+) -> dict:
+    """Research every topic with one worker pool, writing a report per topic and index.md.
+
+    All topics' queries are queued up front, so the pool stays busy across
+    topic boundaries; reports are written in topic order as their searches
+    finish. A failing topic is recorded in the error table and skipped.
+    """
+    results: List[dict] = []
+    errors: List[dict] = []
+    slugs: set = set()
+    inflight: Dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        queued = [
+            (topic, submit_searches(pool, api_key, topic, country, lang, count, limiter, cache, session, inflight))
+            for topic in topics
+        ]
+        for topic, (jobs, futures) in queued:
+            out_path = os.path.join(out_dir, topic_slug(topic, slugs) + ".md")
+            stage = "search"
+            try:
+                sources = merge_sources(jobs, [f.result() for f in futures])
+                stage = "report"
+                analysis = analyze(topic, sources, matcher)
+                paths = write_outputs(analysis, out_path, fmt)
+                result = {**analysis.summary(), **paths, "top_gap": analysis.top_gap}
+                results.append(result)
+                if create_asana:
+                    stage = "asana"
+                    report_path = paths.get("out") or paths["json_out"]
+                    result["asana_task_gid"] = create_asana_task("Market Research", analysis.findings, report_path, topic)
+            except Exception as e:
+                errors.append({"topic": topic, "stage": stage, "error": str(e)})
+                print(f"[error] {topic}: {stage}: {e}", file=sys.stderr, flush=True)
+                continue
+            print(f"[info] {topic}: {', '.join(paths.values())}", file=sys.stderr, flush=True)
+
+    index_path = os.path.join(out_dir, "index.md")
+    os.makedirs(out_dir, exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(build_index(results, errors, out_dir))
+    return {"index": index_path, "topics": len(topics), "reports": results, "errors": errors}
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="SERP-driven market research report generator")
-    parser.add_argument("topic", help="e.g. 'AI automation tools'")
+    parser.add_argument("topic", nargs="?", help="e.g. 'AI automation tools'")
     parser.add_argument("--out", default="research/ai-automation-market.md", help="Output markdown path")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="markdown",
+        help="Report format; json writes the full analysis next to --out with a .json suffix",
+    )
+    parser.add_argument("--topics-file", default=None, help="Research every topic in this file (one per line) in one run")
+    parser.add_argument("--out-dir", default="research/market", help="Report and index.md directory for --topics-file")
     parser.add_argument("--country", default="JP")
     parser.add_argument("--lang", default="en")
     parser.add_argument("--count", type=int, default=8, help="Results per query")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Brave queries in flight at once")
+    parser.add_argument(
+        "--qps",
+        type=float,
+        default=None,
+        help=f"Max Brave queries per second (default: BRAVE_QPS or {DEFAULT_QPS:g}; 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=CACHE_MODES,
+        default="use",
+        help="use: serve fresh cached SERPs, fetch the rest; refresh: always fetch; offline: cache only, no API calls",
+    )
+    parser.add_argument("--cache-path", default=None, help="SERP cache DB (default: BRAVE_CACHE_PATH or automation/.cache/brave_serp.sqlite)")
+    parser.add_argument(
+        "--cache-ttl-hours",
+        type=float,
+        default=None,
+        help=f"Age after which cached SERPs are re-fetched (default: BRAVE_CACHE_TTL_HOURS or {DEFAULT_CACHE_TTL_HOURS:g})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=None,
+        help=f"Cache size before least recently used entries are evicted (default: BRAVE_CACHE_MAX_MB or {DEFAULT_CACHE_MAX_MB:g})",
+    )
+    parser.add_argument(
+        "--signals-file",
+        default=os.getenv("MARKET_SIGNALS_FILE", "").strip() or None,
+        help="JSON {kind: {label: [terms]}} extending the built-in pricing/gap signals (default: MARKET_SIGNALS_FILE)",
+    )
     parser.add_argument("--create-asana", action="store_true", help="Create Asana task with key findings")
     args = parser.parse_args()
+    if bool(args.topic) == bool(args.topics_file):
+        parser.error("give either a topic or --topics-file")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+    qps = args.qps if args.qps is not None else float(os.getenv("BRAVE_QPS", "").strip() or DEFAULT_QPS)
+    ttl_hours = args.cache_ttl_hours
+    if ttl_hours is None:
+        ttl_hours = float(os.getenv("BRAVE_CACHE_TTL_HOURS", "").strip() or DEFAULT_CACHE_TTL_HOURS)
+    max_mb = args.cache_max_mb
+    if max_mb is None:
+        max_mb = float(os.getenv("BRAVE_CACHE_MAX_MB", "").strip() or DEFAULT_CACHE_MAX_MB)
+
+    try:
+        matcher = load_signals(args.signals_file)
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"[error] --signals-file: {e}", file=sys.stderr)
+        return 1
 
     api_key = os.getenv("BRAVE_API_KEY", "").strip()
-    if not api_key:
+    if not api_key and args.cache_mode != "offline":
         print("[error] BRAVE_API_KEY is missing. Add it to .env or shell environment.", file=sys.stderr)
         return 1
 
+    cache = SerpCache(
+        args.cache_path or os.getenv("BRAVE_CACHE_PATH", "").strip() or DEFAULT_CACHE_PATH,
+        mode=args.cache_mode,
+        ttl_hours=ttl_hours,
+        max_mb=max_mb,
+    )
+    session = BraveSession()
     try:
-        sources = collect_sources(api_key, args.topic, country=args.country, lang=args.lang, count=args.count)
-        report, findings = build_markdown(args.topic, sources)
-
-        out_path = args.out
-        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(report)
-
-        result = {
-            "ok": True,
-            "topic": args.topic,
-            "out": out_path,
-            "competitors": len(extract_competitors(sources["competitors"])),
-            "pricing_signals": len(infer_pricing_models(sources["pricing"])),
-        }
+        t0 = time.perf_counter()
+        if args.topics_file:
+            batch = run_batch(
+                load_topics(args.topics_file),
+                args.out_dir,
+                api_key,
+                country=args.country,
+                lang=args.lang,
+                count=args.count,
+                concurrency=args.concurrency,
+                limiter=RateLimiter(qps),
+                cache=cache,
+                session=session,
+                create_asana=args.create_asana,
+                matcher=matcher,
+                fmt=args.format,
+            )
+            result = {"ok": not batch["errors"], **batch, "seconds": round(time.perf_counter() - t0, 3), "cache": cache.summary()}
+            print(json.dumps(result, ensure_ascii=False))
+            return 0 if result["ok"] else 1
+
+        sources = collect_sources(
+            api_key,
+            args.topic,
+            country=args.country,
+            lang=args.lang,
+            count=args.count,
+            concurrency=args.concurrency,
+            limiter=RateLimiter(qps),
+            cache=cache,
+            session=session,
+        )
+        search_seconds = time.perf_counter() - t0
+        analysis = analyze(args.topic, sources, matcher)
+        paths = write_outputs(analysis, args.out, args.format)
+        result = {"ok": True, **analysis.summary(), **paths, "search_seconds": round(search_seconds, 3), "cache": cache.summary()}
 
         if args.create_asana:
-            gid = create_asana_task("Market Research", findings, out_path, args.topic)
+            gid = create_asana_task("Market Research", analysis.findings, paths.get("out") or paths["json_out"], args.topic)
             result["asana_task_gid"] = gid
 
         print(json.dumps(result, ensure_ascii=False))
@@ -309,6 +1086,9 @@ def main() -> int:
     except Exception as e:
         print(f"[error] {e}", file=sys.stderr)
         return 1
+    finally:
+        session.close()
+        cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""Date windows shared by the collector (--range/--start-date/--end-date/--lifetime)
+and the query tool (--range/--start/--end)."""
+import datetime as dt
+
+RANGE_CHOICES = {"last7", "last30", "last90", "last365", "mtd", "qtd", "ytd", "lastmonth", "lastquarter"}
+LIFETIME_START = "2005-02-14"
+
+
+def compute_date_range(args) -> tuple[str, str, str]:
+    today = dt.date.today()
+
+    if args.lifetime:
+        return LIFETIME_START, today.isoformat(), "lifetime"
+
+    if args.range:
+        if args.range not in RANGE_CHOICES:
+            raise SystemExit(
+                f"Invalid --range '{args.range}'. Use one of: {', '.join(sorted(RANGE_CHOICES))}"
+            )
+        if args.range == "last7":
+            start = today - dt.timedelta(days=7)
+            return start.isoformat(), today.isoformat(), "last7"
+        if args.range == "last30":
+            start = today - dt.timedelta(days=30)
+            return start.isoformat(), today.isoformat(), "last30"
+        if args.range == "last90":
+            start = today - dt.timedelta(days=90)
+            return start.isoformat(), today.isoformat(), "last90"
+        if args.range == "last365":
+            start = today - dt.timedelta(days=365)
+            return start.isoformat(), today.isoformat(), "last365"
+        if args.range == "mtd":
+            start = today.replace(day=1)
+            return start.isoformat(), today.isoformat(), "mtd"
+        if args.range == "ytd":
+            start = dt.date(today.year, 1, 1)
+            return start.isoformat(), today.isoformat(), "ytd"
+        quarter_start = dt.date(today.year, 3 * ((today.month - 1) // 3) + 1, 1)
+        if args.range == "qtd":
+            return quarter_start.isoformat(), today.isoformat(), "qtd"
+        if args.range == "lastmonth":
+            end = today.replace(day=1) - dt.timedelta(days=1)
+            return end.replace(day=1).isoformat(), end.isoformat(), "lastmonth"
+        if args.range == "lastquarter":
+            end = quarter_start - dt.timedelta(days=1)
+            start = dt.date(end.year, end.month - 2, 1)
+            return start.isoformat(), end.isoformat(), "lastquarter"
+
+    end_date = args.end_date or today.isoformat()
+    start_date = args.start_date or (today - dt.timedelta(days=30)).isoformat()
+
+    # Validate format early.
+    dt.date.fromisoformat(start_date)
+    dt.date.fromisoformat(end_date)
+
+    return start_date, end_date, "custom"
@@ -1,16 +1,75 @@
+import datetime as dt
 import sqlite3
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import quote
 
+DEFAULT_CHUNK_SIZE = 20000
+MIGRATION_CHUNK_SIZE = 200000
 
-def connect(db_path: str) -> sqlite3.Connection:
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
+# daily_stats stores dates as days since 1970-01-01; in SQL that is
+# date(day * 86400, 'unixepoch') one way and EPOCH_JULIAN offsets the other.
+EPOCH = dt.date(1970, 1, 1)
+EPOCH_JULIAN = 2440587.5
+
+# PRAGMAs applied per connection. "collector" is the single writer (WAL so
+# readers never block it, NORMAL sync is durable enough under WAL); "reader"
+# opens the file read-only and never takes write locks. auto_vacuum only takes
+# effect on a new file (it must precede WAL) or after yta_maintain's one-off VACUUM.
+CONNECTION_PROFILES = {
+    "collector": {
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    "reader": {
+        "query_only": "ON",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def day_number(date_str: str) -> int:
+    return (dt.date.fromisoformat(date_str) - EPOCH).days
+
+
+def day_date(day: int) -> str:
+    return (EPOCH + dt.timedelta(days=day)).isoformat()
+
+
+def connect(db_path: str, profile: Optional[str] = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open the analytics DB, optionally tuned with one of CONNECTION_PROFILES.
+
+    The "reader" profile opens a read-only (mode=ro) URI connection, so the DB
+    must already exist. check_same_thread=False is for pooled connections that
+    are handed between threads but only used by one at a time.
+    """
+    if profile is not None and profile not in CONNECTION_PROFILES:
+        raise ValueError(f"Unknown connection profile '{profile}'. Use one of: {', '.join(CONNECTION_PROFILES)}")
+
+    if profile == "reader":
+        conn = sqlite3.connect(
+            f"file:{quote(str(Path(db_path).resolve()))}?mode=ro", uri=True, check_same_thread=check_same_thread
+        )
+    else:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    for name, value in CONNECTION_PROFILES.get(profile, {}).items():
+        conn.execute(f"PRAGMA {name} = {value}")
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
+def _migrate_base(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS videos (
@@ -40,9 +99,321 @@ def init_db(conn: sqlite3.Connection) -> None:
 
         CREATE INDEX IF NOT EXISTS idx_stats_date ON daily_video_stats(stat_date);
         CREATE INDEX IF NOT EXISTS idx_stats_video ON daily_video_stats(video_id);
+
+        CREATE TABLE IF NOT EXISTS collection_state (
+            video_id TEXT PRIMARY KEY,
+            last_final_date TEXT NOT NULL,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(video_id) REFERENCES videos(video_id) ON DELETE CASCADE
+        );
+        """
+    )
+
+
+def _migrate_rollups(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS video_monthly_stats (
+            video_id TEXT NOT NULL,
+            month TEXT NOT NULL,
+            views INTEGER NOT NULL DEFAULT 0,
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            estimated_minutes_watched INTEGER NOT NULL DEFAULT 0,
+            subscribers_gained INTEGER NOT NULL DEFAULT 0,
+            subscribers_lost INTEGER NOT NULL DEFAULT 0,
+            days INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(video_id, month)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_monthly_month ON video_monthly_stats(month);
+
+        CREATE TABLE IF NOT EXISTS channel_daily_totals (
+            channel_id TEXT NOT NULL,
+            stat_date TEXT NOT NULL,
+            views INTEGER NOT NULL DEFAULT 0,
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            estimated_minutes_watched INTEGER NOT NULL DEFAULT 0,
+            subscribers_gained INTEGER NOT NULL DEFAULT 0,
+            subscribers_lost INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(stat_date, channel_id)
+        ) WITHOUT ROWID;
+        """
+    )
+    # Tables added to an existing DB start out empty; _migrate_compact_stats
+    # backfills them once the daily rows are in their current table.
+
+
+def _migrate_covering_indexes(conn: sqlite3.Connection) -> None:
+    # The date-range GROUP BY video_id reports read only these columns, so they
+    # are answered from the index without touching the table. The old
+    # single-column indexes are prefixes of this one / of UNIQUE(video_id, stat_date).
+    conn.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_stats_date_cover
+            ON daily_video_stats(stat_date, video_id, views, likes, comments);
+        DROP INDEX IF EXISTS idx_stats_date;
+        DROP INDEX IF EXISTS idx_stats_video;
+
+        CREATE INDEX IF NOT EXISTS idx_monthly_month_cover
+            ON video_monthly_stats(month, video_id, views, likes, comments);
+        DROP INDEX IF EXISTS idx_monthly_month;
+
+        ANALYZE;
+        """
+    )
+
+
+def _migrate_channel_catalog(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS channel_catalog (
+            channel_id TEXT PRIMARY KEY,
+            uploads_playlist_id TEXT NOT NULL,
+            first_page_etag TEXT,
+            synced_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos(channel_id);
+        """
+    )
+
+
+def _migrate_export_watermark(conn: sqlite3.Connection) -> None:
+    # Lets yta_export find rows changed since its last run (and their months)
+    # without walking the whole table.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_updated ON daily_video_stats(updated_at, stat_date)")
+
+
+def _migrate_meta(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID;
+
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0);
+        """
+    )
+
+
+def _migrate_snapshots(conn: sqlite3.Connection) -> None:
+    # Cumulative public counters polled by yta_snapshot; captured_at is unix
+    # seconds so the key stays small and buckets are plain integer division.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS video_stat_snapshots (
+            video_id TEXT NOT NULL,
+            captured_at INTEGER NOT NULL,
+            views INTEGER NOT NULL,
+            likes INTEGER NOT NULL,
+            comments INTEGER NOT NULL,
+            PRIMARY KEY(video_id, captured_at)
+        ) WITHOUT ROWID
         """
     )
+
+
+def _migrate_lifetime_totals(conn: sqlite3.Connection) -> None:
+    # Public lifetime counters per video as of lifetime_fetched_at, and their
+    # per-channel sum, so --lifetime only re-fetches videos that changed.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(videos)")}
+    for name, decl in (
+        ("lifetime_views", "INTEGER"),
+        ("lifetime_likes", "INTEGER"),
+        ("lifetime_comments", "INTEGER"),
+        ("lifetime_fetched_at", "TEXT"),
+    ):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE videos ADD COLUMN {name} {decl}")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS channel_lifetime_totals (
+            channel_id TEXT PRIMARY KEY,
+            videos INTEGER NOT NULL DEFAULT 0,
+            views INTEGER NOT NULL DEFAULT 0,
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+        """
+    )
+
+
+COMPACT_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS video_keys (
+    vid INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_key AFTER INSERT ON videos BEGIN
+    INSERT OR IGNORE INTO video_keys (video_id) VALUES (NEW.video_id);
+END;
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    vid INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    estimated_minutes_watched INTEGER NOT NULL DEFAULT 0,
+    average_view_duration REAL NOT NULL DEFAULT 0,
+    subscribers_gained INTEGER NOT NULL DEFAULT 0,
+    subscribers_lost INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY(vid, day)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_daily_day_cover ON daily_stats(day, vid, views, likes, comments);
+CREATE INDEX IF NOT EXISTS idx_daily_updated ON daily_stats(updated_at);
+"""
+
+# The pre-v9 shape (text keys and timestamps), for tools and ad-hoc SQL that read it.
+DAILY_VIDEO_STATS_VIEW = """
+CREATE VIEW IF NOT EXISTS daily_video_stats AS
+SELECT k.video_id AS video_id,
+       date(s.day * 86400, 'unixepoch') AS stat_date,
+       s.views, s.likes, s.comments, s.estimated_minutes_watched, s.average_view_duration,
+       s.subscribers_gained, s.subscribers_lost,
+       datetime(s.updated_at, 'unixepoch') AS updated_at
+FROM daily_stats s
+JOIN video_keys k ON k.vid = s.vid
+"""
+
+LEGACY_COPY_SQL = f"""
+INSERT OR REPLACE INTO daily_stats (
+    vid, day, views, likes, comments, estimated_minutes_watched, average_view_duration,
+    subscribers_gained, subscribers_lost, updated_at
+)
+SELECT k.vid, CAST(julianday(s.stat_date) - {EPOCH_JULIAN} AS INTEGER),
+       s.views, s.likes, s.comments, s.estimated_minutes_watched, s.average_view_duration,
+       s.subscribers_gained, s.subscribers_lost, COALESCE(CAST(strftime('%s', s.updated_at) AS INTEGER), 0)
+FROM daily_video_stats s
+JOIN video_keys k ON k.video_id = s.video_id
+"""
+
+
+def _copy_legacy_stats(conn: sqlite3.Connection, chunk_size: int = MIGRATION_CHUNK_SIZE) -> None:
+    """Move the text-keyed daily_video_stats table into daily_stats without a long lock.
+
+    Rows are copied in id ranges, one short transaction each, while other
+    connections keep reading and writing the old table. The last step takes
+    the write lock once to copy rows inserted or updated since the copy began
+    (via idx_stats_updated), then replaces the table with the compatibility
+    view. Interrupted runs start over; every copy is INSERT OR REPLACE.
+    """
+    started = conn.execute("SELECT datetime('now')").fetchone()[0]
+    conn.execute("INSERT OR IGNORE INTO video_keys (video_id) SELECT DISTINCT video_id FROM daily_video_stats")
+    conn.commit()
+    last_id = 0
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM daily_video_stats").fetchone()[0]
+    while last_id < max_id:
+        conn.execute(LEGACY_COPY_SQL + " WHERE s.id > ? AND s.id <= ?", (last_id, last_id + chunk_size))
+        conn.commit()
+        last_id += chunk_size
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("INSERT OR IGNORE INTO video_keys (video_id) SELECT DISTINCT video_id FROM daily_video_stats WHERE id > ?", (max_id,))
+        conn.execute(LEGACY_COPY_SQL + " WHERE s.id > ?", (max_id,))
+        conn.execute(LEGACY_COPY_SQL + " WHERE s.updated_at >= ?", (started,))
+        conn.execute("DROP TABLE daily_video_stats")
+        conn.execute(DAILY_VIDEO_STATS_VIEW)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _migrate_compact_stats(conn: sqlite3.Connection) -> None:
+    # Integer video keys and day numbers, clustered on (vid, day): a fraction of
+    # the text-keyed table's size, and a video's history is one contiguous range.
+    conn.executescript(COMPACT_STATS_SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO video_keys (video_id) SELECT video_id FROM videos")
     conn.commit()
+    legacy = conn.execute("SELECT type FROM sqlite_master WHERE name = 'daily_video_stats'").fetchone()
+    if legacy and legacy[0] == "table":
+        _copy_legacy_stats(conn)
+        # The old table's planner stats went with it; the new ones need their own.
+        conn.execute("ANALYZE daily_stats")
+        conn.execute("ANALYZE video_keys")
+        conn.commit()
+    else:
+        conn.execute(DAILY_VIDEO_STATS_VIEW)
+
+    # Rollup tables added to an existing DB start out empty; fill them once.
+    if conn.execute("SELECT 1 FROM channel_daily_totals LIMIT 1").fetchone() is None:
+        bounds = conn.execute("SELECT MIN(day), MAX(day) FROM daily_stats").fetchone()
+        if bounds[0] is not None:
+            refresh_rollups(conn, day_date(bounds[0]), day_date(bounds[1]), bump=False)
+
+
+# (user_version, migration). Migrations must be idempotent: a crash between a
+# migration and its version bump re-runs it on the next init_db.
+MIGRATIONS = [
+    (1, _migrate_base),
+    (2, _migrate_rollups),
+    (3, _migrate_covering_indexes),
+    (4, _migrate_channel_catalog),
+    (5, _migrate_export_watermark),
+    (6, _migrate_meta),
+    (7, _migrate_snapshots),
+    (8, _migrate_lifetime_totals),
+    (9, _migrate_compact_stats),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def data_version(conn: sqlite3.Connection) -> int:
+    """Counter bumped in the same transaction as every write that can change a report.
+
+    Readers that cache results key them on this value (see query_cache).
+    """
+    row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+    return row[0] if row else 0
+
+
+def bump_data_version(conn: sqlite3.Connection) -> None:
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+
+def archived_before(conn: sqlite3.Connection) -> Optional[str]:
+    """First day (YYYY-MM-DD) whose daily rows yta_maintain has not archived, or None."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'archived_before'").fetchone()
+    if not row:
+        return None
+    v = str(row[0])
+    return f"{v[:4]}-{v[4:6]}-{v[6:]}"
+
+
+def set_archived_before(conn: sqlite3.Connection, date_str: str) -> None:
+    # Stored as YYYYMMDD because meta values are integers; it only ever moves forward.
+    conn.execute(
+        """
+        INSERT INTO meta (key, value) VALUES ('archived_before', ?)
+        ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)
+        """,
+        (int(date_str.replace("-", "")),),
+    )
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    """Bring the schema up to SCHEMA_VERSION, applying pending MIGRATIONS in order."""
+    current = schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema v{current} is newer than this code (v{SCHEMA_VERSION})")
+    for version, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        migrate(conn)
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
 
 
 def upsert_video(conn: sqlite3.Connection, video: dict) -> None:
@@ -60,28 +431,32 @@ def upsert_video(conn: sqlite3.Connection, video: dict) -> None:
     )
 
 
+UPSERT_DAILY_STAT_SQL = """
+INSERT INTO daily_stats (
+    vid, day, views, likes, comments,
+    estimated_minutes_watched, average_view_duration,
+    subscribers_gained, subscribers_lost, updated_at
+)
+VALUES ((SELECT vid FROM video_keys WHERE video_id = ?), ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+ON CONFLICT(vid, day) DO UPDATE SET
+    views=excluded.views,
+    likes=excluded.likes,
+    comments=excluded.comments,
+    estimated_minutes_watched=excluded.estimated_minutes_watched,
+    average_view_duration=excluded.average_view_duration,
+    subscribers_gained=excluded.subscribers_gained,
+    subscribers_lost=excluded.subscribers_lost,
+    updated_at=excluded.updated_at
+"""
+
+
 def upsert_daily_stat(conn: sqlite3.Connection, row: dict) -> None:
+    # An unknown video_id leaves vid NULL, which the primary key rejects.
     conn.execute(
-        """
-        INSERT INTO daily_video_stats (
-            video_id, stat_date, views, likes, comments,
-            estimated_minutes_watched, average_view_duration,
-            subscribers_gained, subscribers_lost, updated_at
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(video_id, stat_date) DO UPDATE SET
-            views=excluded.views,
-            likes=excluded.likes,
-            comments=excluded.comments,
-            estimated_minutes_watched=excluded.estimated_minutes_watched,
-            average_view_duration=excluded.average_view_duration,
-            subscribers_gained=excluded.subscribers_gained,
-            subscribers_lost=excluded.subscribers_lost,
-            updated_at=CURRENT_TIMESTAMP
-        """,
+        UPSERT_DAILY_STAT_SQL,
         (
             row["video_id"],
-            row["stat_date"],
+            day_number(row["stat_date"]),
             int(row.get("views", 0)),
             int(row.get("likes", 0)),
             int(row.get("comments", 0)),
@@ -91,3 +466,362 @@ def upsert_daily_stat(conn: sqlite3.Connection, row: dict) -> None:
             int(row.get("subscribers_lost", 0)),
         ),
     )
+
+
+def _executemany_chunked(conn: sqlite3.Connection, sql: str, params: Iterable[tuple], chunk_size: int) -> int:
+    """executemany in chunks, one transaction per chunk; returns rows actually changed.
+
+    If the caller already has a transaction open, chunks join it and the
+    caller stays responsible for committing. A chunk that changes rows also
+    bumps data_version inside its transaction.
+    """
+    changed = 0
+    it = iter(params)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            break
+        owns_txn = not conn.in_transaction
+        if owns_txn:
+            conn.execute("BEGIN")
+        try:
+            before = conn.total_changes
+            conn.executemany(sql, chunk)
+            chunk_changed = conn.total_changes - before
+            if chunk_changed:
+                bump_data_version(conn)
+        except Exception:
+            if owns_txn:
+                conn.rollback()
+            raise
+        if owns_txn:
+            conn.commit()
+        changed += chunk_changed
+    return changed
+
+
+def upsert_videos_bulk(conn: sqlite3.Connection, videos: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    # Rows whose metadata is unchanged are left alone so updated_at only moves on real edits.
+    return _executemany_chunked(
+        conn,
+        """
+        INSERT INTO videos (video_id, title, published_at, channel_id, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(video_id) DO UPDATE SET
+            title=excluded.title,
+            published_at=excluded.published_at,
+            channel_id=excluded.channel_id,
+            updated_at=CURRENT_TIMESTAMP
+        WHERE title IS NOT excluded.title
+           OR published_at IS NOT excluded.published_at
+           OR channel_id IS NOT excluded.channel_id
+        """,
+        ((v["video_id"], v["title"], v.get("published_at"), v.get("channel_id")) for v in videos),
+        chunk_size,
+    )
+
+
+def upsert_daily_stats_bulk(conn: sqlite3.Connection, rows: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Upsert daily stat rows from any iterable; returns the number of rows inserted or changed.
+
+    Values are bound as-is and coerced by the INTEGER/REAL column affinity;
+    rows identical to what is stored are skipped, leaving updated_at untouched.
+    """
+    return _executemany_chunked(
+        conn,
+        UPSERT_DAILY_STAT_SQL
+        + """
+        WHERE views IS NOT excluded.views
+           OR likes IS NOT excluded.likes
+           OR comments IS NOT excluded.comments
+           OR estimated_minutes_watched IS NOT excluded.estimated_minutes_watched
+           OR average_view_duration IS NOT excluded.average_view_duration
+           OR subscribers_gained IS NOT excluded.subscribers_gained
+           OR subscribers_lost IS NOT excluded.subscribers_lost
+        """,
+        (
+            (
+                r["video_id"],
+                day_number(r["stat_date"]),
+                r.get("views", 0),
+                r.get("likes", 0),
+                r.get("comments", 0),
+                r.get("estimated_minutes_watched", 0),
+                r.get("average_view_duration", 0),
+                r.get("subscribers_gained", 0),
+                r.get("subscribers_lost", 0),
+            )
+            for r in rows
+        ),
+        chunk_size,
+    )
+
+
+def get_collection_state(conn: sqlite3.Connection) -> dict:
+    """Map video_id -> last stat_date that is considered final (no longer revised)."""
+    return {r["video_id"]: r["last_final_date"] for r in conn.execute("SELECT video_id, last_final_date FROM collection_state")}
+
+
+def advance_collection_state(conn: sqlite3.Connection, video_id: str, last_final_date: str) -> None:
+    # Watermarks only move forward; a narrower re-run must not rewind them.
+    conn.execute(
+        """
+        INSERT INTO collection_state (video_id, last_final_date, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(video_id) DO UPDATE SET
+            last_final_date=MAX(last_final_date, excluded.last_final_date),
+            updated_at=CURRENT_TIMESTAMP
+        """,
+        (video_id, last_final_date),
+    )
+
+
+def refresh_rollups(conn: sqlite3.Connection, start_date: str, end_date: str, bump: bool = True) -> None:
+    """Recompute rollups for the dates a collection touched.
+
+    channel_daily_totals is rebuilt for exactly [start_date, end_date];
+    video_monthly_stats for every month overlapping that range. Dates before
+    the archive horizon are skipped: their daily rows have moved out, so the
+    stored rollups are the only complete copy. bump=False (the schema
+    migration and yta_fixtures) skips both the data_version bump and that
+    archive-horizon clamp.
+    """
+    horizon = archived_before(conn) if bump else None
+    if horizon and start_date < horizon:
+        start_date = horizon
+        if start_date > end_date:
+            return
+    first_day, last_day = day_number(start_date), day_number(end_date)
+    conn.execute("DELETE FROM channel_daily_totals WHERE stat_date BETWEEN ? AND ?", (start_date, end_date))
+    conn.execute(
+        """
+        INSERT INTO channel_daily_totals (
+            channel_id, stat_date, views, likes, comments,
+            estimated_minutes_watched, subscribers_gained, subscribers_lost
+        )
+        SELECT COALESCE(v.channel_id, ''), date(s.day * 86400, 'unixepoch'),
+               SUM(s.views), SUM(s.likes), SUM(s.comments),
+               SUM(s.estimated_minutes_watched), SUM(s.subscribers_gained), SUM(s.subscribers_lost)
+        FROM daily_stats s
+        JOIN video_keys k ON k.vid = s.vid
+        JOIN videos v ON v.video_id = k.video_id
+        WHERE s.day BETWEEN ? AND ?
+        GROUP BY 1, s.day
+        """,
+        (first_day, last_day),
+    )
+
+    month_first = dt.date.fromisoformat(start_date).replace(day=1)
+    month_last = (dt.date.fromisoformat(end_date).replace(day=1) + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    conn.execute(
+        "DELETE FROM video_monthly_stats WHERE month BETWEEN substr(?, 1, 7) AND substr(?, 1, 7)",
+        (start_date, end_date),
+    )
+    conn.execute(
+        """
+        INSERT INTO video_monthly_stats (
+            video_id, month, views, likes, comments,
+            estimated_minutes_watched, subscribers_gained, subscribers_lost, days
+        )
+        SELECT k.video_id, strftime('%Y-%m', s.day * 86400, 'unixepoch'),
+               SUM(s.views), SUM(s.likes), SUM(s.comments),
+               SUM(s.estimated_minutes_watched), SUM(s.subscribers_gained), SUM(s.subscribers_lost),
+               COUNT(*)
+        FROM daily_stats s
+        JOIN video_keys k ON k.vid = s.vid
+        WHERE s.day BETWEEN ? AND ?
+        GROUP BY s.vid, 2
+        """,
+        ((month_first - EPOCH).days, (month_last - EPOCH).days),
+    )
+    if bump:
+        bump_data_version(conn)
+    conn.commit()
+
+
+def get_channel_catalog(conn: sqlite3.Connection, channel_id: str):
+    return conn.execute(
+        "SELECT uploads_playlist_id, first_page_etag FROM channel_catalog WHERE channel_id = ?", (channel_id,)
+    ).fetchone()
+
+
+def save_channel_catalog(conn: sqlite3.Connection, channel_id: str, uploads_playlist_id: str, first_page_etag) -> None:
+    conn.execute(
+        """
+        INSERT INTO channel_catalog (channel_id, uploads_playlist_id, first_page_etag, synced_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            uploads_playlist_id=excluded.uploads_playlist_id,
+            first_page_etag=excluded.first_page_etag,
+            synced_at=CURRENT_TIMESTAMP
+        """,
+        (channel_id, uploads_playlist_id, first_page_etag),
+    )
+    conn.commit()
+
+
+def list_channel_videos(conn: sqlite3.Connection, channel_id: str) -> list:
+    rows = conn.execute(
+        """
+        SELECT video_id, title, published_at, channel_id
+        FROM videos
+        WHERE channel_id = ?
+        ORDER BY published_at DESC
+        """,
+        (channel_id,),
+    )
+    return [dict(r) for r in rows]
+
+
+def videos_needing_lifetime_refresh(
+    conn: sqlite3.Connection,
+    channel_id: str,
+    stale_before: str,
+    recent_since: str,
+    drift: float,
+    drift_min_views: int,
+) -> list:
+    """Video IDs whose stored lifetime counters should be re-fetched.
+
+    That is: never fetched, fetched at or before stale_before, published on or after
+    recent_since, or with more daily views recorded since the fetch than
+    max(drift * lifetime_views, drift_min_views).
+    """
+    rows = conn.execute(
+        """
+        SELECT v.video_id
+        FROM videos v
+        JOIN video_keys k ON k.video_id = v.video_id
+        WHERE v.channel_id = :channel_id
+          AND (
+              v.lifetime_fetched_at IS NULL
+              OR v.lifetime_fetched_at <= :stale_before
+              OR v.published_at >= :recent_since
+              OR (
+                  SELECT SUM(s.views)
+                  FROM daily_stats s
+                  WHERE s.vid = k.vid
+                    AND s.day >= CAST(julianday(substr(v.lifetime_fetched_at, 1, 10)) - :epoch_julian AS INTEGER)
+              ) > MAX(COALESCE(v.lifetime_views, 0) * :drift, :drift_min_views)
+          )
+        """,
+        {
+            "channel_id": channel_id,
+            "stale_before": stale_before,
+            "recent_since": recent_since,
+            "drift": drift,
+            "drift_min_views": drift_min_views,
+            "epoch_julian": EPOCH_JULIAN,
+        },
+    )
+    return [r[0] for r in rows]
+
+
+def save_lifetime_stats(conn: sqlite3.Connection, video_ids: list, stats: dict) -> None:
+    """Store fetched {video_id: {"views", "likes", "comments"}} for video_ids.
+
+    IDs missing from stats (private or deleted videos) keep their old counters
+    but are stamped as fetched, so they are not retried on every run.
+    """
+    with conn:
+        conn.executemany(
+            """
+            UPDATE videos
+            SET lifetime_views = ?, lifetime_likes = ?, lifetime_comments = ?, lifetime_fetched_at = CURRENT_TIMESTAMP
+            WHERE video_id = ?
+            """,
+            [(s["views"], s["likes"], s["comments"], video_id) for video_id, s in stats.items()],
+        )
+        conn.executemany(
+            "UPDATE videos SET lifetime_fetched_at = CURRENT_TIMESTAMP WHERE video_id = ?",
+            [(video_id,) for video_id in video_ids if video_id not in stats],
+        )
+
+
+def refresh_channel_lifetime_totals(conn: sqlite3.Connection, channel_id: str) -> dict:
+    """Re-sum the channel's stored per-video lifetime counters into channel_lifetime_totals."""
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO channel_lifetime_totals (channel_id, videos, views, likes, comments, updated_at)
+            SELECT :channel_id, COUNT(*), COALESCE(SUM(lifetime_views), 0), COALESCE(SUM(lifetime_likes), 0),
+                   COALESCE(SUM(lifetime_comments), 0), CURRENT_TIMESTAMP
+            FROM videos
+            WHERE channel_id = :channel_id
+            ON CONFLICT(channel_id) DO UPDATE SET
+                videos=excluded.videos,
+                views=excluded.views,
+                likes=excluded.likes,
+                comments=excluded.comments,
+                updated_at=CURRENT_TIMESTAMP
+            """,
+            {"channel_id": channel_id},
+        )
+    return get_channel_lifetime_totals(conn, channel_id)
+
+
+def get_channel_lifetime_totals(conn: sqlite3.Connection, channel_id: str):
+    row = conn.execute(
+        "SELECT videos, views, likes, comments, updated_at FROM channel_lifetime_totals WHERE channel_id = ?",
+        (channel_id,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def list_recent_videos(conn: sqlite3.Connection, published_since: str, channel_id: Optional[str] = None) -> list:
+    rows = conn.execute(
+        """
+        SELECT video_id, title, published_at, channel_id
+        FROM videos
+        WHERE published_at >= ?
+          AND (? IS NULL OR channel_id = ?)
+        ORDER BY published_at DESC
+        """,
+        (published_since, channel_id, channel_id),
+    )
+    return [dict(r) for r in rows]
+
+
+def insert_snapshots(conn: sqlite3.Connection, captured_at: int, stats: dict) -> int:
+    """Store one poll's {video_id: {"views", "likes", "comments"}} at captured_at (unix seconds)."""
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO video_stat_snapshots (video_id, captured_at, views, likes, comments)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [(video_id, captured_at, s["views"], s["likes"], s["comments"]) for video_id, s in stats.items()],
+    )
+    conn.commit()
+    return len(stats)
+
+
+def downsample_snapshots(conn: sqlite3.Connection, start: int, end: int, bucket_seconds: int) -> int:
+    """Keep only the last snapshot per video per bucket among those with start <= captured_at < end.
+
+    Counters are cumulative, so the kept rows still give exact deltas between
+    buckets. Returns the number of rows deleted.
+    """
+    cur = conn.execute(
+        """
+        DELETE FROM video_stat_snapshots
+        WHERE (video_id, captured_at) IN (
+            SELECT video_id, captured_at
+            FROM (
+                SELECT video_id, captured_at,
+                       ROW_NUMBER() OVER (PARTITION BY video_id, captured_at / :bucket ORDER BY captured_at DESC) AS rn
+                FROM video_stat_snapshots
+                WHERE captured_at >= :start AND captured_at < :end
+            )
+            WHERE rn > 1
+        )
+        """,
+        {"start": start, "end": end, "bucket": bucket_seconds},
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+def expire_snapshots(conn: sqlite3.Connection, before: int) -> int:
+    cur = conn.execute("DELETE FROM video_stat_snapshots WHERE captured_at < ?", (before,))
+    conn.commit()
+    return cur.rowcount
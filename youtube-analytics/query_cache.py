@@ -0,0 +1,101 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+def default_cache_path(db_path: str) -> str:
+    """youtube_analytics.db -> youtube_analytics.cache.db, next to the DB."""
+    p = Path(db_path)
+    return str(p.with_name(p.stem + ".cache.db"))
+
+
+class ResultCache:
+    """On-disk cache of report results keyed on (query, params, data_version).
+
+    Lives in its own SQLite file because report connections are read-only.
+    An entry is only served while the analytics DB is still at the
+    data_version it was computed from; older entries are dropped on the next
+    store.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=5)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                data_version INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self.session = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(query: str, params: dict) -> str:
+        return query + ":" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def _count(self, name: str) -> None:
+        self.session[name] += 1
+        self.conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+        self.conn.commit()
+
+    def get(self, query: str, params: dict, version: int) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT payload FROM results WHERE key = ? AND data_version = ?", (self.key(query, params), version)
+        ).fetchone()
+        self._count("hits" if row else "misses")
+        return json.loads(row[0]) if row else None
+
+    def put(self, query: str, params: dict, version: int, payload: dict) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM results WHERE data_version < ?", (version,))
+            self.conn.execute(
+                """
+                INSERT INTO results (key, query, data_version, payload, created_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    data_version=excluded.data_version,
+                    payload=excluded.payload,
+                    created_at=CURRENT_TIMESTAMP
+                """,
+                (self.key(query, params), query, version, json.dumps(payload, ensure_ascii=False)),
+            )
+
+    def cached(self, query: str, params: dict, version: int, compute):
+        """Return (payload, hit): the cached payload, or compute() stored under `version`."""
+        payload = self.get(query, params, version)
+        if payload is not None:
+            return payload, True
+        payload = compute()
+        self.put(query, params, version, payload)
+        return payload, False
+
+    def stats(self) -> dict:
+        totals = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = totals.get("hits", 0), totals.get("misses", 0)
+        return {
+            "path": self.path,
+            "entries": self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+            "session": dict(self.session),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+
+    def close(self) -> None:
+        self.conn.close()
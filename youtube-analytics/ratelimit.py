@@ -0,0 +1,163 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+class QuotaExhausted(RuntimeError):
+    pass
+
+
+class QuotaMeter:
+    """Thread-safe tally of Data API quota units spent, by method."""
+
+    # Documented YouTube Data API v3 costs for the methods this tool calls.
+    COSTS = {
+        "channels.list": 1,
+        "playlistItems.list": 1,
+        "videos.list": 1,
+        "search.list": 100,
+    }
+
+    def __init__(self):
+        self.by_method = {}
+        self._lock = threading.Lock()
+
+    def charge(self, method: str, calls: int = 1) -> None:
+        with self._lock:
+            self.by_method[method] = self.by_method.get(method, 0) + self.COSTS.get(method, 1) * calls
+
+    @property
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.by_method.values())
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {**self.by_method, "total": sum(self.by_method.values())}
+
+
+class RateLimiter:
+    """Token bucket in queries/second plus a daily budget of API quota units.
+
+    qps <= 0 disables pacing and daily_units <= 0 disables the budget. Safe to
+    share between threads (and between channels collected in one process).
+    """
+
+    def __init__(self, qps: float = 0, daily_units: int = 0, burst: int = 1):
+        self.qps = qps
+        self.daily_units = daily_units
+        self.burst = max(1, burst)
+        self.units_used = 0
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: int = 1) -> None:
+        with self._lock:
+            if self.daily_units > 0 and self.units_used + units > self.daily_units:
+                raise QuotaExhausted(f"daily quota of {self.daily_units} units exhausted ({self.units_used} used)")
+            self.units_used += units
+            if self.qps <= 0:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.qps)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CountingLimiter:
+    """A caller's view of a shared RateLimiter that also tallies the units it acquired.
+
+    Lets several channels share one budget while each reports its own usage.
+    """
+
+    def __init__(self, parent: RateLimiter):
+        self.parent = parent
+        self.units_used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, units: int = 1) -> None:
+        self.parent.acquire(units)
+        with self._lock:
+            self.units_used += units
+
+
+class AdaptiveConcurrency:
+    """Concurrency cap that halves on throttling and creeps back up on success."""
+
+    def __init__(self, limit: int, min_limit: int = 1, recover_after: int = 20):
+        self.max_limit = max(1, limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self.recover_after = recover_after
+        self.active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._cond.notify_all()
+
+    def throttled(self) -> None:
+        with self._cond:
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._successes = 0
+
+    def succeeded(self) -> None:
+        with self._cond:
+            if self.limit >= self.max_limit:
+                return
+            self._successes += 1
+            if self._successes >= self.recover_after:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+
+def call_with_backoff(
+    fn,
+    limiter: RateLimiter,
+    concurrency: AdaptiveConcurrency,
+    is_retryable,
+    units: int = 1,
+    retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+):
+    """Run fn() under the limiter and concurrency cap, retrying throttled/transient errors.
+
+    Each attempt is charged `units` against the daily budget; calls that cost
+    more as they go (further report pages) acquire the extra units from the
+    limiter themselves. Retryable errors
+    shrink the shared concurrency cap before sleeping with jittered exponential
+    backoff; the last error is re-raised once retries are used up.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire(units)
+        try:
+            with concurrency.slot():
+                result = fn()
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            concurrency.throttled()
+            delay = min(max_delay, base_delay * (2**attempt))
+            time.sleep(delay * (0.5 + random.random() / 2))
+            attempt += 1
+            continue
+        concurrency.succeeded()
+        return result
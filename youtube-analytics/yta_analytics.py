@@ -0,0 +1,182 @@
+"""Columnar analytics over the daily stats table.
+
+A date window is loaded once into dense (video x day) NumPy matrices, one per
+metric, with videos addressed by integer codes. Every metric below is then a
+handful of vectorized array operations, so thousands of videos x years of
+days take milliseconds once loaded.
+"""
+import datetime as dt
+from dataclasses import dataclass
+
+import numpy as np
+
+from db import archived_before, day_number
+
+METRICS = (
+    "views",
+    "likes",
+    "comments",
+    "estimated_minutes_watched",
+    "average_view_duration",
+    "subscribers_gained",
+    "subscribers_lost",
+)
+
+
+@dataclass
+class StatsWindow:
+    start: dt.date
+    end: dt.date
+    video_ids: np.ndarray  # code -> video_id
+    titles: np.ndarray  # code -> title
+    data: dict  # metric -> float64 matrix of shape (n_videos, n_days)
+
+    @property
+    def n_videos(self) -> int:
+        return len(self.video_ids)
+
+    @property
+    def n_days(self) -> int:
+        return (self.end - self.start).days + 1
+
+
+def load_window(conn, start: str, end: str, channels=None) -> StatsWindow:
+    """Load [start, end] into per-metric (video x day) matrices.
+
+    Only videos with at least one row in the window (and in `channels`, if
+    given) get a code. Days without a row are zero. Both reads run in one
+    transaction so video keys and stats come from the same snapshot.
+
+    Raises ValueError if the window starts before db.archived_before, whose
+    daily rows are no longer in the table and would read as zero.
+    """
+    horizon = archived_before(conn)
+    if horizon and start < horizon:
+        raise ValueError(f"window starts at {start}, but daily rows before {horizon} are archived")
+    s = dt.date.fromisoformat(start)
+    e = dt.date.fromisoformat(end)
+    n_days = (e - s).days + 1
+    first_day = day_number(start)
+
+    channel_params = list(channels or [])
+    channel_sql = f" AND v.channel_id IN ({', '.join('?' * len(channel_params))})" if channel_params else ""
+
+    cur = conn.cursor()
+    cur.row_factory = None
+    owns_txn = not conn.in_transaction
+    if owns_txn:
+        cur.execute("BEGIN")
+    try:
+        videos = cur.execute(
+            "SELECT k.vid, k.video_id, v.title FROM video_keys k JOIN videos v ON v.video_id = k.video_id"
+        ).fetchall()
+        # Day numbers make the column index a subtraction; no date parsing per row.
+        # CROSS JOIN keeps one primary-key range read per video: idx_daily_day_cover
+        # lacks most METRICS, so driving from it costs a second lookup per row.
+        cur.execute(
+            f"""
+            SELECT s.vid, s.day - ?, {", ".join("s." + m for m in METRICS)}
+            FROM video_keys k
+            JOIN videos v ON v.video_id = k.video_id
+            CROSS JOIN daily_stats s ON s.vid = k.vid
+            WHERE s.day BETWEEN ? AND ?{channel_sql}
+            """,
+            (first_day, first_day, day_number(end), *channel_params),
+        )
+        dtype = [("vid", np.int64), ("day", np.int64)] + [(m, np.float64) for m in METRICS]
+        rec = np.fromiter(cur, dtype=dtype)
+    finally:
+        if owns_txn:
+            cur.execute("COMMIT")
+
+    if not videos or rec.size == 0:
+        empty = np.empty(0, dtype=object)
+        return StatsWindow(s, e, empty, empty, {m: np.zeros((0, n_days)) for m in METRICS})
+
+    present, codes = np.unique(rec["vid"], return_inverse=True)
+    by_vid = {r[0]: r for r in videos}
+    video_ids = np.array([by_vid[r][1] for r in present.tolist()], dtype=object)
+    titles = np.array([by_vid[r][2] for r in present.tolist()], dtype=object)
+
+    data = {}
+    for m in METRICS:
+        matrix = np.zeros((len(present), n_days))
+        matrix[codes, rec["day"]] = rec[m]
+        data[m] = matrix
+    return StatsWindow(s, e, video_ids, titles, data)
+
+
+def rolling_sum(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Trailing `window`-day sums along the day axis (partial sums for the first days)."""
+    cs = np.cumsum(matrix, axis=1)
+    out = cs.copy()
+    if window < matrix.shape[1]:
+        out[:, window:] -= cs[:, :-window]
+    return out
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def growth_rate(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Last `window` days vs the `window` days before, as a fraction (NaN when the earlier period is 0)."""
+    last = matrix[:, -window:].sum(axis=1)
+    prev = matrix[:, -2 * window : -window].sum(axis=1)
+    return _ratio(last - prev, prev)
+
+
+def engagement_rate(w: StatsWindow) -> np.ndarray:
+    """(likes + comments) / views * 100 over the whole window."""
+    return _ratio((w.data["likes"] + w.data["comments"]).sum(axis=1), w.data["views"].sum(axis=1)) * 100
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Percent of videos at or below each value (0-100]."""
+    n = len(values)
+    if n == 0:
+        return values.astype(float)
+    sorted_vals = np.sort(values)
+    return np.searchsorted(sorted_vals, values, side="right") / n * 100
+
+
+def view_weighted_duration(w: StatsWindow, days: int = None) -> np.ndarray:
+    """Average view duration (seconds) weighted by daily views, optionally over the last `days`."""
+    views = w.data["views"]
+    avd = w.data["average_view_duration"]
+    if days:
+        views, avd = views[:, -days:], avd[:, -days:]
+    return _ratio((views * avd).sum(axis=1), views.sum(axis=1))
+
+
+def video_metrics(w: StatsWindow) -> dict:
+    """Per-video metric arrays (index = video code) for the window ending at w.end."""
+    views = w.data["views"]
+    total_views = views.sum(axis=1)
+    avd = view_weighted_duration(w)
+    avd_7 = view_weighted_duration(w, 7)
+    return {
+        "views": total_views,
+        "rolling_7": rolling_sum(views, 7)[:, -1],
+        "rolling_28": rolling_sum(views, 28)[:, -1],
+        "growth_7": growth_rate(views, 7),
+        "growth_28": growth_rate(views, 28),
+        "engagement_rate_pct": engagement_rate(w),
+        "views_percentile": percentile_rank(total_views),
+        "avg_view_duration": avd,
+        # Retention proxy: recent watch time per view relative to the window average.
+        "retention_trend": _ratio(avd_7, avd) - 1,
+        "watch_seconds_per_view": _ratio(w.data["estimated_minutes_watched"].sum(axis=1) * 60, total_views),
+    }
+
+
+def channel_rolling(w: StatsWindow, window: int) -> np.ndarray:
+    """Channel-wide trailing `window`-day view totals, one value per day of the window."""
+    return rolling_sum(w.data["views"].sum(axis=0, keepdims=True), window)[0]
+
+
+def distribution(values: np.ndarray, points=(50, 75, 90, 99)) -> dict:
+    if len(values) == 0:
+        return {f"p{p}": 0.0 for p in points}
+    return {f"p{p}": float(v) for p, v in zip(points, np.percentile(values, points))}
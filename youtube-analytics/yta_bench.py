@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from itertools import islice
+
+from db import (
+    CONNECTION_PROFILES,
+    DEFAULT_CHUNK_SIZE,
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    connect,
+    day_number,
+    init_db,
+    refresh_rollups,
+    upsert_daily_stat,
+    upsert_daily_stats_bulk,
+    upsert_video,
+    upsert_videos_bulk,
+)
+
+
+def synthetic_videos(n_videos: int):
+    for i in range(n_videos):
+        yield {
+            "video_id": f"vid{i:08d}",
+            "title": f"Synthetic video {i}",
+            "published_at": "2020-01-01T00:00:00Z",
+            "channel_id": "UCbench",
+        }
+
+
+def _synthetic_row(rnd: random.Random, video_id: str, stat_date: str) -> dict:
+    views = int(rnd.paretovariate(1.2) * 10)
+    return {
+        "video_id": video_id,
+        "stat_date": stat_date,
+        "views": views,
+        "likes": views // 20,
+        "comments": views // 100,
+        "estimated_minutes_watched": views * 2,
+        "average_view_duration": 95.5,
+        "subscribers_gained": views // 200,
+        "subscribers_lost": 0,
+    }
+
+
+def synthetic_daily_rows(n_rows: int, n_days: int, seed: int = 1, start: dt.date = dt.date(2020, 1, 1)):
+    """Yield n_rows stat rows: n_rows // n_days videos x n_days consecutive days from start."""
+    rnd = random.Random(seed)
+    dates = [(start + dt.timedelta(days=d)).isoformat() for d in range(n_days)]
+    emitted = 0
+    vid = 0
+    while emitted < n_rows:
+        video_id = f"vid{vid:08d}"
+        for stat_date in dates:
+            if emitted >= n_rows:
+                return
+            yield _synthetic_row(rnd, video_id, stat_date)
+            emitted += 1
+        vid += 1
+
+
+def synthetic_rows_by_day(n_videos: int, n_days: int, seed: int = 1, start: dt.date = dt.date(2020, 1, 1)):
+    """The same kind of rows day by day, every video per day, the order the collector writes them in."""
+    rnd = random.Random(seed)
+    for d in range(n_days):
+        stat_date = (start + dt.timedelta(days=d)).isoformat()
+        for vid in range(n_videos):
+            yield _synthetic_row(rnd, f"vid{vid:08d}", stat_date)
+
+
+def _fresh_db(tmpdir: str, name: str, profile=None):
+    conn = connect(os.path.join(tmpdir, name), profile=profile)
+    init_db(conn)
+    return conn
+
+
+def bench_upsert(args) -> dict:
+    n_videos = -(-args.rows // args.days)
+    results = {
+        "rows": args.rows,
+        "days": args.days,
+        "videos": n_videos,
+        "chunk_size": args.chunk_size,
+        "profile": args.profile,
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = _fresh_db(tmpdir, "per_row.db", args.profile)
+        t0 = time.perf_counter()
+        for v in synthetic_videos(n_videos):
+            upsert_video(conn, v)
+        for row in synthetic_daily_rows(args.rows, args.days):
+            upsert_daily_stat(conn, row)
+        conn.commit()
+        elapsed = time.perf_counter() - t0
+        results["per_row"] = {"seconds": round(elapsed, 3), "rows_per_sec": round(args.rows / elapsed)}
+        conn.close()
+
+        conn = _fresh_db(tmpdir, "bulk.db", args.profile)
+        t0 = time.perf_counter()
+        upsert_videos_bulk(conn, synthetic_videos(n_videos), args.chunk_size)
+        changed = upsert_daily_stats_bulk(conn, synthetic_daily_rows(args.rows, args.days), args.chunk_size)
+        elapsed = time.perf_counter() - t0
+        results["bulk_insert"] = {
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(args.rows / elapsed),
+            "rows_changed": changed,
+        }
+
+        # Same rows again: every row is unchanged and should be skipped.
+        t0 = time.perf_counter()
+        changed = upsert_daily_stats_bulk(conn, synthetic_daily_rows(args.rows, args.days), args.chunk_size)
+        elapsed = time.perf_counter() - t0
+        results["bulk_unchanged"] = {
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(args.rows / elapsed),
+            "rows_changed": changed,
+        }
+        conn.close()
+
+    results["speedup"] = round(results["bulk_insert"]["rows_per_sec"] / results["per_row"]["rows_per_sec"], 2)
+    return results
+
+
+ANALYTICS_SQL = """
+WITH per AS (
+    SELECT vid,
+           SUM(views) AS views,
+           SUM(CASE WHEN day > :d7 THEN views ELSE 0 END) AS rolling_7,
+           SUM(CASE WHEN day > :d28 THEN views ELSE 0 END) AS rolling_28,
+           SUM(CASE WHEN day > :d14 AND day <= :d7 THEN views ELSE 0 END) AS prev_7,
+           SUM(CASE WHEN day > :d56 AND day <= :d28 THEN views ELSE 0 END) AS prev_28,
+           (SUM(likes) + SUM(comments)) * 100.0 / NULLIF(SUM(views), 0) AS engagement_rate_pct,
+           SUM(average_view_duration * views) / NULLIF(SUM(views), 0) AS avg_view_duration,
+           SUM(CASE WHEN day > :d7 THEN average_view_duration * views ELSE 0 END)
+               / NULLIF(SUM(CASE WHEN day > :d7 THEN views ELSE 0 END), 0) AS avd_7,
+           SUM(estimated_minutes_watched) * 60.0 / NULLIF(SUM(views), 0) AS watch_seconds_per_view
+    FROM daily_stats
+    WHERE day BETWEEN :start AND :end
+    GROUP BY vid
+)
+SELECT *,
+       (rolling_7 - prev_7) * 1.0 / NULLIF(prev_7, 0) AS growth_7,
+       (rolling_28 - prev_28) * 1.0 / NULLIF(prev_28, 0) AS growth_28,
+       avd_7 / NULLIF(avg_view_duration, 0) - 1 AS retention_trend,
+       CUME_DIST() OVER (ORDER BY views) * 100 AS views_percentile
+FROM per
+"""
+
+CHANNEL_ROLLING_SQL = """
+SELECT day,
+       SUM(SUM(views)) OVER (ORDER BY day ROWS 6 PRECEDING) AS rolling_7,
+       SUM(SUM(views)) OVER (ORDER BY day ROWS 27 PRECEDING) AS rolling_28
+FROM daily_stats
+WHERE day BETWEEN :start AND :end
+GROUP BY day
+"""
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_analytics(args) -> dict:
+    import yta_analytics as ya
+
+    end = dt.date.today()
+    start = end - dt.timedelta(days=args.days - 1)
+    params = {"start": day_number(start.isoformat()), "end": day_number(end.isoformat())}
+    for n in (7, 14, 28, 56):
+        params[f"d{n}"] = params["end"] - n
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = _fresh_db(tmpdir, "analytics.db", "collector")
+        upsert_videos_bulk(conn, synthetic_videos(args.videos))
+        upsert_daily_stats_bulk(conn, synthetic_daily_rows(args.videos * args.days, args.days, start=start))
+        conn.execute("ANALYZE")
+        conn.close()
+        conn = connect(os.path.join(tmpdir, "analytics.db"), profile="reader")
+
+        sql_s = _best_of(
+            lambda: (
+                conn.execute(ANALYTICS_SQL, params).fetchall(),
+                conn.execute(CHANNEL_ROLLING_SQL, params).fetchall(),
+            ),
+            args.repeat,
+        )
+        window = [None]
+
+        def load():
+            window[0] = ya.load_window(conn, start.isoformat(), end.isoformat())
+
+        load_s = _best_of(load, args.repeat)
+        compute_s = _best_of(
+            lambda: (ya.video_metrics(window[0]), ya.channel_rolling(window[0], 7), ya.channel_rolling(window[0], 28)),
+            args.repeat,
+        )
+        conn.close()
+
+    return {
+        "videos": args.videos,
+        "days": args.days,
+        "rows": args.videos * args.days,
+        "sql_seconds": round(sql_s, 4),
+        "numpy_load_seconds": round(load_s, 4),
+        "numpy_compute_seconds": round(compute_s, 4),
+        "numpy_total_seconds": round(load_s + compute_s, 4),
+        "compute_speedup_vs_sql": round(sql_s / compute_s, 1) if compute_s else None,
+    }
+
+
+LEGACY_INSERT_SQL = """
+INSERT INTO daily_video_stats (
+    video_id, stat_date, views, likes, comments, estimated_minutes_watched,
+    average_view_duration, subscribers_gained, subscribers_lost
+)
+VALUES (:video_id, :stat_date, :views, :likes, :comments, :estimated_minutes_watched,
+        :average_view_duration, :subscribers_gained, :subscribers_lost)
+"""
+
+# (window sums, one video's history) for each layout.
+SCHEMA_QUERIES = {
+    "legacy": (
+        """
+        SELECT video_id, SUM(views), SUM(likes), SUM(comments)
+        FROM daily_video_stats WHERE stat_date BETWEEN ? AND ? GROUP BY video_id
+        """,
+        """
+        SELECT stat_date, views, likes, comments, estimated_minutes_watched, average_view_duration,
+               subscribers_gained, subscribers_lost
+        FROM daily_video_stats WHERE video_id = ? AND stat_date BETWEEN ? AND ?
+        """,
+    ),
+    "compact": (
+        """
+        SELECT k.video_id, SUM(s.views), SUM(s.likes), SUM(s.comments)
+        FROM daily_stats s JOIN video_keys k ON k.vid = s.vid
+        WHERE s.day BETWEEN ? AND ? GROUP BY s.vid
+        """,
+        """
+        SELECT day, views, likes, comments, estimated_minutes_watched, average_view_duration,
+               subscribers_gained, subscribers_lost
+        FROM daily_stats WHERE vid = (SELECT vid FROM video_keys WHERE video_id = ?) AND day BETWEEN ? AND ?
+        """,
+    ),
+}
+
+
+def _layout_stats(conn, path: str, tables: tuple, queries: tuple, window: tuple, history: tuple, sample: list, repeat: int) -> dict:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    sizes = dict(
+        conn.execute(
+            "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name IN (%s)) "
+            "GROUP BY name" % ", ".join("?" * len(tables)),
+            tables,
+        ).fetchall()
+    )
+    window_sql, history_sql = queries
+    window_s = _best_of(lambda: conn.execute(window_sql, window).fetchall(), repeat)
+    history_s = _best_of(lambda: [conn.execute(history_sql, (v, *history)).fetchall() for v in sample], repeat)
+    return {
+        "bytes": sum(sizes.values()),
+        "file_bytes": os.path.getsize(path),
+        "by_btree": sizes,
+        "window_30d_seconds": round(window_s, 4),
+        "history_seconds": round(history_s, 4),
+    }
+
+
+def bench_schema(args) -> dict:
+    """Text-keyed daily_video_stats (schema v8) vs integer-keyed daily_stats (v9) on the same rows."""
+    n_videos = -(-args.rows // args.days)
+    start = dt.date(2020, 1, 1)
+    end = start + dt.timedelta(days=args.days - 1)
+    window_start = end - dt.timedelta(days=29)
+    sample = [f"vid{i:08d}" for i in random.Random(2).sample(range(n_videos), min(args.sample, n_videos))]
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        path = os.path.join(tmpdir, "schema.db")
+        conn = connect(path, profile="collector")
+        for version, migrate in MIGRATIONS:
+            if version < SCHEMA_VERSION:
+                migrate(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+        conn.commit()
+        upsert_videos_bulk(conn, synthetic_videos(n_videos))
+        rows = synthetic_rows_by_day(n_videos, args.days, start=start)
+        while True:
+            chunk = list(islice(rows, DEFAULT_CHUNK_SIZE))
+            if not chunk:
+                break
+            conn.executemany(LEGACY_INSERT_SQL, chunk)
+            conn.commit()
+        conn.execute("ANALYZE")
+
+        legacy = _layout_stats(
+            conn,
+            path,
+            ("daily_video_stats",),
+            SCHEMA_QUERIES["legacy"],
+            (window_start.isoformat(), end.isoformat()),
+            (start.isoformat(), end.isoformat()),
+            sample,
+            args.repeat,
+        )
+
+        t0 = time.perf_counter()
+        init_db(conn)
+        migration_s = time.perf_counter() - t0
+        conn.executescript("PRAGMA incremental_vacuum")
+        conn.execute("ANALYZE")
+        compact = _layout_stats(
+            conn,
+            path,
+            ("daily_stats", "video_keys"),
+            SCHEMA_QUERIES["compact"],
+            (day_number(window_start.isoformat()), day_number(end.isoformat())),
+            (day_number(start.isoformat()), day_number(end.isoformat())),
+            sample,
+            args.repeat,
+        )
+        conn.close()
+
+    return {
+        "rows": n_videos * args.days,
+        "videos": n_videos,
+        "days": args.days,
+        "history_sample": len(sample),
+        "legacy": legacy,
+        "compact": compact,
+        "migration_seconds": round(migration_s, 2),
+        "size_ratio": round(legacy["bytes"] / compact["bytes"], 2),
+        "window_speedup": round(legacy["window_30d_seconds"] / compact["window_30d_seconds"], 2),
+        "history_speedup": round(legacy["history_seconds"] / compact["history_seconds"], 2),
+    }
+
+
+SUITE_REPORT_ARGS = {"limit": 10, "days": 90, "min_views": 10, "start_date": None, "end_date": None, "group": "video"}
+
+
+def run_meta() -> dict:
+    """Commit and environment stamped on every suite result, for comparing runs across commits."""
+
+    def git(*cmd):
+        try:
+            out = subprocess.run(["git", *cmd], capture_output=True, text=True, timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return out.stdout.strip() if out.returncode == 0 else None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "created_at": dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "numpy": __import__("numpy").__version__,
+        "machine": platform.machine(),
+    }
+
+
+def _suite_ingest(model, n_rows: int, tmpdir: str) -> dict:
+    """Per-row upsert_daily_stat (what a naive collector would do) vs upsert_daily_stats_bulk on the same rows."""
+    rows = []
+    for v in model.videos.values():
+        rows.extend(model.daily_rows(v))
+        if len(rows) >= n_rows:
+            break
+    rows = rows[:n_rows]
+    videos = [v.as_video_row() for v in model.videos.values()]
+
+    conn = _fresh_db(tmpdir, "ingest_per_row.db", "collector")
+    upsert_videos_bulk(conn, videos)
+    t0 = time.perf_counter()
+    for row in rows:
+        upsert_daily_stat(conn, row)
+    conn.commit()
+    per_row_s = time.perf_counter() - t0
+    conn.close()
+
+    conn = _fresh_db(tmpdir, "ingest_bulk.db", "collector")
+    upsert_videos_bulk(conn, videos)
+    t0 = time.perf_counter()
+    upsert_daily_stats_bulk(conn, rows)
+    bulk_s = time.perf_counter() - t0
+    conn.close()
+    return {
+        "rows": len(rows),
+        "per_row": {"seconds": round(per_row_s, 3), "rows_per_sec": round(len(rows) / per_row_s)},
+        "bulk": {"seconds": round(bulk_s, 3), "rows_per_sec": round(len(rows) / bulk_s)},
+    }
+
+
+def _suite_reports(fixture: str, channel_id: str, repeat: int) -> dict:
+    from yta_query import REPORT_QUERIES, run_report
+
+    conn = connect(fixture, profile="reader")
+    out = {}
+    for query in REPORT_QUERIES:
+        timings = {}
+        for scope, channels in (("all", []), ("channel", [channel_id])):
+            args = argparse.Namespace(**SUITE_REPORT_ARGS, channels=channels)
+            timings[f"{scope}_ms"] = round(_best_of(lambda: run_report(conn, query, args), repeat) * 1000, 3)
+        out[query] = timings
+    conn.close()
+    return out
+
+
+def _suite_collect(model, db_path: str, days: int) -> dict:
+    """Run yta_collect.collect_channel for every channel against FakeServices: a cold run, then an unchanged rerun."""
+    import yta_collect
+    from ratelimit import RateLimiter
+    from yta_fixtures import FakeServices
+
+    fake = FakeServices(model)
+    end = model.end.isoformat()
+    start = (model.end - dt.timedelta(days=days - 1)).isoformat()
+    window = {
+        "start_date": start,
+        "end_date": end,
+        "final_date": (model.end - dt.timedelta(days=yta_collect.DEFAULT_RESTATEMENT_DAYS)).isoformat(),
+    }
+    args = argparse.Namespace(
+        full_catalog=False,
+        incremental=False,
+        collect_mode="batch",
+        batch_size=yta_collect.BATCH_VIDEO_LIMIT,
+        workers=1,
+        lifetime=True,
+        lifetime_max_age_days=yta_collect.DEFAULT_LIFETIME_MAX_AGE_DAYS,
+    )
+    conn = connect(db_path, profile="collector")
+    init_db(conn)
+    conn.close()
+
+    runs = {}
+    # collect_channel builds its clients through the module-level build_service.
+    real_build_service = yta_collect.build_service
+    yta_collect.build_service = fake.build_service
+    try:
+        for run in ("cold", "warm"):
+            fake.calls.clear()
+            t0 = time.perf_counter()
+            summaries, touched = [], []
+            for channel_id in model.channel_ids:
+                spec = {"name": channel_id, "channel_id": channel_id, "creds": None}
+                summary, channel_touched = yta_collect.collect_channel(
+                    spec, args, window, RateLimiter(), db_path, None, yta_collect.StartupProfile(module_import=False)
+                )
+                summaries.append(summary)
+                touched.extend(channel_touched)
+            conn = connect(db_path, profile="collector")
+            if touched:
+                refresh_rollups(conn, min(touched), max(touched))
+            conn.close()
+            runs[run] = {
+                "seconds": round(time.perf_counter() - t0, 3),
+                "stat_rows_upserted": sum(s["stat_rows_upserted"] for s in summaries),
+                "stat_rows_changed": sum(s["stat_rows_changed"] for s in summaries),
+                "new_videos": sum(s["catalog"]["new_videos"] for s in summaries),
+                "api_calls": dict(sorted(fake.calls.items())),
+            }
+    finally:
+        yta_collect.build_service = real_build_service
+    return {"days": days, **runs}
+
+
+def bench_suite(args) -> dict:
+    """Fixture build, ingestion, every yta_query report and collection against fake APIs, on one synthetic model."""
+    from yta_fixtures import FIXTURE_PARAMS, SyntheticChannels, build_fixture, fixture_params, read_fixture_params
+
+    model = SyntheticChannels(args.channels, args.videos, args.days, args.seed)
+    result = {
+        "meta": run_meta(),
+        "params": {"channels": args.channels, "videos": args.videos, "days": args.days, "seed": args.seed, "repeat": args.repeat},
+    }
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        fixture = args.fixture or os.path.join(tmpdir, "fixture.db")
+        rebuild = None
+        if args.fixture and os.path.exists(args.fixture) and not args.rebuild:
+            stored = read_fixture_params(args.fixture)
+            wanted = fixture_params(model)
+            if stored and all(stored[k] == wanted[k] for k in FIXTURE_PARAMS):
+                # The stored params (including the day it was built) describe what is actually benchmarked.
+                result["fixture"] = {"path": fixture, "reused": True, "params": stored}
+            else:
+                rebuild = "no recorded parameters" if not stored else f"built with {stored}"
+        if "fixture" not in result:
+            result["fixture"] = build_fixture(fixture, model)
+            result["fixture"]["params"] = fixture_params(model)
+            if rebuild:
+                result["fixture"]["rebuilt"] = rebuild
+        if "ingest" not in args.skip:
+            result["ingest"] = _suite_ingest(model, args.ingest_rows, tmpdir)
+        if "reports" not in args.skip:
+            result["reports"] = _suite_reports(fixture, model.channel_ids[0], args.repeat)
+        if "collect" not in args.skip:
+            result["collect"] = _suite_collect(model, os.path.join(tmpdir, "collect.db"), args.collect_days)
+
+    if args.results:
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"bench": "suite", **result}, ensure_ascii=False) + "\n")
+    return result
+
+
+def main():
+    p = argparse.ArgumentParser(description="YouTube Analytics store benchmarks")
+    sub = p.add_subparsers(dest="bench", required=True)
+
+    up = sub.add_parser("upsert", help="per-row upsert_daily_stat vs upsert_daily_stats_bulk")
+    up.add_argument("--rows", type=int, default=1_000_000)
+    up.add_argument("--days", type=int, default=365)
+    up.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    up.add_argument("--profile", choices=list(CONNECTION_PROFILES), default=None, help="db.connect profile (default: plain)")
+    up.set_defaults(func=bench_upsert)
+
+    an = sub.add_parser("analytics", help="yta_analytics (NumPy) vs equivalent SQL for the per-video metrics")
+    an.add_argument("--videos", type=int, default=2000)
+    an.add_argument("--days", type=int, default=730)
+    an.add_argument("--repeat", type=int, default=3)
+    an.set_defaults(func=bench_analytics)
+
+    sc = sub.add_parser("schema", help="text-keyed daily_video_stats (v8) vs integer-keyed daily_stats (v9): size, range scans, migration")
+    sc.add_argument("--rows", type=int, default=5_000_000)
+    sc.add_argument("--days", type=int, default=365)
+    sc.add_argument("--sample", type=int, default=200, help="Videos whose full history is read per repeat")
+    sc.add_argument("--repeat", type=int, default=3)
+    sc.add_argument("--dir", default=None, help="Directory for the temporary DB (default: system temp)")
+    sc.set_defaults(func=bench_schema)
+
+    su = sub.add_parser("suite", help="fixture build, ingestion, every report and collection against fake APIs on synthetic channels")
+    su.add_argument("--channels", type=int, default=2)
+    su.add_argument("--videos", type=int, default=1000, help="Videos per channel")
+    su.add_argument("--days", type=int, default=365, help="Days of daily stats in the fixture, ending today")
+    su.add_argument("--seed", type=int, default=1)
+    su.add_argument("--repeat", type=int, default=3)
+    su.add_argument(
+        "--fixture",
+        default=None,
+        help="Keep the fixture DB here and reuse it on later runs with the same --channels/--videos/--days/--seed; "
+        "rebuilt when they differ (default: temporary)",
+    )
+    su.add_argument("--rebuild", action="store_true", help="Rebuild --fixture even if it exists")
+    su.add_argument("--ingest-rows", type=int, default=100_000, help="Rows written per-row and in bulk by the ingest phase")
+    su.add_argument("--collect-days", type=int, default=30, help="Window collected from the fake Analytics API")
+    su.add_argument("--skip", action="append", choices=["ingest", "reports", "collect"], default=[])
+    su.add_argument("--results", default=None, help="Also append the result as one JSON line to this file")
+    su.add_argument("--dir", default=None, help="Directory for temporary DBs (default: system temp)")
+    su.set_defaults(func=bench_suite)
+
+    args = p.parse_args()
+    print(json.dumps({"bench": args.bench, **args.func(args)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
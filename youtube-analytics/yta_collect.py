@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
+import time
+
+_MODULE_T0 = time.perf_counter()
+
 import argparse
 import datetime as dt
 import json
 import os
+import queue
+import sys
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from pathlib import Path
 
-from dateutil.relativedelta import relativedelta
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-
-from db import connect, init_db, upsert_video, upsert_daily_stat
+from dateranges import LIFETIME_START, compute_date_range
+from db import (
+    advance_collection_state,
+    archived_before,
+    connect,
+    get_channel_catalog,
+    get_collection_state,
+    init_db,
+    list_channel_videos,
+    refresh_channel_lifetime_totals,
+    refresh_rollups,
+    save_channel_catalog,
+    save_lifetime_stats,
+    upsert_daily_stats_bulk,
+    upsert_videos_bulk,
+    videos_needing_lifetime_refresh,
+)
+from ratelimit import AdaptiveConcurrency, CountingLimiter, QuotaExhausted, QuotaMeter, RateLimiter, call_with_backoff
 
 SCOPES = [
     "https://www.googleapis.com/auth/yt-analytics.readonly",
@@ -19,7 +40,36 @@ SCOPES = [
 ]
 
 
-RANGE_CHOICES = {"last7", "last30", "last90", "last365", "mtd", "ytd"}
+COLLECT_MODES = ("batch", "per-video")
+DEFAULT_QPS = 5.0
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# YouTube keeps revising the most recent days; they are re-fetched until older than this.
+DEFAULT_RESTATEMENT_DAYS = 3
+
+ANALYTICS_METRICS = "views,likes,comments,estimatedMinutesWatched,averageViewDuration,subscribersGained,subscribersLost"
+METRIC_FIELDS = [
+    "views",
+    "likes",
+    "comments",
+    "estimated_minutes_watched",
+    "average_view_duration",
+    "subscribers_gained",
+    "subscribers_lost",
+]
+
+# --lifetime re-fetches a video's stored counters when it is this recent, or when
+# daily views since the fetch exceed max(LIFETIME_DRIFT * lifetime views, LIFETIME_DRIFT_MIN_VIEWS).
+DEFAULT_LIFETIME_MAX_AGE_DAYS = 7
+LIFETIME_RECENT_DAYS = 14
+LIFETIME_DRIFT = 0.01
+LIFETIME_DRIFT_MIN_VIEWS = 100
+
+DISCOVERY_URL = "https://{api}.googleapis.com/$discovery/rest?version={version}"
+DEFAULT_DISCOVERY_CACHE_DIR = ".discovery_cache"
+
+# Upper bound on IDs in a single `video==a,b,c` filter, and rows per report page.
+BATCH_VIDEO_LIMIT = 200
+ANALYTICS_PAGE_SIZE = 10000
 
 
 def load_env(path: str = ".env"):
@@ -33,7 +83,79 @@ def load_env(path: str = ".env"):
         os.environ.setdefault(k.strip(), v.strip())
 
 
-def get_creds(client_secret_file: str, token_file: str) -> Credentials:
+class StartupProfile:
+    """Wall-clock breakdown of the phases before collection starts (--profile-startup)."""
+
+    def __init__(self, module_import: bool = True):
+        # Per-channel profiles (multi-channel runs) only time their own phases.
+        self.phases = {"module_import": time.perf_counter() - _MODULE_T0} if module_import else {}
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def as_ms(self) -> dict:
+        ms = {k: round(v * 1000, 1) for k, v in self.phases.items()}
+        ms["total"] = round(sum(self.phases.values()) * 1000, 1)
+        return ms
+
+
+def import_google_clients() -> None:
+    # The Google client stack dominates cold start, so it is only imported once
+    # a run actually needs it; later local imports are cache hits.
+    import google.auth.transport.requests  # noqa: F401
+    import google.oauth2.credentials  # noqa: F401
+    import google_auth_oauthlib.flow  # noqa: F401
+    import googleapiclient.discovery  # noqa: F401
+    import googleapiclient.errors  # noqa: F401
+
+
+_DISCOVERY_DOCS = {}
+_DISCOVERY_LOCK = threading.Lock()
+
+
+def discovery_doc(api: str, version: str, cache_dir: str) -> str:
+    """Discovery document for api/version without a network round trip when possible.
+
+    Looks in memory, then the on-disk cache (<cache_dir>/<api>.<version>.json),
+    then the copy bundled with google-api-python-client; only if none exist is
+    it downloaded, and then it is written to the disk cache for next time.
+    """
+    key = (api, version)
+    with _DISCOVERY_LOCK:
+        if key in _DISCOVERY_DOCS:
+            return _DISCOVERY_DOCS[key]
+        path = Path(cache_dir) / f"{api}.{version}.json"
+        if path.exists():
+            doc = path.read_text()
+        else:
+            from googleapiclient.discovery_cache import get_static_doc
+
+            doc = get_static_doc(api, version)
+            if doc is None:
+                with urllib.request.urlopen(DISCOVERY_URL.format(api=api, version=version), timeout=30) as resp:
+                    doc = resp.read().decode("utf-8")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(doc)
+        _DISCOVERY_DOCS[key] = doc
+        return doc
+
+
+def build_service(api: str, version: str, creds, cache_dir: str = DEFAULT_DISCOVERY_CACHE_DIR):
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(discovery_doc(api, version, cache_dir), credentials=creds)
+
+
+def get_creds(client_secret_file: str, token_file: str):
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     if Path(token_file).exists():
         creds = Credentials.from_authorized_user_file(token_file, SCOPES)
@@ -47,36 +169,99 @@ def get_creds(client_secret_file: str, token_file: str) -> Credentials:
     return creds
 
 
-def list_all_videos(youtube, channel_id: str):
-    videos = []
-    req = youtube.search().list(
-        part="id,snippet",
-        channelId=channel_id,
-        type="video",
-        maxResults=50,
-        order="date",
-    )
-    while req is not None:
-        resp = req.execute()
+def uploads_playlist_id(youtube, channel_id: str, meter: QuotaMeter) -> str:
+    resp = youtube.channels().list(part="contentDetails", id=channel_id).execute()
+    meter.charge("channels.list")
+    items = resp.get("items", [])
+    if not items:
+        raise RuntimeError(f"Channel not found: {channel_id}")
+    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def list_all_videos(youtube, conn, channel_id: str, meter: QuotaMeter, full: bool = False):
+    """Sync the channel's uploads into the local `videos` catalog and return it.
+
+    Walks the uploads playlist (playlistItems.list, 1 unit/page, newest first)
+    instead of search.list (100 units/page). The first page is requested with
+    If-None-Match on its stored ETag; a 304 means no new uploads, so the walk
+    stops there. Otherwise it stops at the first page containing a video the
+    catalog already knows, unless full=True (which also refreshes titles).
+
+    Returns (videos, catalog) where catalog describes what the sync did.
+    """
+    from googleapiclient.errors import HttpError
+
+    cached = get_channel_catalog(conn, channel_id)
+    if cached:
+        playlist_id, etag = cached["uploads_playlist_id"], cached["first_page_etag"]
+    else:
+        playlist_id, etag = uploads_playlist_id(youtube, channel_id, meter), None
+    known = {v["video_id"] for v in list_channel_videos(conn, channel_id)}
+
+    found = []
+    pages = 0
+    unchanged = False
+    first_page_etag = etag
+    page_token = None
+    while True:
+        req = youtube.playlistItems().list(
+            part="snippet,contentDetails",
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token,
+        )
+        if page_token is None and etag and known and not full:
+            req.headers["If-None-Match"] = etag
+        try:
+            resp = req.execute()
+        except HttpError as e:
+            if getattr(e.resp, "status", None) != 304:
+                raise
+            meter.charge("playlistItems.list")
+            unchanged = True
+            break
+        meter.charge("playlistItems.list")
+        pages += 1
+        if page_token is None:
+            first_page_etag = resp.get("etag")
+
+        page = []
         for item in resp.get("items", []):
-            vid = item["id"].get("videoId")
-            if not vid:
-                continue
+            cd = item.get("contentDetails", {})
             sn = item.get("snippet", {})
-            videos.append(
+            # Private and deleted uploads have no videoPublishedAt; search.list never returned them either.
+            if not cd.get("videoId") or not cd.get("videoPublishedAt"):
+                continue
+            page.append(
                 {
-                    "video_id": vid,
+                    "video_id": cd["videoId"],
                     "title": sn.get("title", ""),
-                    "published_at": sn.get("publishedAt"),
+                    "published_at": cd["videoPublishedAt"],
                     "channel_id": sn.get("channelId", channel_id),
                 }
             )
-        req = youtube.search().list_next(req, resp)
-    return videos
+        new = [v for v in page if v["video_id"] not in known]
+        found.extend(page if full else new)
+        if not full and len(new) < len(page):
+            break
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+
+    upsert_videos_bulk(conn, found)
+    save_channel_catalog(conn, channel_id, playlist_id, first_page_etag)
+    catalog = {
+        "pages": pages,
+        "new_videos": sum(1 for v in found if v["video_id"] not in known),
+        "unchanged": unchanged,
+        "full": full,
+    }
+    return list_channel_videos(conn, channel_id), catalog
 
 
-def discover_channel_id(youtube):
+def discover_channel_id(youtube, meter: QuotaMeter):
     resp = youtube.channels().list(part="id", mine=True).execute()
+    meter.charge("channels.list")
     items = resp.get("items", [])
     if not items:
         raise RuntimeError("No channel found for authenticated account")
@@ -88,7 +273,7 @@ def query_video_daily(yt_analytics, video_id: str, start_date: str, end_date: st
         ids="channel==MINE",
         startDate=start_date,
         endDate=end_date,
-        metrics="views,likes,comments,estimatedMinutesWatched,averageViewDuration,subscribersGained,subscribersLost",
+        metrics=ANALYTICS_METRICS,
         dimensions="day",
         filters=f"video=={video_id}",
         sort="day",
@@ -96,79 +281,201 @@ def query_video_daily(yt_analytics, video_id: str, start_date: str, end_date: st
 
     rows = []
     for r in resp.get("rows", []) or []:
-        rows.append(
-            {
-                "stat_date": str(r[0]),
-                "views": r[1],
-                "likes": r[2],
-                "comments": r[3],
-                "estimated_minutes_watched": r[4],
-                "average_view_duration": r[5],
-                "subscribers_gained": r[6],
-                "subscribers_lost": r[7],
-            }
-        )
+        rows.append({"stat_date": str(r[0]), **dict(zip(METRIC_FIELDS, r[1:]))})
     return rows
 
 
-def compute_date_range(args) -> tuple[str, str, str]:
-    today = dt.date.today()
+def query_videos_daily(
+    yt_analytics,
+    video_ids: list[str],
+    start_date: str,
+    end_date: str,
+    page_size: int = ANALYTICS_PAGE_SIZE,
+    limiter=None,
+):
+    """Fetch day x video rows for several videos in one paginated report.
+
+    Returns (rows, queries) where each row carries its own video_id, ready for
+    upsert_daily_stats_bulk, and queries is the number of report pages requested.
+    Every page is a billed call: the caller (call_with_backoff) pays for the
+    first, and each further page is acquired from `limiter` here.
+    """
+    rows = []
+    queries = 0
+    start_index = 1
+    while True:
+        if queries and limiter is not None:
+            limiter.acquire()
+        resp = yt_analytics.reports().query(
+            ids="channel==MINE",
+            startDate=start_date,
+            endDate=end_date,
+            metrics=ANALYTICS_METRICS,
+            dimensions="day,video",
+            filters="video==" + ",".join(video_ids),
+            sort="day",
+            maxResults=page_size,
+            startIndex=start_index,
+        ).execute()
+        queries += 1
+
+        page = resp.get("rows", []) or []
+        for r in page:
+            rows.append({"video_id": str(r[1]), "stat_date": str(r[0]), **dict(zip(METRIC_FIELDS, r[2:]))})
+        if len(page) < page_size:
+            break
+        start_index += len(page)
+    return rows, queries
+
+
+def is_rejected_report(err) -> bool:
+    # 400 means the API does not accept this dimension/filter combination;
+    # anything else (quota, auth, 5xx) should surface as a real failure.
+    return getattr(err.resp, "status", None) == 400
+
+
+def is_retryable(err: Exception) -> bool:
+    from googleapiclient.errors import HttpError
+
+    if isinstance(err, HttpError):
+        status = getattr(err.resp, "status", None)
+        if status in RETRYABLE_STATUSES:
+            return True
+        # Per-user rate limits come back as 403 with a rateLimitExceeded reason.
+        return status == 403 and b"rateLimitExceeded" in (err.content or b"")
+    return isinstance(err, (TimeoutError, ConnectionError))
+
+
+def fetch_per_video(make_analytics, pending, end_date: str, workers: int, limiter: RateLimiter):
+    """Run query_video_daily for each (video_id, start) on a bounded thread pool.
+
+    Yields (video_id, rows, error) in completion order through a queue so the
+    caller can do every SQLite write on its own thread/connection. Each worker
+    thread builds its own API client because the underlying HTTP transport is
+    not thread-safe. Throttling (429/5xx) shrinks concurrency adaptively; a
+    video whose retries run out is reported with its error instead of
+    aborting the run. If the caller stops early (an exception, or closing the
+    generator), queued calls are cancelled rather than left to spend quota.
+    """
+    results = queue.Queue()
+    local = threading.local()
+    concurrency = AdaptiveConcurrency(workers)
+
+    def work(video_id: str, start: str) -> None:
+        try:
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = make_analytics()
+            rows = call_with_backoff(
+                lambda: query_video_daily(client, video_id, start, end_date),
+                limiter,
+                concurrency,
+                is_retryable,
+            )
+            results.put((video_id, rows, None))
+        except Exception as e:
+            results.put((video_id, None, e))
 
-    if args.lifetime:
-        return "2005-02-14", today.isoformat(), "lifetime"
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yta-fetch")
+    try:
+        for video_id, start in pending:
+            pool.submit(work, video_id, start)
+        for _ in range(len(pending)):
+            yield results.get()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def next_day(date_str: str) -> str:
+    return (dt.date.fromisoformat(date_str) + dt.timedelta(days=1)).isoformat()
+
+
+def published_date(video: dict):
+    published = video.get("published_at")
+    return published[:10] if published else None
+
+
+def coverage_start(video: dict, watermark) -> str:
+    """First date not yet finalized for a video: the day after its watermark, else its publish date."""
+    if watermark:
+        return next_day(watermark)
+    return published_date(video) or LIFETIME_START
 
-    if args.range:
-        if args.range not in RANGE_CHOICES:
-            raise SystemExit(
-                f"Invalid --range '{args.range}'. Use one of: {', '.join(sorted(RANGE_CHOICES))}"
-            )
-        if args.range == "last7":
-            start = today - relativedelta(days=7)
-            return start.isoformat(), today.isoformat(), "last7"
-        if args.range == "last30":
-            start = today - relativedelta(days=30)
-            return start.isoformat(), today.isoformat(), "last30"
-        if args.range == "last90":
-            start = today - relativedelta(days=90)
-            return start.isoformat(), today.isoformat(), "last90"
-        if args.range == "last365":
-            start = today - relativedelta(days=365)
-            return start.isoformat(), today.isoformat(), "last365"
-        if args.range == "mtd":
-            start = today.replace(day=1)
-            return start.isoformat(), today.isoformat(), "mtd"
-        if args.range == "ytd":
-            start = dt.date(today.year, 1, 1)
-            return start.isoformat(), today.isoformat(), "ytd"
-
-    end_date = args.end_date or today.isoformat()
-    start_date = args.start_date or (today - relativedelta(days=30)).isoformat()
-
-    # Validate format early.
-    dt.date.fromisoformat(start_date)
-    dt.date.fromisoformat(end_date)
-
-    return start_date, end_date, "custom"
-
-
-def fetch_lifetime_video_stats(youtube, video_ids: list[str]) -> dict:
-    totals = {"views": 0, "likes": 0, "comments": 0}
-    if not video_ids:
-        return totals
 
+def plan_video_windows(videos: list[dict], state: dict, start_date: str, end_date: str, incremental: bool, horizon=None):
+    """Return [(video_id, start, extends_watermark)] for the videos that need fetching.
+
+    In incremental mode each video starts at its own coverage_start (clamped to
+    start_date); otherwise every video uses start_date. extends_watermark tells
+    whether the fetched window is contiguous with what is already finalized,
+    i.e. whether a successful fetch may advance collection_state. Days before
+    `horizon` (db.archived_before) count as finalized and are never refetched.
+    """
+    if horizon:
+        start_date = max(start_date, horizon)
+    windows = []
+    for v in videos:
+        watermark = state.get(v["video_id"])
+        baseline = coverage_start(v, watermark)
+        if horizon:
+            baseline = max(baseline, horizon)
+        start = max(baseline, start_date) if incremental else start_date
+        if start > end_date:
+            continue
+        windows.append((v["video_id"], start, start <= baseline))
+    return windows
+
+
+def fetch_video_statistics(youtube, video_ids: list[str], meter: QuotaMeter) -> dict:
+    """Current public counters per video: {video_id: {"views", "likes", "comments"}}.
+
+    videos.list takes up to 50 IDs per call (1 quota unit). Videos that are
+    private or deleted are missing from the result.
+    """
+    stats = {}
     for i in range(0, len(video_ids), 50):
         chunk = video_ids[i : i + 50]
         resp = youtube.videos().list(part="statistics", id=",".join(chunk), maxResults=50).execute()
+        meter.charge("videos.list")
         for item in resp.get("items", []):
             s = item.get("statistics", {})
-            totals["views"] += int(s.get("viewCount", 0) or 0)
-            totals["likes"] += int(s.get("likeCount", 0) or 0)
-            totals["comments"] += int(s.get("commentCount", 0) or 0)
-
-    return totals
+            stats[item["id"]] = {
+                "views": int(s.get("viewCount", 0) or 0),
+                "likes": int(s.get("likeCount", 0) or 0),
+                "comments": int(s.get("commentCount", 0) or 0),
+            }
+    return stats
+
+
+def refresh_lifetime_totals(youtube, conn, channel_id: str, meter: QuotaMeter, max_age_days: int) -> dict:
+    """Channel lifetime totals from the stored per-video counters.
+
+    Only videos that are new, older than max_age_days since their last fetch,
+    recently published, or visibly active in daily_stats since then are
+    re-fetched (videos.list, 50 per call); the rest are served from the DB.
+    """
+    now = dt.datetime.now(dt.timezone.utc)
+    stale = videos_needing_lifetime_refresh(
+        conn,
+        channel_id,
+        stale_before=(now - dt.timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S"),
+        recent_since=(now - dt.timedelta(days=LIFETIME_RECENT_DAYS)).strftime("%Y-%m-%d"),
+        drift=LIFETIME_DRIFT,
+        drift_min_views=LIFETIME_DRIFT_MIN_VIEWS,
+    )
+    save_lifetime_stats(conn, stale, fetch_video_statistics(youtube, stale, meter))
+    totals = refresh_channel_lifetime_totals(conn, channel_id)
+    return {
+        "views": totals["views"],
+        "likes": totals["likes"],
+        "comments": totals["comments"],
+        "videos": totals["videos"],
+        "videos_refreshed": len(stale),
+        "api_calls": -(-len(stale) // 50),
+    }
 
 
-def query_period_totals(conn, start_date: str, end_date: str) -> dict:
+def query_period_totals(conn, start_date: str, end_date: str, channel_id: str = None) -> dict:
     row = conn.execute(
         """
         SELECT
@@ -177,10 +484,11 @@ def query_period_totals(conn, start_date: str, end_date: str) -> dict:
           COALESCE(SUM(comments), 0) AS comments,
           COALESCE(SUM(estimated_minutes_watched), 0) AS estimated_minutes_watched,
           COALESCE(SUM(subscribers_gained - subscribers_lost), 0) AS net_subscribers
-        FROM daily_video_stats
+        FROM channel_daily_totals
         WHERE stat_date BETWEEN ? AND ?
+          AND (? IS NULL OR channel_id = ?)
         """,
-        (start_date, end_date),
+        (start_date, end_date, channel_id, channel_id),
     ).fetchone()
 
     return {
@@ -192,6 +500,212 @@ def query_period_totals(conn, start_date: str, end_date: str) -> dict:
     }
 
 
+def load_channels_config(path: str) -> list:
+    """Read a channels config: a JSON list (or {"channels": [...]}) of
+    {"token_file", "channel_id"?, "name"?, "client_secret_file"?} entries.
+
+    Relative paths resolve against the config file's directory. A missing
+    channel_id is discovered from the token's account, like YTA_CHANNEL_ID.
+    """
+    config = Path(path)
+    if not config.exists():
+        raise SystemExit(f"Missing channels config: {path}")
+    data = json.loads(config.read_text())
+    entries = data.get("channels", []) if isinstance(data, dict) else data
+    if not entries:
+        raise SystemExit(f"No channels in {path}")
+
+    channels = []
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not entry.get("token_file"):
+            raise SystemExit(f"{path}: channel #{i} needs a token_file")
+        channel_id = (entry.get("channel_id") or "").strip()
+        secret = entry.get("client_secret_file")
+        channels.append(
+            {
+                "name": entry.get("name") or channel_id or Path(entry["token_file"]).stem,
+                "channel_id": channel_id,
+                "token_file": str(config.parent / entry["token_file"]),
+                "client_secret_file": str(config.parent / secret) if secret else None,
+            }
+        )
+    names = [c["name"] for c in channels]
+    if len(set(names)) != len(names):
+        raise SystemExit(f"{path}: channel names must be unique ({', '.join(names)})")
+    tokens = [c["token_file"] for c in channels]
+    if len(set(tokens)) != len(tokens):
+        raise SystemExit(f"{path}: each channel needs its own token_file")
+    return channels
+
+
+class ChannelCollectionError(RuntimeError):
+    """A channel's collection failed after it may already have committed rows.
+
+    touched carries the first/last stat_date of every report written so far,
+    so the caller can still refresh rollups for those days.
+    """
+
+    def __init__(self, message: str, touched: list):
+        super().__init__(message)
+        self.touched = touched
+
+
+def collect_channel(
+    spec: dict,
+    args,
+    window: dict,
+    limiter: RateLimiter,
+    db_path: str,
+    discovery_cache_dir: str,
+    profile: StartupProfile,
+    log: str = "",
+):
+    """Collect one channel into db_path on its own connection and API clients.
+
+    Returns (summary, touched) where touched lists the first/last stat_date of
+    every report written; rollups and period totals are left to the caller so
+    concurrent channels refresh them once. A failure once rows may have been
+    committed is raised as ChannelCollectionError carrying touched so far.
+    """
+    from googleapiclient.errors import HttpError
+
+    t0 = time.perf_counter()
+    creds = spec["creds"]
+    start_date, end_date, final_date = window["start_date"], window["end_date"], window["final_date"]
+    meter = QuotaMeter()
+    # Shares the process-wide qps/quota budget but counts this channel's units.
+    analytics_limiter = CountingLimiter(limiter)
+
+    with profile.phase("build"):
+        youtube = build_service("youtube", "v3", creds, discovery_cache_dir)
+        yt_analytics = build_service("youtubeAnalytics", "v2", creds, discovery_cache_dir)
+
+    channel_id = spec["channel_id"]
+    if not channel_id:
+        with profile.phase("discover_channel"):
+            channel_id = discover_channel_id(youtube, meter)
+
+    # Each channel writes through its own connection; the collector profile's
+    # busy_timeout queues writers behind each other's short chunk transactions.
+    conn = connect(db_path, profile="collector")
+    # First/last stat_date of each report (rows come back sorted by day).
+    touched = []
+    try:
+        videos, catalog = list_all_videos(youtube, conn, channel_id, meter, full=args.full_catalog)
+        print(f"[info] {log}found videos: {len(videos)} (new: {catalog['new_videos']}, catalog pages: {catalog['pages']})", file=sys.stderr)
+
+        state = get_collection_state(conn)
+        windows = plan_video_windows(videos, state, start_date, end_date, args.incremental, archived_before(conn))
+        extends = {video_id: ok for video_id, _, ok in windows}
+
+        def finish_video(video_id: str) -> None:
+            if extends[video_id]:
+                advance_collection_state(conn, video_id, final_date)
+
+        stat_rows = 0
+        stat_rows_changed = 0
+        analytics_queries = 0
+        collect_mode = args.collect_mode
+        pending = [(video_id, start) for video_id, start, _ in windows]
+
+        if collect_mode == "batch":
+            # Chunks of videos with neighbouring start dates share one report from
+            # the chunk's earliest start; rows before a video's own start are
+            # dropped, so no video is re-written before its window.
+            by_start = sorted(pending, key=lambda p: p[1])
+            done = set()
+            batch_concurrency = AdaptiveConcurrency(1)
+            try:
+                for i in range(0, len(by_start), args.batch_size):
+                    chunk_starts = dict(by_start[i : i + args.batch_size])
+                    chunk = list(chunk_starts)
+                    start = min(chunk_starts.values())
+                    rows, queries = call_with_backoff(
+                        lambda: query_videos_daily(yt_analytics, chunk, start, end_date, limiter=analytics_limiter),
+                        analytics_limiter,
+                        batch_concurrency,
+                        is_retryable,
+                    )
+                    analytics_queries += queries
+                    rows = [
+                        row for row in rows
+                        if row["video_id"] in chunk_starts and row["stat_date"] >= chunk_starts[row["video_id"]]
+                    ]
+                    stat_rows_changed += upsert_daily_stats_bulk(conn, rows)
+                    if rows:
+                        touched.extend((rows[0]["stat_date"], rows[-1]["stat_date"]))
+                    stat_rows += len(rows)
+                    for video_id in chunk:
+                        finish_video(video_id)
+                        done.add(video_id)
+                    # Release the write lock between chunks so other channels can write.
+                    conn.commit()
+            except HttpError as e:
+                if not is_rejected_report(e):
+                    raise
+                print(f"[warn] {log}batched report rejected, falling back to per-video queries: {e}", file=sys.stderr)
+                collect_mode = "per-video"
+                analytics_queries += 1
+            except QuotaExhausted as e:
+                print(f"[warn] {log}{e}", file=sys.stderr)
+            pending = [(video_id, start) for video_id, start in pending if video_id not in done]
+
+        failed = []
+
+        def make_analytics():
+            return build_service("youtubeAnalytics", "v2", creds, discovery_cache_dir)
+
+        # closing(): a DB error or Ctrl-C here cancels the fetches still queued.
+        with closing(fetch_per_video(make_analytics, pending, end_date, args.workers, analytics_limiter)) as fetched:
+            for video_id, daily, err in fetched:
+                if err is not None:
+                    failed.append({"video_id": video_id, "error": str(err)})
+                    if not isinstance(err, QuotaExhausted):
+                        analytics_queries += 1
+                        print(f"[warn] {log}{video_id}: {err}", file=sys.stderr)
+                    continue
+                analytics_queries += 1
+                stat_rows_changed += upsert_daily_stats_bulk(conn, ({"video_id": video_id, **row} for row in daily))
+                if daily:
+                    touched.extend((daily[0]["stat_date"], daily[-1]["stat_date"]))
+                stat_rows += len(daily)
+                finish_video(video_id)
+                conn.commit()
+
+        conn.commit()
+
+        lifetime_totals = None
+        if args.lifetime:
+            lifetime_totals = refresh_lifetime_totals(youtube, conn, channel_id, meter, args.lifetime_max_age_days)
+    except Exception as e:
+        if not touched:
+            raise
+        raise ChannelCollectionError(str(e), touched) from e
+    finally:
+        conn.close()
+
+    summary = {
+        "ok": not failed,
+        "name": spec["name"],
+        "channel_id": channel_id,
+        "videos": len(videos),
+        "catalog": catalog,
+        "videos_fetched": len(windows),
+        "stat_rows_upserted": stat_rows,
+        "stat_rows_changed": stat_rows_changed,
+        "collect_mode": collect_mode,
+        "analytics_queries": analytics_queries,
+        "quota_units_used": analytics_limiter.units_used,
+        "quota_units": {"data_api": meter.summary(), "analytics": analytics_limiter.units_used},
+        "failed_videos": failed,
+        "period_totals": None,
+        "lifetime_totals": lifetime_totals,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "startup_ms": profile.as_ms(),
+    }
+    return summary, touched if stat_rows_changed else []
+
+
 def main():
     parser = argparse.ArgumentParser(description="YouTube Analytics collector")
     parser.add_argument("--env-file", default=".env")
@@ -200,13 +714,84 @@ def main():
     parser.add_argument(
         "--range",
         default=None,
-        help="Preset range: last7|last30|last90|last365|mtd|ytd (overrides --start-date/--end-date)",
+        help="Preset range: last7|last30|last90|last365|mtd|qtd|ytd|lastmonth|lastquarter (overrides --start-date/--end-date)",
     )
     parser.add_argument(
         "--lifetime",
         action="store_true",
         help="Use lifetime collection range (2005-02-14 to today) and include lifetime totals from YouTube Data API",
     )
+    parser.add_argument(
+        "--lifetime-max-age-days",
+        type=int,
+        default=None,
+        help="With --lifetime, re-fetch stored per-video counters older than this "
+        f"(default: YTA_LIFETIME_MAX_AGE_DAYS or {DEFAULT_LIFETIME_MAX_AGE_DAYS}; 0 = re-fetch all)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch days after each video's finalized watermark (or from its publish date); "
+        "without --range/--start-date the floor is the lifetime start",
+    )
+    parser.add_argument(
+        "--restatement-days",
+        type=int,
+        default=None,
+        help=f"Trailing days treated as unsettled and re-fetched next run (default: YTA_RESTATEMENT_DAYS or {DEFAULT_RESTATEMENT_DAYS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent per-video report requests (used for --collect-mode per-video and batch fallback)",
+    )
+    parser.add_argument(
+        "--qps",
+        type=float,
+        default=None,
+        help=f"Max Analytics queries per second across workers (default: YTA_QPS or {DEFAULT_QPS}; 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--daily-quota",
+        type=int,
+        default=None,
+        help="Quota units this run may spend before stopping (default: YTA_DAILY_QUOTA or 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--full-catalog",
+        action="store_true",
+        help="Walk the whole uploads playlist (refreshing titles) instead of stopping at already-known videos",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print the import/auth/build timing breakdown (target: YTA_STARTUP_TARGET_MS)",
+    )
+    parser.add_argument(
+        "--collect-mode",
+        choices=COLLECT_MODES,
+        default="batch",
+        help="batch: one report per chunk of videos (falls back to per-video if rejected); per-video: one report per video",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_VIDEO_LIMIT,
+        help=f"Videos per batched report (max {BATCH_VIDEO_LIMIT})",
+    )
+    parser.add_argument(
+        "--channels-config",
+        default=None,
+        help="JSON list of channels (token_file, optional channel_id/name/client_secret_file) to collect "
+        "concurrently into one DB (default: YTA_CHANNELS_CONFIG; unset = the single channel from .env)",
+    )
+    parser.add_argument(
+        "--channel-workers",
+        type=int,
+        default=None,
+        help="Channels collected at the same time with --channels-config (default: all)",
+    )
     args = parser.parse_args()
 
     load_env(args.env_file)
@@ -214,60 +799,160 @@ def main():
     client_secret = os.getenv("YTA_CLIENT_SECRET_FILE", "client_secret.json")
     token_file = os.getenv("YTA_TOKEN_FILE", "token.json")
     db_path = os.getenv("YTA_DB_PATH", "youtube_analytics.db")
-    channel_id = os.getenv("YTA_CHANNEL_ID", "").strip()
-
-    if not Path(client_secret).exists():
-        raise SystemExit(f"Missing client secret file: {client_secret}")
-
-    start_date, end_date, range_mode = compute_date_range(args)
-
-    creds = get_creds(client_secret, token_file)
-    youtube = build("youtube", "v3", credentials=creds)
-    yt_analytics = build("youtubeAnalytics", "v2", credentials=creds)
+    channels_config = args.channels_config or os.getenv("YTA_CHANNELS_CONFIG", "").strip()
 
-    if not channel_id:
-        channel_id = discover_channel_id(youtube)
-
-    conn = connect(db_path)
+    if channels_config:
+        channels = load_channels_config(channels_config)
+    else:
+        channels = [
+            {
+                "name": os.getenv("YTA_CHANNEL_ID", "").strip() or "default",
+                "channel_id": os.getenv("YTA_CHANNEL_ID", "").strip(),
+                "token_file": token_file,
+                "client_secret_file": None,
+            }
+        ]
+    for spec in channels:
+        spec["client_secret_file"] = spec["client_secret_file"] or client_secret
+        if not Path(spec["client_secret_file"]).exists():
+            raise SystemExit(f"Missing client secret file: {spec['client_secret_file']}")
+
+    if not 1 <= args.batch_size <= BATCH_VIDEO_LIMIT:
+        raise SystemExit(f"--batch-size must be between 1 and {BATCH_VIDEO_LIMIT}")
+
+    if args.workers < 1:
+        raise SystemExit("--workers must be >= 1")
+    if args.channel_workers is not None and args.channel_workers < 1:
+        raise SystemExit("--channel-workers must be >= 1")
+    qps = args.qps if args.qps is not None else float(os.getenv("YTA_QPS", str(DEFAULT_QPS)))
+    daily_quota = args.daily_quota if args.daily_quota is not None else int(os.getenv("YTA_DAILY_QUOTA", "0"))
+    # One limiter for the whole process: every channel draws on the same qps and quota budget.
+    limiter = RateLimiter(qps=qps, daily_units=daily_quota)
+
+    restatement_days = args.restatement_days
+    if restatement_days is None:
+        restatement_days = int(os.getenv("YTA_RESTATEMENT_DAYS", str(DEFAULT_RESTATEMENT_DAYS)))
+    if restatement_days < 0:
+        raise SystemExit("--restatement-days must be >= 0")
+    if args.lifetime_max_age_days is None:
+        args.lifetime_max_age_days = int(os.getenv("YTA_LIFETIME_MAX_AGE_DAYS", str(DEFAULT_LIFETIME_MAX_AGE_DAYS)))
+    if args.lifetime_max_age_days < 0:
+        raise SystemExit("--lifetime-max-age-days must be >= 0")
+
+    if args.incremental and not (args.lifetime or args.range or args.start_date):
+        start_date = LIFETIME_START
+        end_date = args.end_date or dt.date.today().isoformat()
+        dt.date.fromisoformat(end_date)
+        range_mode = "incremental"
+    else:
+        start_date, end_date, range_mode = compute_date_range(args)
+    final_date = min(end_date, (dt.date.today() - dt.timedelta(days=restatement_days)).isoformat())
+    window = {"start_date": start_date, "end_date": end_date, "final_date": final_date}
+
+    multi = bool(channels_config)
+    profile = StartupProfile()
+    discovery_cache_dir = os.getenv("YTA_DISCOVERY_CACHE_DIR", DEFAULT_DISCOVERY_CACHE_DIR)
+    with profile.phase("google_import"):
+        import_google_clients()
+
+    # Auth runs one channel at a time: a missing token opens a browser consent flow.
+    channel_profiles = {}
+    for spec in channels:
+        channel_profile = StartupProfile(module_import=False) if multi else profile
+        with channel_profile.phase("auth"):
+            spec["creds"] = get_creds(spec["client_secret_file"], spec["token_file"])
+        channel_profiles[spec["name"]] = channel_profile
+
+    # Migrate once up front so channel threads never race on init_db.
+    conn = connect(db_path, profile="collector")
     init_db(conn)
+    # Archived months live on only in their rollups (see yta_maintain), which
+    # refresh_rollups no longer recomputes; daily rows written back would just regrow the DB.
+    horizon = archived_before(conn)
+    conn.close()
+    if horizon and start_date < horizon:
+        if end_date < horizon:
+            raise SystemExit(f"{start_date}..{end_date} is before {horizon}; those months are archived (see yta_maintain.py)")
+        print(f"[info] daily rows before {horizon} are archived; collecting from {horizon} instead of {start_date}", file=sys.stderr)
+        window["start_date"] = horizon
+
+    def run(spec):
+        return collect_channel(
+            spec,
+            args,
+            window,
+            limiter,
+            db_path,
+            discovery_cache_dir,
+            channel_profiles[spec["name"]],
+            f"[{spec['name']}] " if multi else "",
+        )
 
-    videos = list_all_videos(youtube, channel_id)
-    print(f"[info] found videos: {len(videos)}")
-
-    stat_rows = 0
-    for v in videos:
-        upsert_video(conn, v)
-        daily = query_video_daily(yt_analytics, v["video_id"], start_date, end_date)
-        for row in daily:
-            upsert_daily_stat(
-                conn,
-                {
-                    "video_id": v["video_id"],
-                    **row,
-                },
-            )
-            stat_rows += 1
-
-    conn.commit()
-
-    period_totals = query_period_totals(conn, start_date, end_date)
-    lifetime_totals = None
-    if args.lifetime:
-        lifetime_totals = fetch_lifetime_video_stats(youtube, [v["video_id"] for v in videos])
-
+    t0 = time.perf_counter()
+    if not multi:
+        results = [run(channels[0])]
+    else:
+        results = []
+        with ThreadPoolExecutor(max_workers=args.channel_workers or len(channels), thread_name_prefix="yta-channel") as pool:
+            futures = {pool.submit(run, spec): spec for spec in channels}
+            for future in futures:
+                spec = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"[warn] [{spec['name']}] collection failed: {e}", file=sys.stderr)
+                    # Days the channel committed before failing still need their rollups.
+                    touched = getattr(e, "touched", [])
+                    results.append(({"name": spec["name"], "channel_id": spec["channel_id"] or None, "ok": False, "error": str(e)}, touched))
+    elapsed = time.perf_counter() - t0
+
+    startup_ms = profile.as_ms()
+    if args.profile_startup:
+        print("[profile] " + " ".join(f"{k}={v}ms" for k, v in startup_ms.items()), file=sys.stderr)
+    target_ms = float(os.getenv("YTA_STARTUP_TARGET_MS", "0") or 0)
+    if target_ms and startup_ms["total"] > target_ms:
+        print(f"[warn] startup took {startup_ms['total']}ms (target {target_ms:.0f}ms)", file=sys.stderr)
+
+    # Rollups are refreshed once for every channel's touched dates, after all writers are done.
+    conn = connect(db_path, profile="collector")
+    touched = [d for _, channel_touched in results for d in channel_touched]
+    rollup_range = None
+    if touched:
+        rollup_range = {"start": min(touched), "end": max(touched)}
+        refresh_rollups(conn, rollup_range["start"], rollup_range["end"])
+    for summary, _ in results:
+        if summary.get("channel_id") and "error" not in summary:
+            summary["period_totals"] = query_period_totals(conn, start_date, end_date, summary["channel_id"])
     conn.close()
 
+    common = {
+        "rollups_refreshed": rollup_range,
+        "startup_ms": startup_ms if args.profile_startup else None,
+        "range": {"mode": range_mode, "start": start_date, "end": end_date},
+        "incremental": args.incremental,
+        "final_date": final_date,
+        "db_path": db_path,
+    }
+    if not multi:
+        summary = results[0][0]
+        summary.pop("name", None)
+        summary.pop("startup_ms", None)
+        print(json.dumps({**summary, **common}, ensure_ascii=False))
+        return
+
+    summaries = [summary for summary, _ in results]
+    data_api_units = sum(s.get("quota_units", {}).get("data_api", {}).get("total", 0) for s in summaries)
     print(
         json.dumps(
             {
-                "ok": True,
-                "channel_id": channel_id,
-                "videos": len(videos),
-                "stat_rows_upserted": stat_rows,
-                "range": {"mode": range_mode, "start": start_date, "end": end_date},
-                "period_totals": period_totals,
-                "lifetime_totals": lifetime_totals,
-                "db_path": db_path,
+                "ok": all(s["ok"] for s in summaries),
+                "channels": summaries,
+                "channels_failed": [s["name"] for s in summaries if not s["ok"]],
+                "stat_rows_changed": sum(s.get("stat_rows_changed", 0) for s in summaries),
+                "quota_units_used": limiter.units_used,
+                "quota_units": {"data_api": data_api_units, "analytics": limiter.units_used},
+                "elapsed_seconds": round(elapsed, 3),
+                **common,
             },
             ensure_ascii=False,
         )
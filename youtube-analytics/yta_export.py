@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Stream daily stats (joined with videos) to month-partitioned Parquet or CSV.
+
+Rows are read through a cursor in --batch-size batches and written straight to
+one open file at a time, so memory stays flat regardless of DB size. Each run
+exports only rows whose updated_at moved since the previous run (watermark in
+<out>/_export_state.json); --full ignores it and replaces the whole dataset.
+"""
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import shutil
+from pathlib import Path
+
+from db import connect, day_number, schema_version
+
+# Output dataset name; rows keep the pre-v9 daily_video_stats columns.
+TABLE = "daily_video_stats"
+STATE_FILE = "_export_state.json"
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_LAG_SECONDS = 300
+
+# (column, parquet type name) in output order.
+COLUMNS = [
+    ("video_id", "string"),
+    ("channel_id", "string"),
+    ("title", "string"),
+    ("published_at", "string"),
+    ("stat_date", "date32"),
+    ("views", "int64"),
+    ("likes", "int64"),
+    ("comments", "int64"),
+    ("estimated_minutes_watched", "int64"),
+    ("average_view_duration", "float64"),
+    ("subscribers_gained", "int64"),
+    ("subscribers_lost", "int64"),
+    ("updated_at", "timestamp"),
+]
+
+# daily_stats keeps days and updated_at as integers (days / seconds since the
+# epoch); both queries range-search on them and convert only the output.
+MONTHS_SQL = """
+SELECT DISTINCT strftime('%Y-%m', day * 86400, 'unixepoch') AS month
+FROM daily_stats
+WHERE updated_at >= ? AND updated_at < ?
+ORDER BY month
+"""
+
+EXPORT_SQL = """
+SELECT k.video_id, v.channel_id, v.title, v.published_at, date(s.day * 86400, 'unixepoch'),
+       s.views, s.likes, s.comments, s.estimated_minutes_watched, s.average_view_duration,
+       s.subscribers_gained, s.subscribers_lost, datetime(s.updated_at, 'unixepoch')
+FROM daily_stats s
+JOIN video_keys k ON k.vid = s.vid
+LEFT JOIN videos v ON v.video_id = k.video_id
+WHERE s.day BETWEEN ? AND ?
+  AND s.updated_at >= ? AND s.updated_at < ?
+"""
+
+
+def load_env(path: str = ".env"):
+    if not Path(path).exists():
+        return
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        k, v = line.split("=", 1)
+        os.environ.setdefault(k.strip(), v.strip())
+
+
+def read_state(out_dir: Path) -> dict:
+    path = out_dir / STATE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def write_state(out_dir: Path, state: dict) -> None:
+    # Replace atomically so a crash never leaves a half-written watermark.
+    tmp = out_dir / (STATE_FILE + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2))
+    tmp.replace(out_dir / STATE_FILE)
+
+
+class CsvPartWriter:
+    suffix = ".csv"
+
+    def __init__(self, path: Path):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow([name for name, _ in COLUMNS])
+
+    def write(self, rows) -> None:
+        self._w.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetPartWriter:
+    """One Parquet file; each batch becomes a row group."""
+
+    suffix = ".parquet"
+
+    def __init__(self, path: Path, compression: str = "zstd"):
+        pa, self._pc, pq = import_pyarrow()
+        self._pa = pa
+        types = {
+            "string": pa.string(),
+            "int64": pa.int64(),
+            "float64": pa.float64(),
+            "date32": pa.date32(),
+            "timestamp": pa.timestamp("s"),
+        }
+        self.schema = pa.schema([(name, types[t]) for name, t in COLUMNS])
+        self._w = pq.ParquetWriter(str(path), self.schema, compression=compression)
+
+    def write(self, rows) -> None:
+        pa, pc = self._pa, self._pc
+        arrays = []
+        for (name, kind), values in zip(COLUMNS, zip(*rows)):
+            if kind == "date32":
+                arrays.append(pa.array(values, pa.string()).cast(pa.date32()))
+            elif kind == "timestamp":
+                arrays.append(pc.strptime(pa.array(values, pa.string()), format="%Y-%m-%d %H:%M:%S", unit="s"))
+            else:
+                arrays.append(pa.array(values, self.schema.field(name).type))
+        self._w.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self._w.close()
+
+
+def import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("--format parquet needs pyarrow (pip install pyarrow), or use --format csv")
+    return pa, pc, pq
+
+
+def month_bounds(month: str):
+    first = dt.date.fromisoformat(month + "-01")
+    last = (first + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    return day_number(first.isoformat()), day_number(last.isoformat())
+
+
+def epoch_seconds(ts: str) -> int:
+    """'YYYY-MM-DD HH:MM:SS' (UTC, as stored in the state file) -> unix seconds; '' -> 0."""
+    if not ts:
+        return 0
+    return int(dt.datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").replace(tzinfo=dt.timezone.utc).timestamp())
+
+
+def export(conn, out_dir: Path, fmt: str, since: str, until: str, batch_size: int, run_id: str, replace: bool = False) -> dict:
+    """Write rows with since <= updated_at < until, one part file per month. Returns counts.
+
+    With replace, the parts go to a staging directory that is swapped in for
+    <out>/<TABLE> once complete, so parts from earlier runs are dropped rather
+    than read twice, and a failed run leaves the previous dataset in place.
+    """
+    writer_cls = ParquetPartWriter if fmt == "parquet" else CsvPartWriter
+    if fmt == "parquet":
+        import_pyarrow()
+
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.arraysize = batch_size
+    rows_exported = 0
+    files = []
+    since, until = epoch_seconds(since), epoch_seconds(until)
+    dataset = out_dir / TABLE
+    target = out_dir / f".{TABLE}.{run_id}.tmp" if replace else dataset
+    if replace:
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True)
+    # One read transaction: the month list and every month's rows come from the same snapshot.
+    cur.execute("BEGIN")
+    try:
+        months = [r[0] for r in cur.execute(MONTHS_SQL, (since, until)).fetchall()]
+        for month in months:
+            part_dir = target / f"month={month}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            final = part_dir / f"part-{run_id}{writer_cls.suffix}"
+            tmp = part_dir / f".part-{run_id}{writer_cls.suffix}.tmp"
+            cur.execute(EXPORT_SQL, (*month_bounds(month), since, until))
+            writer = writer_cls(tmp)
+            try:
+                while True:
+                    batch = cur.fetchmany()
+                    if not batch:
+                        break
+                    writer.write(batch)
+                    rows_exported += len(batch)
+            finally:
+                writer.close()
+            tmp.replace(final)
+            files.append(str(dataset.relative_to(out_dir) / final.relative_to(target)))
+    except Exception:
+        if replace:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
+    finally:
+        cur.execute("COMMIT")
+    if replace:
+        old = out_dir / f".{TABLE}.{run_id}.old"
+        if dataset.exists():
+            dataset.rename(old)
+        target.rename(dataset)
+        shutil.rmtree(old, ignore_errors=True)
+    return {"rows_exported": rows_exported, "months": months, "files": files}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Export daily_video_stats to month-partitioned Parquet or CSV")
+    p.add_argument("--env-file", default=".env")
+    p.add_argument("--db-path", default="")
+    p.add_argument("--out", default="", help="Output directory (default: YTA_EXPORT_DIR or ./export)")
+    p.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows fetched and written per batch")
+    p.add_argument("--full", action="store_true", help="Ignore the watermark; re-export every row, replacing earlier parts")
+    p.add_argument(
+        "--lag-seconds",
+        type=int,
+        default=DEFAULT_LAG_SECONDS,
+        help="Leave rows updated in the last N seconds for the next run, so a collection still committing is not skipped",
+    )
+    args = p.parse_args()
+
+    if args.batch_size < 1:
+        raise SystemExit("--batch-size must be >= 1")
+
+    load_env(args.env_file)
+    db_path = args.db_path or os.getenv("YTA_DB_PATH", "youtube_analytics.db")
+    out_dir = Path(args.out or os.getenv("YTA_EXPORT_DIR", "export"))
+    if not Path(db_path).exists():
+        raise SystemExit(f"Database not found: {db_path} (run yta_collect.py first)")
+
+    state = read_state(out_dir)
+    if state and state.get("format") != args.format and not args.full:
+        raise SystemExit(
+            f"{out_dir} holds a {state.get('format')} export; use the same --format, a new --out, or --full"
+        )
+    since = "" if args.full else state.get("watermark", "")
+
+    now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+    until = (now - dt.timedelta(seconds=max(0, args.lag_seconds))).strftime("%Y-%m-%d %H:%M:%S")
+    if since and until <= since:
+        until = since
+    run_id = now.strftime("%Y%m%dT%H%M%SZ")
+
+    conn = connect(db_path, profile="reader")
+    if schema_version(conn) < 9:
+        raise SystemExit(f"{db_path} predates the compact daily_stats table (schema v9); run yta_collect.py once to migrate")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # A full export (or the first one) rewrites the dataset instead of adding parts to it.
+    result = export(conn, out_dir, args.format, since, until, args.batch_size, run_id, replace=not since)
+    conn.close()
+
+    write_state(
+        out_dir,
+        {
+            "format": args.format,
+            "watermark": until,
+            "last_run": run_id,
+            "rows": result["rows_exported"],
+        },
+    )
+
+    print(
+        json.dumps(
+            {
+                "ok": True,
+                "format": args.format,
+                "out": str(out_dir),
+                "full": args.full or not since,
+                "watermark": {"from": since or None, "to": until},
+                "rows_exported": result["rows_exported"],
+                "months": result["months"],
+                "files": result["files"],
+                "batch_size": args.batch_size,
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Synthetic channels for benchmarks: a fixture DB and local fakes of the Google APIs.
+
+Every video gets a launch popularity drawn from a Pareto distribution (a few
+hits, a long tail of small videos), an exponential decay after publishing with
+an evergreen floor, and a weekly rhythm. Each video's numbers come from its own
+seeded generator, so the fixture DB and the fake Analytics API agree on
+every row, and the same --seed gives the same channels on every machine.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from db import connect, init_db, refresh_rollups, upsert_daily_stats_bulk, upsert_videos_bulk
+
+DEFAULT_CHANNELS = 2
+DEFAULT_VIDEOS = 1000
+DEFAULT_DAYS = 365
+
+# Mon..Sun multipliers on expected views.
+WEEKDAY_FACTOR = np.array([0.95, 0.93, 0.94, 0.97, 1.02, 1.1, 1.09])
+# Caps the Pareto tail so one outlier does not dwarf the whole channel.
+MAX_LAUNCH_VIEWS = 50_000
+
+
+@dataclass(frozen=True)
+class SyntheticVideo:
+    video_id: str
+    channel_id: str
+    title: str
+    published: dt.date
+    seed: tuple
+    popularity: float
+    half_life: float
+    evergreen: float
+    like_rate: float
+    comment_rate: float
+    length_seconds: float
+    retention: float
+
+    @property
+    def published_at(self) -> str:
+        return f"{self.published.isoformat()}T15:00:00Z"
+
+    def as_video_row(self) -> dict:
+        return {"video_id": self.video_id, "title": self.title, "published_at": self.published_at, "channel_id": self.channel_id}
+
+
+class SyntheticChannels:
+    """`channels` channels of `videos` videos each, with daily stats up to `end`.
+
+    Videos are published uniformly over the `days` before end plus half as
+    many days again, so the stats window also holds long-tail older videos.
+    """
+
+    def __init__(self, channels: int = DEFAULT_CHANNELS, videos: int = DEFAULT_VIDEOS, days: int = DEFAULT_DAYS, seed: int = 1, end: dt.date = None):
+        self.end = end or dt.date.today()
+        self.start = self.end - dt.timedelta(days=days - 1)
+        self.seed = seed
+        self.first_publish = self.start - dt.timedelta(days=days // 2)
+        span = (self.end - self.first_publish).days
+        self._dates = [(self.first_publish + dt.timedelta(days=d)).isoformat() for d in range(span + 1)]
+
+        self.channel_ids = [f"UCsynthetic{c:03d}" for c in range(channels)]
+        self.videos = {}
+        for c, channel_id in enumerate(self.channel_ids):
+            for i in range(videos):
+                v = self._make_video(c, i, channel_id, span)
+                self.videos[v.video_id] = v
+
+    def _make_video(self, c: int, i: int, channel_id: str, span: int) -> SyntheticVideo:
+        rng = np.random.default_rng([self.seed, c, i, 0])
+        return SyntheticVideo(
+            video_id=f"syn{c:03d}v{i:06d}",
+            channel_id=channel_id,
+            title=f"Synthetic {c}/{i}",
+            published=self.first_publish + dt.timedelta(days=int(rng.integers(0, span + 1))),
+            seed=(self.seed, c, i, 1),
+            popularity=float(min(MAX_LAUNCH_VIEWS, 20 * (rng.pareto(1.16) + 1))),
+            half_life=float(rng.lognormal(np.log(5), 0.8)),
+            evergreen=float(rng.beta(1.2, 30)),
+            like_rate=float(rng.uniform(0.015, 0.06)),
+            comment_rate=float(rng.uniform(0.001, 0.008)),
+            length_seconds=float(rng.uniform(90, 1500)),
+            retention=float(rng.uniform(0.25, 0.65)),
+        )
+
+    def channel_videos(self, channel_id: str) -> list:
+        """The channel's videos, newest first (uploads playlist order)."""
+        vids = [v for v in self.videos.values() if v.channel_id == channel_id]
+        return sorted(vids, key=lambda v: (v.published, v.video_id), reverse=True)
+
+    def series(self, video: SyntheticVideo) -> dict:
+        """Per-metric arrays for every day from the publish date to end."""
+        rng = np.random.default_rng(list(video.seed))
+        n = (self.end - video.published).days + 1
+        age = np.arange(n)
+        weekday = WEEKDAY_FACTOR[(video.published.weekday() + age) % 7]
+        expected = video.popularity * (np.exp(-age * np.log(2) / video.half_life) + video.evergreen) * weekday
+        views = rng.poisson(expected)
+        avd = np.round(video.length_seconds * np.clip(video.retention + rng.normal(0, 0.03, n), 0.05, 1.0), 1)
+        avd = np.where(views > 0, avd, 0.0)
+        return {
+            "views": views,
+            "likes": rng.binomial(views, video.like_rate),
+            "comments": rng.binomial(views, video.comment_rate),
+            "estimated_minutes_watched": np.round(views * avd / 60).astype(np.int64),
+            "average_view_duration": avd,
+            "subscribers_gained": rng.binomial(views, 0.002),
+            "subscribers_lost": rng.binomial(views, 0.0004),
+        }
+
+    def daily_rows(self, video: SyntheticVideo, start: str = None, end: str = None) -> list:
+        """Rows for upsert_daily_stats_bulk within [start, end] (default: the stats window)."""
+        lo = max(dt.date.fromisoformat(start) if start else self.start, video.published)
+        hi = min(dt.date.fromisoformat(end) if end else self.end, self.end)
+        if lo > hi:
+            return []
+        series = self.series(video)
+        a, b = (lo - video.published).days, (hi - video.published).days + 1
+        offset = (video.published - self.first_publish).days
+        columns = {m: series[m][a:b].tolist() for m in series}
+        dates = self._dates[offset + a : offset + b]
+        return [
+            {"video_id": video.video_id, "stat_date": d, **{m: columns[m][k] for m in columns}}
+            for k, d in enumerate(dates)
+        ]
+
+    def lifetime(self, video: SyntheticVideo) -> dict:
+        series = self.series(video)
+        return {m: int(series[m].sum()) for m in ("views", "likes", "comments")}
+
+
+# Generation parameters build_fixture records in the meta table (as fixture_<name>).
+FIXTURE_PARAMS = ("channels", "videos", "days", "seed")
+
+
+def fixture_params(model: SyntheticChannels) -> dict:
+    """The parameters that generated model, plus its last day (YYYY-MM-DD)."""
+    channels = len(model.channel_ids)
+    return {
+        "channels": channels,
+        "videos": len(model.videos) // channels,
+        "days": (model.end - model.start).days + 1,
+        "seed": model.seed,
+        "end": model.end.isoformat(),
+    }
+
+
+def read_fixture_params(path: str):
+    """fixture_params recorded in the fixture DB at path, or None if it has none (not built by build_fixture)."""
+    conn = connect(path, profile="reader")
+    try:
+        keys = [f"fixture_{name}" for name in FIXTURE_PARAMS + ("end",)]
+        rows = dict(conn.execute(f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(keys))})", keys).fetchall())
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    if len(rows) < len(keys):
+        return None
+    params = {name: int(rows[f"fixture_{name}"]) for name in FIXTURE_PARAMS}
+    end = str(rows["fixture_end"])
+    params["end"] = f"{end[:4]}-{end[4:6]}-{end[6:]}"
+    return params
+
+
+def build_fixture(path: str, model: SyntheticChannels, chunk_size: int = None) -> dict:
+    """Write the model's catalog and stats window into a new DB at path, with rollups and planner stats.
+
+    The generation parameters are recorded in the meta table (see read_fixture_params).
+    """
+    for suffix in ("", "-wal", "-shm"):
+        Path(path + suffix).unlink(missing_ok=True)
+    t0 = time.perf_counter()
+    conn = connect(path, profile="collector")
+    init_db(conn)
+    upsert_videos_bulk(conn, (v.as_video_row() for v in model.videos.values()))
+    kwargs = {"chunk_size": chunk_size} if chunk_size else {}
+    rows = upsert_daily_stats_bulk(conn, (row for v in model.videos.values() for row in model.daily_rows(v)), **kwargs)
+    ingest_s = time.perf_counter() - t0
+    refresh_rollups(conn, model.start.isoformat(), model.end.isoformat(), bump=False)
+    params = fixture_params(model)
+    # meta values are integers, so the end date is stored as YYYYMMDD.
+    params_row = {**params, "end": int(params["end"].replace("-", ""))}
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        [(f"fixture_{name}", value) for name, value in params_row.items()],
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return {
+        "path": path,
+        "channels": len(model.channel_ids),
+        "videos": len(model.videos),
+        "start": model.start.isoformat(),
+        "end": model.end.isoformat(),
+        "rows": rows,
+        "ingest_seconds": round(ingest_s, 3),
+        "rows_per_sec": round(rows / ingest_s) if ingest_s else None,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "file_bytes": os.path.getsize(path),
+    }
+
+
+class _Request:
+    """Stands in for googleapiclient's HttpRequest: headers plus execute()."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.headers = {}
+
+    def execute(self):
+        return self.fn(self.headers)
+
+
+def _http_error(status: int):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class FakeServices:
+    """Local YouTube Data v3 and Analytics v2 services backed by a SyntheticChannels.
+
+    Implements what yta_collect calls: channels.list, playlistItems.list (with
+    ETag / If-None-Match), videos.list(statistics) and reports.query with
+    day or day,video dimensions and startIndex/maxResults paging. `calls`
+    counts requests per method.
+    """
+
+    def __init__(self, model: SyntheticChannels):
+        self.model = model
+        self.calls = Counter()
+        self._last_report = (None, None)
+
+    def build_service(self, api: str, version: str, creds=None, cache_dir: str = None):
+        # Same signature as yta_collect.build_service.
+        return _FakeAnalytics(self) if api == "youtubeAnalytics" else _FakeYouTube(self)
+
+    def report_rows(self, kw: dict) -> list:
+        key = (kw["startDate"], kw["endDate"], kw["dimensions"], kw["filters"])
+        if self._last_report[0] == key:
+            return self._last_report[1]
+        ids = kw["filters"].split("==", 1)[1].split(",")
+        by_video = "," in kw["dimensions"]
+        rows = []
+        for video_id in ids:
+            video = self.model.videos.get(video_id)
+            if video is None:
+                continue
+            for r in self.model.daily_rows(video, kw["startDate"], kw["endDate"]):
+                metrics = [
+                    r["views"],
+                    r["likes"],
+                    r["comments"],
+                    r["estimated_minutes_watched"],
+                    r["average_view_duration"],
+                    r["subscribers_gained"],
+                    r["subscribers_lost"],
+                ]
+                rows.append([r["stat_date"], video_id, *metrics] if by_video else [r["stat_date"], *metrics])
+        rows.sort(key=lambda r: (r[0], r[1]) if by_video else r[0])
+        self._last_report = (key, rows)
+        return rows
+
+
+class _FakeYouTube:
+    def __init__(self, services: FakeServices):
+        self.s = services
+
+    def channels(self):
+        s = self.s
+
+        class Channels:
+            def list(self, part, id=None, mine=False):
+                def run(headers):
+                    s.calls["channels.list"] += 1
+                    ids = [id] if id else s.model.channel_ids[:1]
+                    return {
+                        "items": [
+                            {"id": cid, "contentDetails": {"relatedPlaylists": {"uploads": "UU" + cid[2:]}}}
+                            for cid in ids
+                            if cid in s.model.channel_ids
+                        ]
+                    }
+
+                return _Request(run)
+
+        return Channels()
+
+    def playlistItems(self):
+        s = self.s
+
+        class PlaylistItems:
+            def list(self, part, playlistId, maxResults=50, pageToken=None):
+                def run(headers):
+                    s.calls["playlistItems.list"] += 1
+                    videos = s.model.channel_videos("UC" + playlistId[2:])
+                    etag = f'"{playlistId}:{len(videos)}"'
+                    if pageToken is None and headers.get("If-None-Match") == etag:
+                        raise _http_error(304)
+                    i = int(pageToken or 0)
+                    resp = {
+                        "etag": etag,
+                        "items": [
+                            {
+                                "snippet": {"title": v.title, "channelId": v.channel_id},
+                                "contentDetails": {"videoId": v.video_id, "videoPublishedAt": v.published_at},
+                            }
+                            for v in videos[i : i + maxResults]
+                        ],
+                    }
+                    if i + maxResults < len(videos):
+                        resp["nextPageToken"] = str(i + maxResults)
+                    return resp
+
+                return _Request(run)
+
+        return PlaylistItems()
+
+    def videos(self):
+        s = self.s
+
+        class Videos:
+            def list(self, part, id, maxResults=50):
+                def run(headers):
+                    s.calls["videos.list"] += 1
+                    items = []
+                    for video_id in id.split(","):
+                        video = s.model.videos.get(video_id)
+                        if video is None:
+                            continue
+                        t = s.model.lifetime(video)
+                        items.append(
+                            {
+                                "id": video_id,
+                                "statistics": {
+                                    "viewCount": str(t["views"]),
+                                    "likeCount": str(t["likes"]),
+                                    "commentCount": str(t["comments"]),
+                                },
+                            }
+                        )
+                    return {"items": items}
+
+                return _Request(run)
+
+        return Videos()
+
+
+class _FakeAnalytics:
+    def __init__(self, services: FakeServices):
+        self.s = services
+
+    def reports(self):
+        s = self.s
+
+        class Reports:
+            def query(self, **kw):
+                def run(headers):
+                    s.calls["reports.query"] += 1
+                    rows = s.report_rows(kw)
+                    start = kw.get("startIndex", 1) - 1
+                    return {"rows": rows[start : start + kw.get("maxResults", len(rows))]}
+
+                return _Request(run)
+
+        return Reports()
+
+
+def main():
+    p = argparse.ArgumentParser(description="Build a synthetic youtube_analytics fixture DB")
+    p.add_argument("--out", required=True, help="DB path (replaced if it exists)")
+    p.add_argument("--channels", type=int, default=DEFAULT_CHANNELS)
+    p.add_argument("--videos", type=int, default=DEFAULT_VIDEOS, help="Videos per channel")
+    p.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Days of daily stats, ending today")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+    if min(args.channels, args.videos, args.days) < 1:
+        raise SystemExit("--channels, --videos and --days must be >= 1")
+
+    model = SyntheticChannels(args.channels, args.videos, args.days, args.seed)
+    print(json.dumps({"ok": True, "seed": args.seed, **build_fixture(args.out, model)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
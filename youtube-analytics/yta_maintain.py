@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Keep youtube_analytics.db small: archive old daily rows, vacuum, report sizes.
+
+Whole months of daily stats older than --horizon-months are copied to an
+attached archive DB (or just dropped with --no-archive) and deleted from the
+hot DB. Their totals stay in video_monthly_stats and channel_daily_totals,
+which are refreshed from the daily rows right before they move and are not
+recomputed for archived dates afterwards (see db.archived_before).
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from db import (
+    SCHEMA_VERSION,
+    archived_before,
+    bump_data_version,
+    connect,
+    day_number,
+    init_db,
+    refresh_rollups,
+    schema_version,
+    set_archived_before,
+)
+
+DEFAULT_HORIZON_MONTHS = 24
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.daily_video_stats (
+    video_id TEXT NOT NULL,
+    stat_date TEXT NOT NULL,
+    views INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    estimated_minutes_watched INTEGER NOT NULL,
+    average_view_duration REAL NOT NULL,
+    subscribers_gained INTEGER NOT NULL,
+    subscribers_lost INTEGER NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY(video_id, stat_date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS archive.videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    published_at TEXT,
+    channel_id TEXT
+) WITHOUT ROWID;
+"""
+
+
+def default_archive_path(db_path: str) -> str:
+    """youtube_analytics.db -> youtube_analytics.archive.db, next to the DB."""
+    p = Path(db_path)
+    return str(p.with_name(p.stem + ".archive.db"))
+
+
+def horizon_date(months: int, today: dt.date) -> str:
+    """First day of the month `months` months before today's month."""
+    index = today.year * 12 + today.month - 1 - months
+    return dt.date(index // 12, index % 12 + 1, 1).isoformat()
+
+
+def db_size(conn, db_path: str) -> dict:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    wal = Path(db_path + "-wal")
+    return {
+        "file_bytes": Path(db_path).stat().st_size,
+        "wal_bytes": wal.stat().st_size if wal.exists() else 0,
+        "pages": pages,
+        "freelist_pages": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "page_size": page_size,
+    }
+
+
+def table_sizes(conn) -> dict:
+    """Bytes per table and index, largest first (None if SQLite lacks the dbstat table)."""
+    try:
+        rows = conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY 2 DESC").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {name: size for name, size in rows}
+
+
+def months_before(conn, before: str) -> list:
+    rows = conn.execute(
+        "SELECT DISTINCT strftime('%Y-%m', day * 86400, 'unixepoch') FROM daily_stats WHERE day < ? ORDER BY 1",
+        (day_number(before),),
+    )
+    return [r[0] for r in rows]
+
+
+def month_bounds(month: str):
+    first = dt.date.fromisoformat(month + "-01")
+    last = (first + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    return first.isoformat(), last.isoformat()
+
+
+def archive_month(conn, month: str, copy: bool) -> int:
+    """Move one month of daily rows out of the hot DB. Returns rows removed.
+
+    Rollups for the month are refreshed first, then the copy and delete run in
+    one short write transaction so a concurrent collector only waits briefly.
+    The copy is INSERT OR REPLACE, so a run interrupted between the two
+    databases' commits is repaired by running again.
+    """
+    first, last = month_bounds(month)
+    refresh_rollups(conn, first, last)
+    days = (day_number(first), day_number(last))
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if copy:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO archive.videos (video_id, title, published_at, channel_id)
+                SELECT v.video_id, v.title, v.published_at, v.channel_id
+                FROM videos v
+                JOIN video_keys k ON k.video_id = v.video_id
+                WHERE k.vid IN (SELECT vid FROM daily_stats WHERE day BETWEEN ? AND ?)
+                """,
+                days,
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO archive.daily_video_stats (
+                    video_id, stat_date, views, likes, comments, estimated_minutes_watched,
+                    average_view_duration, subscribers_gained, subscribers_lost, updated_at
+                )
+                SELECT k.video_id, date(s.day * 86400, 'unixepoch'), s.views, s.likes, s.comments,
+                       s.estimated_minutes_watched, s.average_view_duration, s.subscribers_gained,
+                       s.subscribers_lost, datetime(s.updated_at, 'unixepoch')
+                FROM daily_stats s
+                JOIN video_keys k ON k.vid = s.vid
+                WHERE s.day BETWEEN ? AND ?
+                """,
+                days,
+            )
+        removed = conn.execute("DELETE FROM daily_stats WHERE day BETWEEN ? AND ?", days).rowcount
+        next_month = (dt.date.fromisoformat(last) + dt.timedelta(days=1)).isoformat()
+        set_archived_before(conn, next_month)
+        bump_data_version(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    return removed
+
+
+def vacuum(conn, full: bool) -> dict:
+    """Release free pages to the filesystem.
+
+    Incremental vacuum needs auto_vacuum=INCREMENTAL, which an existing DB only
+    gets through one full VACUUM (the collector profile already requests it).
+    That rewrite runs when needed or with full=True; afterwards
+    `PRAGMA incremental_vacuum` frees pages without rewriting the file.
+    """
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    result = {"full": False, "seconds": 0.0}
+    t0 = time.perf_counter()
+    if full or mode != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        print("[info] running full VACUUM (blocks writers until done)", flush=True)
+        conn.execute("VACUUM")
+        result["full"] = True
+    freed = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # executescript steps the pragma to completion; execute() would free a single page.
+    conn.executescript("PRAGMA incremental_vacuum")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    conn.execute("PRAGMA optimize")
+    result["pages_freed"] = freed
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    result["auto_vacuum"] = {0: "none", 1: "full", 2: "incremental"}[conn.execute("PRAGMA auto_vacuum").fetchone()[0]]
+    return result
+
+
+def main():
+    from yta_collect import load_env
+
+    p = argparse.ArgumentParser(description="Archive old daily rows, vacuum and report youtube_analytics.db size")
+    p.add_argument("--env-file", default=".env")
+    p.add_argument("--db-path", default="")
+    p.add_argument(
+        "--horizon-months",
+        type=int,
+        default=None,
+        help=f"Keep daily rows for this many whole months before the current one (default: YTA_ARCHIVE_HORIZON_MONTHS or {DEFAULT_HORIZON_MONTHS})",
+    )
+    p.add_argument("--archive-db", default="", help="Archive DB (default: YTA_ARCHIVE_DB or <db name>.archive.db)")
+    p.add_argument("--no-archive", action="store_true", help="Delete old daily rows without copying them (monthly rollups keep their totals)")
+    p.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    p.add_argument("--no-vacuum", action="store_true")
+    p.add_argument("--full-vacuum", action="store_true", help="Rewrite the whole file (VACUUM) even if incremental vacuum is enabled")
+    args = p.parse_args()
+
+    load_env(args.env_file)
+    db_path = args.db_path or os.getenv("YTA_DB_PATH", "youtube_analytics.db")
+    if not Path(db_path).exists():
+        raise SystemExit(f"Database not found: {db_path} (run yta_collect.py first)")
+    horizon_months = args.horizon_months
+    if horizon_months is None:
+        horizon_months = int(os.getenv("YTA_ARCHIVE_HORIZON_MONTHS", str(DEFAULT_HORIZON_MONTHS)))
+    if horizon_months < 1:
+        raise SystemExit("--horizon-months must be >= 1")
+    archive_path = None if args.no_archive else args.archive_db or os.getenv("YTA_ARCHIVE_DB", "") or default_archive_path(db_path)
+
+    before = horizon_date(horizon_months, dt.date.today())
+    conn = connect(db_path, profile="reader" if args.dry_run else "collector")
+    if not args.dry_run:
+        # Runs pending migrations, including the meta table the archive horizon lives in.
+        init_db(conn)
+    elif schema_version(conn) < SCHEMA_VERSION:
+        raise SystemExit(f"{db_path} is at schema v{schema_version(conn)}; run without --dry-run (or yta_collect.py) to migrate first")
+    size_before = db_size(conn, db_path)
+    tables_before = table_sizes(conn)
+    months = months_before(conn, before)
+
+    if args.dry_run:
+        rows = conn.execute("SELECT COUNT(*) FROM daily_stats WHERE day < ?", (day_number(before),)).fetchone()[0]
+        conn.close()
+        print(
+            json.dumps(
+                {
+                    "ok": True,
+                    "dry_run": True,
+                    "archive_before": before,
+                    "months": months,
+                    "rows": rows,
+                    "archive_db": archive_path,
+                    "size": size_before,
+                    "tables": tables_before,
+                },
+                ensure_ascii=False,
+            )
+        )
+        return
+
+    if archive_path:
+        conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        conn.executescript(ARCHIVE_SCHEMA)
+
+    rows_archived = 0
+    for month in months:
+        removed = archive_month(conn, month, copy=bool(archive_path))
+        rows_archived += removed
+        print(f"[info] {month}: {removed} daily rows {'archived' if archive_path else 'deleted'}", flush=True)
+    if months:
+        with conn:
+            set_archived_before(conn, before)
+    if archive_path:
+        conn.execute("DETACH DATABASE archive")
+
+    vacuum_result = None if args.no_vacuum else vacuum(conn, args.full_vacuum)
+    size_after = db_size(conn, db_path)
+    tables_after = table_sizes(conn)
+    horizon = archived_before(conn)
+    conn.close()
+
+    print(
+        json.dumps(
+            {
+                "ok": True,
+                "archive_before": horizon,
+                "months_archived": months,
+                "rows_archived": rows_archived,
+                "archive_db": archive_path,
+                "vacuum": vacuum_result,
+                "size_before": size_before,
+                "size_after": size_after,
+                "tables_before": tables_before,
+                "tables_after": tables_after,
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 import argparse
 import datetime as dt
+import json
 import os
-import sqlite3
 from pathlib import Path
 
+from dateranges import RANGE_CHOICES, compute_date_range
+from db import archived_before, connect, data_version, day_number, schema_version
+from query_cache import ResultCache, default_cache_path
+
 
 def load_env(path: str = ".env"):
     if not Path(path).exists():
@@ -18,8 +22,12 @@ def load_env(path: str = ".env"):
 
 
 def conn(db_path: str):
-    c = sqlite3.connect(db_path)
-    c.row_factory = sqlite3.Row
+    # Read-only so reports never contend with an in-flight collection.
+    if not Path(db_path).exists():
+        raise SystemExit(f"Database not found: {db_path} (run yta_collect.py first)")
+    c = connect(db_path, profile="reader")
+    if schema_version(c) < 9:
+        raise SystemExit(f"{db_path} predates the compact daily_stats table (schema v9); run yta_collect.py once to migrate")
     return c
 
 
@@ -36,77 +44,544 @@ def week_range(today=None):
     return start.isoformat(), today.isoformat()
 
 
-def top10_month(c):
-    start, end = month_range()
-    q = """
-    SELECT v.video_id, v.title, SUM(s.views) AS views, SUM(s.likes) AS likes, SUM(s.comments) AS comments
-    FROM daily_video_stats s
+# Report SQL reads a stats source aliased `s` (video_id + metrics): a UNION ALL
+# of window segments, whole months from the monthly rollup and the partial
+# months at either edge from the raw daily table (day numbers, see db.day_number).
+# Each segment is a range search on a covering index / primary key, so wide
+# windows stay cheap.
+SEGMENT_SQL = {
+    "daily": "SELECT k.video_id, d.views, d.likes, d.comments, {period} AS cur FROM daily_stats d "
+    "JOIN video_keys k ON k.vid = d.vid WHERE d.day BETWEEN ? AND ?",
+    "monthly": "SELECT video_id, views, likes, comments, {period} AS cur FROM video_monthly_stats WHERE month BETWEEN ? AND ?",
+}
+
+# Per-segment channel filters, on each source's own video key.
+SEGMENT_CHANNEL_SQL = {
+    "daily": "d.vid IN (SELECT ck.vid FROM video_keys ck JOIN videos cv ON cv.video_id = ck.video_id WHERE {channel})",
+    "monthly": "video_id IN (SELECT video_id FROM videos WHERE {channel})",
+}
+
+TOP_VIDEOS_SQL = """
+SELECT v.video_id, v.title, SUM(s.views) AS views, SUM(s.likes) AS likes, SUM(s.comments) AS comments
+FROM ({source}) s
+JOIN videos v ON v.video_id = s.video_id
+GROUP BY v.video_id, v.title
+ORDER BY views DESC
+LIMIT ?
+"""
+
+ENGAGEMENT_SQL = """
+SELECT v.video_id, v.title,
+       SUM(s.views) AS views,
+       SUM(s.likes) AS likes,
+       SUM(s.comments) AS comments,
+       CASE WHEN SUM(s.views)=0 THEN 0
+            ELSE ROUND((SUM(s.likes)+SUM(s.comments))*100.0/SUM(s.views), 2)
+       END AS engagement_rate_pct
+FROM ({source}) s
+JOIN videos v ON v.video_id = s.video_id
+GROUP BY v.video_id, v.title
+ORDER BY engagement_rate_pct DESC, views DESC
+LIMIT ?
+"""
+
+# Current and previous window in one pass: segments carry cur=1/0 and every
+# metric is split with CASE. Totals come from window sums before LIMIT.
+COMPARE_SQL = """
+WITH per AS (
+    SELECT {group_cols},
+           SUM(CASE WHEN s.cur THEN s.views ELSE 0 END) AS views,
+           SUM(CASE WHEN s.cur THEN 0 ELSE s.views END) AS prev_views,
+           SUM(CASE WHEN s.cur THEN s.likes ELSE 0 END) AS likes,
+           SUM(CASE WHEN s.cur THEN 0 ELSE s.likes END) AS prev_likes,
+           SUM(CASE WHEN s.cur THEN s.comments ELSE 0 END) AS comments,
+           SUM(CASE WHEN s.cur THEN 0 ELSE s.comments END) AS prev_comments
+    FROM ({source}) s
     JOIN videos v ON v.video_id = s.video_id
-    WHERE s.stat_date BETWEEN ? AND ?
-    GROUP BY v.video_id, v.title
-    ORDER BY views DESC
-    LIMIT 10
+    GROUP BY {group_by}
+)
+SELECT *,
+       views - prev_views AS views_delta,
+       ROUND((views - prev_views) * 100.0 / NULLIF(prev_views, 0), 2) AS views_delta_pct,
+       likes - prev_likes AS likes_delta,
+       comments - prev_comments AS comments_delta,
+       SUM(views) OVER () AS total_views,
+       SUM(prev_views) OVER () AS total_prev_views
+FROM per
+ORDER BY ABS(views - prev_views) DESC, views DESC
+LIMIT ?
+"""
+
+COMPARE_GROUPS = {
+    "video": ("v.video_id, v.title, v.channel_id", "v.video_id"),
+    "channel": ("COALESCE(v.channel_id, '') AS channel_id", "v.channel_id"),
+}
+
+# Keyed (stat_date, channel_id): one row per channel-day, no join needed.
+TOTAL_VIEWS_SQL = "SELECT COALESCE(SUM(t.views),0) AS total_views FROM channel_daily_totals t WHERE t.stat_date BETWEEN ? AND ?{channel}"
+
+
+def has_table(c, name: str) -> bool:
+    return c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is not None
+
+
+def _month_end(d: dt.date) -> dt.date:
+    return (d.replace(day=1) + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+
+
+def window_segments(start: str, end: str, monthly: bool = True):
+    """Split [start, end] into [(source, lo, hi)]: whole months as one "monthly"
+    segment, partial months at the edges as "daily" segments.
+
+    A window ending today (or later) counts as covering its last month, since
+    no stats exist past today.
+    """
+    s = dt.date.fromisoformat(start)
+    e = dt.date.fromisoformat(end)
+    first_full = s if s.day == 1 else _month_end(s) + dt.timedelta(days=1)
+    if e == _month_end(e) or e >= dt.date.today():
+        last_full = e.replace(day=1)
+    else:
+        last_full = (e.replace(day=1) - dt.timedelta(days=1)).replace(day=1)
+    if not monthly or first_full > last_full:
+        return [("daily", start, end)]
+
+    segments = []
+    if s < first_full:
+        segments.append(("daily", start, (first_full - dt.timedelta(days=1)).isoformat()))
+    segments.append(("monthly", first_full.isoformat()[:7], last_full.isoformat()[:7]))
+    tail = _month_end(last_full) + dt.timedelta(days=1)
+    if tail <= e:
+        segments.append(("daily", tail.isoformat(), end))
+    return segments
+
+
+def stats_source(segments, period: int = 1, channels=None):
+    """(sql, params) for the UNION ALL of segments, each tagged cur=period.
+
+    A channel filter is pushed into every segment so the planner can probe just
+    those channels' videos instead of filtering the whole window after the union.
     """
-    return c.execute(q, (start, end)).fetchall(), start, end
+    parts, params = [], []
+    for source, lo, hi in segments:
+        sql = SEGMENT_SQL[source].format(period=period)
+        channel, channel_params = channel_filter(channels, "cv.channel_id" if source == "daily" else "channel_id")
+        if channel:
+            sql += " AND " + SEGMENT_CHANNEL_SQL[source].format(channel=channel)
+        if source == "daily":
+            lo, hi = day_number(lo), day_number(hi)
+        parts.append(sql)
+        params.extend((lo, hi, *channel_params))
+    return "\n    UNION ALL\n    ".join(parts), params
+
+
+def channel_filter(channels, column: str = "v.channel_id"):
+    """(sql, params) restricting `column` to channels; empty when no filter."""
+    if not channels:
+        return "", []
+    return f"{column} IN ({', '.join('?' * len(channels))})", list(channels)
+
+
+def video_report(c, template: str, start: str, end: str, limit: int, channels=None):
+    source, params = stats_source(window_segments(start, end, has_table(c, "video_monthly_stats")), channels=channels)
+    return c.execute(template.format(source=source), (*params, limit)).fetchall()
+
 
+def previous_window(start: str, end: str):
+    """The window before [start, end]: the same number of whole months when the
+    window is whole calendar months, otherwise the same number of days."""
+    s = dt.date.fromisoformat(start)
+    e = dt.date.fromisoformat(end)
+    prev_end = s - dt.timedelta(days=1)
+    if s.day == 1 and e == _month_end(e):
+        months = (e.year - s.year) * 12 + e.month - s.month + 1
+        first = prev_end.replace(day=1)
+        for _ in range(months - 1):
+            first = (first - dt.timedelta(days=1)).replace(day=1)
+        return first.isoformat(), prev_end.isoformat()
+    return (prev_end - (e - s)).isoformat(), prev_end.isoformat()
 
-def total_views_week(c):
-    start, end = week_range()
-    q = "SELECT COALESCE(SUM(views),0) AS total_views FROM daily_video_stats WHERE stat_date BETWEEN ? AND ?"
-    r = c.execute(q, (start, end)).fetchone()
+
+def widen_archived(start: str, end: str, horizon, warnings: list):
+    """Widen [start, end] to whole months where it reaches before `horizon`
+    (db.archived_before), appending a note to `warnings` when it does.
+
+    Archived months keep only their monthly rollup, so a partial-month edge
+    there would read no daily rows and silently count as zero.
+    """
+    if not horizon or start >= horizon:
+        return start, end
+    s, e = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
+    new_start = s.replace(day=1).isoformat()
+    new_end = _month_end(e).isoformat() if end < horizon else end
+    if (new_start, new_end) != (start, end):
+        warnings.append(
+            f"daily rows before {horizon} are archived; widened {start}..{end} to whole months {new_start}..{new_end}"
+        )
+    return new_start, new_end
+
+
+def compare_report(c, start: str, end: str, limit: int, channels=None, group: str = "video", warnings=None):
+    """Per-video (or per-channel) totals for [start, end] vs the previous window of equal length.
+
+    The previous window is widened like the current one when it reaches into
+    archived months (see widen_archived); notes go to `warnings`.
+    """
+    prev_start, prev_end = widen_archived(*previous_window(start, end), archived_before(c), [] if warnings is None else warnings)
+    monthly = has_table(c, "video_monthly_stats")
+    prev_sql, prev_params = stats_source(window_segments(prev_start, prev_end, monthly), 0, channels)
+    cur_sql, cur_params = stats_source(window_segments(start, end, monthly), 1, channels)
+    group_cols, group_by = COMPARE_GROUPS[group]
+    sql = COMPARE_SQL.format(source=prev_sql + "\n    UNION ALL\n    " + cur_sql, group_cols=group_cols, group_by=group_by)
+    rows = c.execute(sql, (*prev_params, *cur_params, limit)).fetchall()
+    return rows, (prev_start, prev_end)
+
+
+def top10_month(c, start=None, end=None, limit=10, channels=None):
+    if not (start and end):
+        start, end = month_range()
+    return video_report(c, TOP_VIDEOS_SQL, start, end, limit, channels), start, end
+
+
+def total_views_week(c, start=None, end=None, channels=None):
+    if not (start and end):
+        start, end = week_range()
+    channel, channel_params = channel_filter(channels, "t.channel_id")
+    sql = TOTAL_VIEWS_SQL.format(channel=f" AND {channel}" if channel else "")
+    r = c.execute(sql, (start, end, *channel_params)).fetchone()
     return r["total_views"], start, end
 
 
-def highest_engagement(c, limit=10):
-    start, end = month_range()
-    q = """
-    SELECT v.video_id, v.title,
-           SUM(s.views) AS views,
-           SUM(s.likes) AS likes,
-           SUM(s.comments) AS comments,
-           CASE WHEN SUM(s.views)=0 THEN 0
-                ELSE ROUND((SUM(s.likes)+SUM(s.comments))*100.0/SUM(s.views), 2)
-           END AS engagement_rate_pct
-    FROM daily_video_stats s
-    JOIN videos v ON v.video_id = s.video_id
-    WHERE s.stat_date BETWEEN ? AND ?
-    GROUP BY v.video_id, v.title
-    ORDER BY engagement_rate_pct DESC, views DESC
-    LIMIT ?
+def highest_engagement(c, limit=10, start=None, end=None, channels=None):
+    if not (start and end):
+        start, end = month_range()
+    return video_report(c, ENGAGEMENT_SQL, start, end, limit, channels), start, end
+
+
+def plan_checks():
+    """(name, sql, params) for every report query shape: daily-only, rollup-only
+    and mixed windows, with and without a channel filter."""
+    windows = {
+        "daily": [("daily", "2026-01-05", "2026-01-20")],
+        "monthly": [("monthly", "2026-01", "2026-03")],
+        "mixed": [("daily", "2025-12-20", "2025-12-31"), ("monthly", "2026-01", "2026-02"), ("daily", "2026-03-01", "2026-03-10")],
+    }
+    checks = []
+    for channels in ([], ["UC1", "UC2"]):
+        suffix = "/channel" if channels else ""
+        for name, template in (("top-videos", TOP_VIDEOS_SQL), ("engagement", ENGAGEMENT_SQL)):
+            for label, segments in windows.items():
+                source, params = stats_source(segments, channels=channels)
+                checks.append((f"{name}/{label}{suffix}", template.format(source=source), (*params, 10)))
+        prev, prev_params = stats_source(windows["daily"], 0, channels)
+        cur, cur_params = stats_source(windows["mixed"], 1, channels)
+        for group, (group_cols, group_by) in COMPARE_GROUPS.items():
+            sql = COMPARE_SQL.format(source=prev + " UNION ALL " + cur, group_cols=group_cols, group_by=group_by)
+            checks.append((f"compare/{group}{suffix}", sql, (*prev_params, *cur_params, 10)))
+        channel, channel_params = channel_filter(channels, "t.channel_id")
+        sql = TOTAL_VIEWS_SQL.format(channel=f" AND {channel}" if channel else "")
+        checks.append((f"total-views/channel_daily_totals{suffix}", sql, ("2026-01-01", "2026-01-07", *channel_params)))
+    return checks
+
+
+STATS_TABLES = ("daily_stats", "d", "video_monthly_stats", "channel_daily_totals")
+
+
+def check_plans(c):
+    """Return [(name, ok, plan_lines)].
+
+    ok means no stats table is full-scanned and each is read by a range search
+    on its date key: from a covering index or the WITHOUT ROWID primary key, or
+    per-video probes when the planner drives from (a channel's) videos.
     """
-    return c.execute(q, (start, end, limit)).fetchall(), start, end
+    stats = STATS_TABLES + ("t",)
+    results = []
+    for name, sql, params in plan_checks():
+        lines = [r["detail"] for r in c.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        ok = True
+        for line in lines:
+            words = line.split()
+            if words[0] == "SCAN" and words[1] in stats:
+                ok = False
+            if words[0] == "SEARCH" and words[1] in stats:
+                covered = "COVERING INDEX" in line or "PRIMARY KEY" in line
+                if not covered and "day>" not in line and "month>" not in line:
+                    ok = False
+        results.append((name, ok, lines))
+    return results
+
+
+ANALYTICS_QUERIES = ["rolling", "growth", "percentiles", "retention"]
+
+
+def analytics_report(c, query: str, days: int, limit: int, min_views: int, start=None, end=None, channels=None, warnings=None):
+    """Vectorized reports over [start, end], default the last `days` days (see yta_analytics).
+
+    Returns printable lines. These reports need per-day rows, so a window
+    reaching into archived months starts at the archive horizon instead, with a
+    note in `warnings`; one entirely before it yields no lines.
+    """
+    import numpy as np
+
+    import yta_analytics as ya
+
+    if start and end:
+        start, end = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
+    else:
+        end = dt.date.today()
+        start = end - dt.timedelta(days=days - 1)
+    warnings = [] if warnings is None else warnings
+    horizon = archived_before(c)
+    if horizon and start.isoformat() < horizon:
+        if end.isoformat() < horizon:
+            warnings.append(f"{start}..{end} is entirely before {horizon}; its daily rows are archived, nothing to report")
+            return []
+        warnings.append(f"daily rows before {horizon} are archived; {query} window starts at {horizon} instead of {start}")
+        start = dt.date.fromisoformat(horizon)
+    w = ya.load_window(c, start.isoformat(), end.isoformat(), channels)
+    m = ya.video_metrics(w)
+    lines = []
+
+    def ranked(key, eligible=None):
+        values = np.where(np.isnan(m[key]), -np.inf, m[key])
+        if eligible is not None:
+            values = np.where(eligible, values, -np.inf)
+        order = np.argsort(-values, kind="stable")[:limit]
+        return [i for i in order if np.isfinite(values[i])]
+
+    def label(i):
+        return f"{w.titles[i]} ({w.video_ids[i]})"
+
+    if query == "rolling":
+        series7 = ya.channel_rolling(w, 7)
+        series28 = ya.channel_rolling(w, 28)
+        lines.append(f"Rolling views ({start}..{end}): channel 7d={series7[-1]:.0f} 28d={series28[-1]:.0f}")
+        for n, i in enumerate(ranked("rolling_7"), 1):
+            lines.append(f"{n:2d}. {label(i)} | 7d={m['rolling_7'][i]:.0f} 28d={m['rolling_28'][i]:.0f}")
+
+    elif query == "growth":
+        prev_7 = w.data["views"][:, -14:-7].sum(axis=1)
+        lines.append(f"Fastest growing videos, last 7d vs prior 7d ({start}..{end}, prior >= {min_views} views)")
+        for n, i in enumerate(ranked("growth_7", prev_7 >= min_views), 1):
+            g28 = m["growth_28"][i]
+            g28 = "n/a" if np.isnan(g28) else f"{g28 * 100:+.1f}%"
+            lines.append(f"{n:2d}. {label(i)} | 7d={m['growth_7'][i] * 100:+.1f}% 28d={g28} views_7d={m['rolling_7'][i]:.0f}")
+
+    elif query == "percentiles":
+        dist = ya.distribution(m["views"])
+        lines.append(
+            f"Per-video views distribution ({start}..{end}, {w.n_videos} videos): "
+            + " ".join(f"{k}={v:.0f}" for k, v in dist.items())
+        )
+        for n, i in enumerate(ranked("views"), 1):
+            lines.append(
+                f"{n:2d}. {label(i)} | views={m['views'][i]:.0f} pct={m['views_percentile'][i]:.1f} ER={m['engagement_rate_pct'][i]:.2f}%"
+            )
+
+    elif query == "retention":
+        lines.append(f"Highest view-weighted average view duration ({start}..{end}, >= {min_views} views)")
+        for n, i in enumerate(ranked("avg_view_duration", m["views"] >= min_views), 1):
+            trend = m["retention_trend"][i]
+            trend = "n/a" if np.isnan(trend) else f"{trend * 100:+.1f}%"
+            lines.append(
+                f"{n:2d}. {label(i)} | avd={m['avg_view_duration'][i]:.1f}s "
+                f"watch/view={m['watch_seconds_per_view'][i]:.1f}s last7d_vs_window={trend}"
+            )
+    return lines
+
+
+REPORT_QUERIES = ["top10-month", "views-week", "engagement", "compare"] + ANALYTICS_QUERIES
+
+
+def resolve_window(args) -> None:
+    """Turn --range/--start/--end into args.start_date/end_date, as yta_collect does.
+
+    Without any of them the dates stay None and each report keeps its default
+    window. Raises SystemExit on an invalid range.
+    """
+    if not (args.range or args.start_date or args.end_date):
+        return
+    try:
+        start, end, _ = compute_date_range(args)
+    except ValueError as e:
+        raise SystemExit(f"Invalid date: {e}")
+    if start > end:
+        raise SystemExit(f"Start {start} is after end {end}")
+    args.start_date, args.end_date = start, end
+
+
+def run_report(c, query: str, args) -> dict:
+    """Compute a report as a JSON-serializable payload.
+
+    args carries limit/days/min_views, channels, and optional start_date/end_date
+    (see resolve_window), which replace the report's default window.
+    """
+    start, end = getattr(args, "start_date", None), getattr(args, "end_date", None)
+    channels = getattr(args, "channels", None) or []
+    # Notes about the window (e.g. widened over archived months); part of the
+    # payload so cached results and the server's JSON carry them too.
+    warnings = []
+    meta = {"channels": channels, "custom_window": bool(start and end), "warnings": warnings}
+    if query in ANALYTICS_QUERIES:
+        return {**meta, "lines": analytics_report(c, query, args.days, args.limit, args.min_views, start, end, channels, warnings)}
+    if query == "compare":
+        if not (start and end):
+            start, end = week_range()
+        start, end = widen_archived(start, end, archived_before(c), warnings)
+        group = getattr(args, "group", "video")
+        rows, (prev_start, prev_end) = compare_report(c, start, end, args.limit, channels, group, warnings)
+        return {
+            **meta,
+            "start": start,
+            "end": end,
+            "prev_start": prev_start,
+            "prev_end": prev_end,
+            "group": group,
+            "total_views": rows[0]["total_views"] if rows else 0,
+            "total_prev_views": rows[0]["total_prev_views"] if rows else 0,
+            "rows": [{k: r[k] for k in r.keys() if k not in ("total_views", "total_prev_views")} for r in rows],
+        }
+    if start and end and query != "views-week":
+        # views-week reads channel_daily_totals, which archiving keeps.
+        start, end = widen_archived(start, end, archived_before(c), warnings)
+    if query == "top10-month":
+        rows, start, end = top10_month(c, start, end, args.limit, channels)
+    elif query == "engagement":
+        rows, start, end = highest_engagement(c, args.limit, start, end, channels)
+    elif query == "views-week":
+        total, start, end = total_views_week(c, start, end, channels)
+        return {**meta, "start": start, "end": end, "total_views": total}
+    return {**meta, "start": start, "end": end, "rows": [dict(r) for r in rows]}
+
+
+def _pct(value) -> str:
+    return "n/a" if value is None else f"{value:+.2f}%"
+
+
+def print_report(query: str, result: dict):
+    custom = result.get("custom_window")
+    scope = f" [channels: {', '.join(result['channels'])}]" if result.get("channels") else ""
+    for warning in result.get("warnings", []):
+        print(f"[warn] {warning}")
+    if query in ANALYTICS_QUERIES:
+        for line in result["lines"]:
+            print(line)
+
+    elif query == "top10-month":
+        title = "Top videos" if custom else "Top 10 videos this month"
+        print(f"{title} ({result['start']}..{result['end']}){scope}")
+        for i, r in enumerate(result["rows"], 1):
+            print(f"{i:2d}. {r['title']} ({r['video_id']}) | views={r['views']} likes={r['likes']} comments={r['comments']}")
+
+    elif query == "views-week":
+        title = "Total views" if custom else "Total views past week"
+        print(f"{title} ({result['start']}..{result['end']}){scope}: {result['total_views']}")
+
+    elif query == "engagement":
+        title = "Highest engagement videos" if custom else "Highest engagement videos this month"
+        print(f"{title} ({result['start']}..{result['end']}){scope}")
+        for i, r in enumerate(result["rows"], 1):
+            print(
+                f"{i:2d}. {r['title']} ({r['video_id']}) | ER={r['engagement_rate_pct']}% views={r['views']} likes={r['likes']} comments={r['comments']}"
+            )
+
+    elif query == "compare":
+        total, prev = result["total_views"], result["total_prev_views"]
+        change = (total - prev) * 100 / prev if prev else None
+        print(
+            f"Views {result['start']}..{result['end']} vs {result['prev_start']}..{result['prev_end']}{scope}: "
+            f"{total} vs {prev} ({_pct(change)})"
+        )
+        for i, r in enumerate(result["rows"], 1):
+            label = f"{r['title']} ({r['video_id']})" if result["group"] == "video" else r["channel_id"] or "(unknown channel)"
+            print(
+                f"{i:2d}. {label} | views={r['views']} prev={r['prev_views']} delta={r['views_delta']:+d} ({_pct(r['views_delta_pct'])}) "
+                f"likes={r['likes_delta']:+d} comments={r['comments_delta']:+d}"
+            )
+
+
+def report_params(args) -> dict:
+    # Reports are relative to today, so the date is part of the key.
+    return {
+        "today": dt.date.today().isoformat(),
+        "limit": args.limit,
+        "days": args.days,
+        "min_views": args.min_views,
+        "start": args.start_date,
+        "end": args.end_date,
+        "channels": sorted(args.channels or []),
+        "group": args.group,
+    }
 
 
 def main():
     p = argparse.ArgumentParser(description="YouTube Analytics query tool")
-    p.add_argument("query", choices=["top10-month", "views-week", "engagement"])
+    p.add_argument("query", choices=REPORT_QUERIES + ["check-plans", "serve"])
     p.add_argument("--env-file", default=".env")
     p.add_argument("--db-path", default="")
     p.add_argument("--limit", type=int, default=10)
+    p.add_argument("--days", type=int, default=90, help="Window length for rolling/growth/percentiles/retention")
+    p.add_argument("--min-views", type=int, default=10, help="Noise floor for growth/retention rankings")
+    p.add_argument("--start", dest="start_date", default=None, help="YYYY-MM-DD; replaces the report's default window")
+    p.add_argument("--end", dest="end_date", default=None, help="YYYY-MM-DD (default: today when --start is given)")
+    p.add_argument("--range", default=None, help="Preset window, as in yta_collect: " + "|".join(sorted(RANGE_CHOICES)))
+    p.add_argument("--channel", dest="channels", action="append", default=[], help="Only this channel ID (repeatable)")
+    p.add_argument("--group", choices=list(COMPARE_GROUPS), default="video", help="compare: rank videos or channels")
+    p.add_argument("--no-cache", action="store_true", help="Always recompute; neither read nor write the result cache")
+    p.add_argument("--stats", action="store_true", help="Print result cache hit/miss statistics as JSON after the report")
+    p.add_argument("--host", default="127.0.0.1", help="serve: bind address")
+    p.add_argument("--port", type=int, default=None, help="serve: port (default: YTA_SERVE_PORT or 8765; 0 = any free port)")
+    p.add_argument("--pool-size", type=int, default=4, help="serve: read-only connections kept open")
+    p.set_defaults(lifetime=False)
     args = p.parse_args()
+    resolve_window(args)
 
     load_env(args.env_file)
     db_path = args.db_path or os.getenv("YTA_DB_PATH", "youtube_analytics.db")
 
     c = conn(db_path)
 
-    if args.query == "top10-month":
-        rows, start, end = top10_month(c)
-        print(f"Top 10 videos this month ({start}..{end})")
-        for i, r in enumerate(rows, 1):
-            print(f"{i:2d}. {r['title']} ({r['video_id']}) | views={r['views']} likes={r['likes']} comments={r['comments']}")
+    if args.query == "serve":
+        from yta_server import DEFAULT_PORT, serve
 
-    elif args.query == "views-week":
-        total, start, end = total_views_week(c)
-        print(f"Total views past week ({start}..{end}): {total}")
+        c.close()
+        port = args.port if args.port is not None else int(os.getenv("YTA_SERVE_PORT", DEFAULT_PORT))
+        serve(db_path, args.host, port, args.pool_size)
+        return
 
-    elif args.query == "engagement":
-        rows, start, end = highest_engagement(c, args.limit)
-        print(f"Highest engagement videos this month ({start}..{end})")
-        for i, r in enumerate(rows, 1):
-            print(
-                f"{i:2d}. {r['title']} ({r['video_id']}) | ER={r['engagement_rate_pct']}% views={r['views']} likes={r['likes']} comments={r['comments']}"
+    if args.query == "check-plans":
+        failed = 0
+        for name, ok, lines in check_plans(c):
+            print(f"[{'ok' if ok else 'FAIL'}] {name}")
+            for line in lines:
+                print(f"       {line}")
+            failed += not ok
+        if failed:
+            raise SystemExit(f"{failed} query plan(s) regressed")
+        return
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(os.getenv("YTA_QUERY_CACHE", "") or default_cache_path(db_path))
+    # data_version and the report are read in one snapshot, so a result is
+    # never stored under a version newer than the data it was computed from.
+    c.execute("BEGIN")
+    try:
+        if cache is None:
+            result, hit = run_report(c, args.query, args), None
+        else:
+            result, hit = cache.cached(
+                args.query, report_params(args), data_version(c), lambda: run_report(c, args.query, args)
             )
+    finally:
+        c.execute("COMMIT")
+
+    print_report(args.query, result)
+    if args.stats:
+        stats = cache.stats() if cache else {"enabled": False}
+        print(json.dumps({"cache": {"hit": hit, **stats}}, ensure_ascii=False))
+    if cache:
+        cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""Long-running JSON server for yta_query reports (`yta_query.py serve`).
+
+Holds a pool of warm read-only connections. Each connection keeps its own
+prepared-statement cache and the process keeps its page cache and imports,
+so a request only pays for the query itself.
+"""
+import argparse
+import json
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from db import connect, data_version, schema_version
+from yta_query import COMPARE_GROUPS, REPORT_QUERIES, resolve_window, run_report
+
+DEFAULT_PORT = 8765
+LATENCY_WINDOW = 1000
+
+
+class ConnectionPool:
+    def __init__(self, db_path: str, size: int):
+        self._q = queue.Queue()
+        for _ in range(max(1, size)):
+            c = connect(db_path, profile="reader", check_same_thread=False)
+            self._q.put(c)
+
+    def get(self, timeout: float = 5.0):
+        return self._q.get(timeout=timeout)
+
+    def put(self, c) -> None:
+        self._q.put(c)
+
+    def close(self) -> None:
+        while not self._q.empty():
+            self._q.get_nowait().close()
+
+
+class LatencyStats:
+    """Per-route request counts and latency percentiles over the last LATENCY_WINDOW requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.setdefault(route, deque(maxlen=LATENCY_WINDOW)).append(seconds * 1000)
+            self._counts[route] = self._counts.get(route, 0) + 1
+            if not ok:
+                self._errors[route] = self._errors.get(route, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            out = {}
+            for route, samples in self._samples.items():
+                ordered = sorted(samples)
+                n = len(ordered)
+                out[route] = {
+                    "requests": self._counts[route],
+                    "errors": self._errors.get(route, 0),
+                    "p50_ms": round(ordered[n // 2], 3),
+                    "p95_ms": round(ordered[min(n - 1, int(n * 0.95))], 3),
+                    "max_ms": round(ordered[-1], 3),
+                    "mean_ms": round(sum(ordered) / n, 3),
+                }
+            return out
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def report_args(qs: dict) -> argparse.Namespace:
+    """Build run_report args from query-string parameters (same names as the CLI flags)."""
+
+    def one(name, default=None):
+        return qs.get(name, [default])[-1]
+
+    try:
+        args = argparse.Namespace(
+            limit=int(one("limit", 10)),
+            days=int(one("days", 90)),
+            min_views=int(one("min_views", 10)),
+            start_date=one("start"),
+            end_date=one("end"),
+            range=one("range"),
+            lifetime=False,
+            channels=[ch for value in qs.get("channel", []) for ch in value.split(",") if ch],
+            group=one("group", "video"),
+        )
+    except ValueError as e:
+        raise BadRequest(f"limit, days and min_views must be integers ({e})")
+    if args.limit < 1 or args.days < 1:
+        raise BadRequest("limit and days must be >= 1")
+    if args.group not in COMPARE_GROUPS:
+        raise BadRequest(f"group must be one of: {', '.join(COMPARE_GROUPS)}")
+    try:
+        resolve_window(args)
+    except SystemExit as e:
+        raise BadRequest(str(e))
+    return args
+
+
+def make_handler(pool: ConnectionPool, stats: LatencyStats):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "yta-query"
+
+        def _send(self, status: int, body: dict) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            t0 = time.perf_counter()
+            url = urlparse(self.path)
+            route = url.path.strip("/") or "index"
+            status, body = self._dispatch(route, parse_qs(url.query))
+            latency = time.perf_counter() - t0
+            body["latency_ms"] = round(latency * 1000, 3)
+            self._send(status, body)
+            known = route in REPORT_QUERIES or route in ("health", "metrics", "index")
+            stats.record(route if known else "other", latency, status < 400)
+
+        def _dispatch(self, route: str, qs: dict):
+            if route == "index":
+                return 200, {"reports": REPORT_QUERIES, "endpoints": ["/health", "/metrics"]}
+            if route == "metrics":
+                return 200, {"routes": stats.summary()}
+            if route != "health" and route not in REPORT_QUERIES:
+                return 404, {"error": f"unknown report '{route}'", "reports": REPORT_QUERIES}
+            try:
+                args = report_args(qs) if route != "health" else None
+            except BadRequest as e:
+                return 400, {"error": str(e)}
+
+            try:
+                c = pool.get()
+            except queue.Empty:
+                return 503, {"error": "all database connections are busy"}
+            try:
+                # One snapshot per request, so data_version matches the rows returned.
+                c.execute("BEGIN")
+                try:
+                    version = data_version(c)
+                    if route == "health":
+                        return 200, {"ok": True, "data_version": version}
+                    result = run_report(c, route, args)
+                finally:
+                    c.execute("COMMIT")
+            except Exception as e:
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                pool.put(c)
+            return 200, {"query": route, "data_version": version, "result": result}
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(db_path: str, host: str, port: int, pool_size: int) -> None:
+    pool = ConnectionPool(db_path, pool_size)
+    c = pool.get()
+    version = schema_version(c)
+    pool.put(c)
+    if version < 9:
+        pool.close()
+        raise SystemExit(f"{db_path} predates the compact daily_stats table (schema v9); run yta_collect.py once to migrate")
+    stats = LatencyStats()
+    server = ThreadingHTTPServer((host, port), make_handler(pool, stats))
+    server.daemon_threads = True
+    host, port = server.server_address[:2]
+    print(f"[info] serving {db_path} on http://{host}:{port} ({pool_size} connections)", flush=True)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # launchd and most supervisors stop services with SIGTERM; shut down the same way as Ctrl-C.
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        print(json.dumps({"ok": True, "routes": stats.summary()}, ensure_ascii=False))
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Poll public counters of recent uploads into video_stat_snapshots.
+
+Analytics reports lag 2-3 days, so a new upload's first days are missing from
+daily_stats. videos.list(part=statistics) is near real time and costs 1
+quota unit per 50 videos, so this polls every catalog video published in the
+last --days at --interval and stores the cumulative counters. Deltas come from
+consecutive snapshots. Older snapshots are downsampled to hourly, then daily,
+and finally dropped, so the table stays bounded.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import signal
+import time
+from pathlib import Path
+
+from db import (
+    connect,
+    downsample_snapshots,
+    expire_snapshots,
+    init_db,
+    insert_snapshots,
+    list_recent_videos,
+    schema_version,
+)
+from ratelimit import QuotaMeter
+
+DEFAULT_DAYS = 7
+DEFAULT_RAW_HOURS = 48
+DEFAULT_HOURLY_DAYS = 14
+DEFAULT_RETENTION_DAYS = 90
+
+# Per-snapshot deltas against the previous snapshot of the same video.
+DELTAS_SQL = """
+SELECT video_id, captured_at, views, likes, comments,
+       views - LAG(views) OVER w AS views_delta,
+       likes - LAG(likes) OVER w AS likes_delta,
+       comments - LAG(comments) OVER w AS comments_delta,
+       captured_at - LAG(captured_at) OVER w AS seconds
+FROM video_stat_snapshots
+WHERE captured_at >= :since
+  AND (:video_id IS NULL OR video_id = :video_id)
+WINDOW w AS (PARTITION BY video_id ORDER BY captured_at)
+"""
+
+# Latest counters per video plus the views gained in the last hour / 24 hours.
+VELOCITY_SQL = f"""
+WITH d AS ({DELTAS_SQL}),
+ranked AS (
+    SELECT d.*,
+           SUM(CASE WHEN captured_at > :h1 THEN views_delta ELSE 0 END) OVER p AS views_1h,
+           SUM(CASE WHEN captured_at > :h24 THEN views_delta ELSE 0 END) OVER p AS views_24h,
+           ROW_NUMBER() OVER (PARTITION BY video_id ORDER BY captured_at DESC) AS rn
+    FROM d
+    WINDOW p AS (PARTITION BY video_id)
+)
+SELECT r.video_id, COALESCE(v.title, r.video_id) AS title, v.published_at, r.captured_at,
+       r.views, r.likes, r.comments, r.views_1h, r.views_24h,
+       r.views_delta * 3600.0 / NULLIF(r.seconds, 0) AS views_per_hour
+FROM ranked r
+LEFT JOIN videos v ON v.video_id = r.video_id
+WHERE r.rn = 1 AND r.captured_at >= :active
+ORDER BY r.views_24h DESC, r.views DESC
+LIMIT :limit
+"""
+
+
+def compact_snapshots(conn, now: int, raw_hours: int, hourly_days: int, retention_days: int) -> int:
+    """Apply the retention policy as of `now`. Returns the number of snapshots deleted.
+
+    Newer than raw_hours: every poll. Up to hourly_days: last snapshot per hour.
+    Up to retention_days: last snapshot per day. Older: deleted.
+    """
+    expire_before = now - retention_days * 86400
+    daily_before = now - hourly_days * 86400
+    hourly_before = now - raw_hours * 3600
+    deleted = expire_snapshots(conn, expire_before)
+    deleted += downsample_snapshots(conn, expire_before, daily_before, 86400)
+    deleted += downsample_snapshots(conn, daily_before, hourly_before, 3600)
+    return deleted
+
+
+def poll(conn, youtube, meter: QuotaMeter, channel_id, args) -> dict:
+    from yta_collect import fetch_video_statistics, list_all_videos
+
+    now = int(time.time())
+    catalog = None
+    if channel_id:
+        _, catalog = list_all_videos(youtube, conn, channel_id, meter)
+    published_since = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=args.days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    videos = list_recent_videos(conn, published_since)
+    stats = fetch_video_statistics(youtube, [v["video_id"] for v in videos], meter)
+    written = insert_snapshots(conn, now, stats)
+    deleted = compact_snapshots(conn, now, args.raw_hours, args.hourly_days, args.retention_days)
+    return {
+        "captured_at": now,
+        "videos": len(videos),
+        "snapshots_written": written,
+        "snapshots_deleted": deleted,
+        "new_videos": catalog["new_videos"] if catalog else None,
+    }
+
+
+def velocity_report(conn, limit: int, now: int) -> list:
+    rows = conn.execute(
+        VELOCITY_SQL,
+        {
+            # 48h back so the first delta inside the 24h window has a baseline.
+            "since": now - 48 * 3600,
+            "video_id": None,
+            "h1": now - 3600,
+            "h24": now - 24 * 3600,
+            "active": now - 24 * 3600,
+            "limit": limit,
+        },
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def video_series(conn, video_id: str, since: int) -> list:
+    rows = conn.execute(DELTAS_SQL + " ORDER BY captured_at", {"since": since, "video_id": video_id}).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _ts(epoch: int) -> str:
+    return dt.datetime.fromtimestamp(epoch, dt.timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def print_report(args, db_path: str) -> None:
+    conn = connect(db_path, profile="reader")
+    if schema_version(conn) < 7:
+        raise SystemExit("No snapshots yet (schema v7); run yta_snapshot.py without --report first")
+    now = int(time.time())
+    if args.video:
+        rows = video_series(conn, args.video, now - args.retention_days * 86400)
+        print(f"Snapshots for {args.video} (UTC)")
+        for r in rows:
+            rate = r["views_delta"] * 3600 / r["seconds"] if r["seconds"] else None
+            delta = f" +{r['views_delta']} views ({rate:.1f}/h)" if rate is not None else ""
+            print(f"{_ts(r['captured_at'])} | views={r['views']} likes={r['likes']} comments={r['comments']}{delta}")
+    else:
+        rows = velocity_report(conn, args.limit, now)
+        print("Recent uploads by views gained in the last 24h")
+        for i, r in enumerate(rows, 1):
+            rate = f"{r['views_per_hour']:.1f}/h" if r["views_per_hour"] is not None else "n/a"
+            print(
+                f"{i:2d}. {r['title']} ({r['video_id']}) | views={r['views']} +1h={r['views_1h']} "
+                f"+24h={r['views_24h']} rate={rate} likes={r['likes']} comments={r['comments']} at {_ts(r['captured_at'])}"
+            )
+    conn.close()
+
+
+def main():
+    from yta_collect import DEFAULT_DISCOVERY_CACHE_DIR, build_service, discover_channel_id, get_creds, load_env
+
+    p = argparse.ArgumentParser(description="Snapshot public view/like/comment counters of recent uploads")
+    p.add_argument("--env-file", default=".env")
+    p.add_argument("--db-path", default="")
+    p.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Poll videos published in the last N days")
+    p.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Seconds between polls; 0 = poll once and exit (for cron/launchd)",
+    )
+    p.add_argument(
+        "--no-sync",
+        action="store_true",
+        help="Do not check the uploads playlist for new videos before each poll (use the catalog as is)",
+    )
+    p.add_argument("--raw-hours", type=int, default=DEFAULT_RAW_HOURS, help="Keep every snapshot this recent")
+    p.add_argument("--hourly-days", type=int, default=DEFAULT_HOURLY_DAYS, help="Then keep one snapshot per hour up to N days")
+    p.add_argument(
+        "--retention-days", type=int, default=DEFAULT_RETENTION_DAYS, help="Then one per day; older snapshots are deleted"
+    )
+    p.add_argument("--report", action="store_true", help="Print views gained per recent upload instead of polling")
+    p.add_argument("--video", default=None, help="With --report: print every snapshot and delta of one video")
+    p.add_argument("--limit", type=int, default=20)
+    args = p.parse_args()
+
+    if args.days < 1:
+        raise SystemExit("--days must be >= 1")
+    if args.interval < 0:
+        raise SystemExit("--interval must be >= 0")
+    if not 0 <= args.raw_hours <= args.hourly_days * 24 <= args.retention_days * 24:
+        raise SystemExit("Need 0 <= --raw-hours <= --hourly-days * 24 <= --retention-days * 24")
+
+    load_env(args.env_file)
+    db_path = args.db_path or os.getenv("YTA_DB_PATH", "youtube_analytics.db")
+
+    if args.report:
+        if not Path(db_path).exists():
+            raise SystemExit(f"Database not found: {db_path} (run yta_collect.py first)")
+        print_report(args, db_path)
+        return
+
+    client_secret = os.getenv("YTA_CLIENT_SECRET_FILE", "client_secret.json")
+    token_file = os.getenv("YTA_TOKEN_FILE", "token.json")
+    if not Path(client_secret).exists():
+        raise SystemExit(f"Missing client secret file: {client_secret}")
+
+    meter = QuotaMeter()
+    creds = get_creds(client_secret, token_file)
+    youtube = build_service("youtube", "v3", creds, os.getenv("YTA_DISCOVERY_CACHE_DIR", DEFAULT_DISCOVERY_CACHE_DIR))
+    channel_id = None
+    if not args.no_sync:
+        channel_id = os.getenv("YTA_CHANNEL_ID", "").strip() or discover_channel_id(youtube, meter)
+
+    conn = connect(db_path, profile="collector")
+    init_db(conn)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    polls = written = deleted = 0
+    last = None
+    try:
+        while True:
+            t0 = time.monotonic()
+            try:
+                last = poll(conn, youtube, meter, channel_id, args)
+            except Exception as e:
+                if not args.interval:
+                    raise
+                # A long-running poller rides out transient API errors and tries again next tick.
+                conn.rollback()
+                print(f"[warn] poll failed: {e}", flush=True)
+            else:
+                polls += 1
+                written += last["snapshots_written"]
+                deleted += last["snapshots_deleted"]
+                print(
+                    f"[info] {_ts(last['captured_at'])} polled {last['videos']} videos "
+                    f"(snapshots: +{last['snapshots_written']} -{last['snapshots_deleted']})",
+                    flush=True,
+                )
+            if not args.interval:
+                break
+            time.sleep(max(0.0, args.interval - (time.monotonic() - t0)))
+    except KeyboardInterrupt:
+        pass
+
+    rows = conn.execute("SELECT COUNT(*) FROM video_stat_snapshots").fetchone()[0]
+    conn.close()
+    print(
+        json.dumps(
+            {
+                "ok": polls > 0,
+                "polls": polls,
+                "videos": last["videos"] if last else 0,
+                "snapshots_written": written,
+                "snapshots_deleted": deleted,
+                "snapshot_rows": rows,
+                "quota_units": meter.summary(),
+                "retention": {
+                    "raw_hours": args.raw_hours,
+                    "hourly_days": args.hourly_days,
+                    "retention_days": args.retention_days,
+                },
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()